@@ -10,5 +10,14 @@ urlpatterns = [
     path('', include(router.urls)),
     path('upload-audio/', views.upload_audio, name='upload_audio'),
     path('test-upload/', views.upload_audio, name='test_upload'),  # Alternative URL for testing
+    path('uploads/', views.start_audio_upload, name='start_audio_upload'),
+    path('uploads/<uuid:upload_id>/', views.audio_upload_status, name='audio_upload_status'),
+    path('uploads/<uuid:upload_id>/chunks/', views.upload_audio_chunk, name='upload_audio_chunk'),
+    path('uploads/<uuid:upload_id>/finalize/', views.finalize_audio_upload, name='finalize_audio_upload'),
+    path('uploads/<uuid:upload_id>/abort/', views.abort_audio_upload, name='abort_audio_upload'),
     path('meeting/<str:meeting_id>/status/', views.meeting_status, name='meeting_status'),
+    path('action-items/mine/', views.my_action_items, name='my_action_items'),
+    path('search/', views.search, name='search'),
+    path('ask/', views.ask_meetings, name='ask_meetings'),
+    path('ops/queues/', views.task_queue_metrics, name='task_queue_metrics'),
 ]
\ No newline at end of file
@@ -1,15 +1,23 @@
 from rest_framework import viewsets, status
 from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import AllowAny
+from rest_framework.permissions import AllowAny, IsAdminUser
 from rest_framework.response import Response
 from django.shortcuts import get_object_or_404
 from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
+from django.conf import settings
+from django.db import transaction
 import json
 
 from apps.meetings.models import Meeting
-from apps.audio.models import AudioRecording
-from apps.audio.tasks import process_audio_recording
+from apps.audio.models import AudioRecording, AudioUpload
+from apps.audio.pipeline import start_meeting_pipeline
+from apps.audio.processors import discard_replaced_live_recording
+from apps.audio.uploads import abort_upload, append_chunk, finalize_upload, ChunkOutOfOrder
+from apps.audio.action_items import open_action_items_for
+from apps.audio.search import search_meetings
+from apps.audio.meeting_qa import MeetingQA
+from apps.core.task_queues import queue_depths
 from .serializers import MeetingSerializer, AudioRecordingSerializer
 
 class MeetingViewSet(viewsets.ModelViewSet):
@@ -23,6 +31,57 @@ class AudioRecordingViewSet(viewsets.ReadOnlyModelViewSet):
     serializer_class = AudioRecordingSerializer
     permission_classes = [AllowAny]
 
+def _resolve_host_participant(request, meeting, session_id):
+    """Find (or create) the uploading participant and check they are the meeting host"""
+    print(f"🎵 Looking for participant with session_id: {session_id}")
+    participant = meeting.participants.filter(session_id=session_id).first()
+    print(f"🎵 Found participant: {participant}")
+
+    # If no participant found, create one for the authenticated user
+    if not participant and request.user.is_authenticated:
+        print(f"🎵 Creating participant for authenticated user: {request.user}")
+        from apps.meetings.models import MeetingParticipant
+        participant = MeetingParticipant.objects.create(
+            meeting=meeting,
+            user=request.user,
+            session_id=session_id,
+            user_agent=request.META.get('HTTP_USER_AGENT', ''),
+            is_recording=False,
+        )
+        print(f"🎵 Created participant: {participant}")
+
+    if not participant:
+        print(f"🎵 No participant after creation attempt!")
+        return None, Response(
+            {'error': 'Participant not found'},
+            status=status.HTTP_404_NOT_FOUND
+        )
+
+    # ADMIN-ONLY RECORDING: Only the meeting host can upload recordings
+    if not participant.user or participant.user != meeting.host:
+        return None, Response(
+            {'error': 'Only the meeting admin can record'},
+            status=status.HTTP_403_FORBIDDEN
+        )
+
+    return participant, None
+
+def _get_host_upload(request, upload_id):
+    """Look up a chunked upload and check the request comes from the host who opened it"""
+    upload = get_object_or_404(
+        AudioUpload.objects.select_related('meeting', 'participant'), upload_id=upload_id
+    )
+
+    if (not request.user.is_authenticated
+            or request.user != upload.meeting.host
+            or upload.participant.user_id != request.user.pk):
+        return None, Response(
+            {'error': 'Only the meeting admin can record'},
+            status=status.HTTP_403_FORBIDDEN
+        )
+
+    return upload, None
+
 @api_view(['POST'])
 @permission_classes([AllowAny])
 def upload_audio(request):
@@ -49,48 +108,39 @@ def upload_audio(request):
         meeting = get_object_or_404(Meeting, meeting_id=meeting_id)
         print(f"🎵 Found meeting: {meeting}")
 
-        print(f"🎵 Looking for participant with session_id: {session_id}")
-        participant = meeting.participants.filter(session_id=session_id).first()
-        print(f"🎵 Found participant: {participant}")
+        participant, error_response = _resolve_host_participant(request, meeting, session_id)
+        if error_response:
+            return error_response
 
-        # If no participant found, create one for the authenticated user
-        if not participant and request.user.is_authenticated:
-            print(f"🎵 Creating participant for authenticated user: {request.user}")
-            from apps.meetings.models import MeetingParticipant
-            participant = MeetingParticipant.objects.create(
-                meeting=meeting,
-                user=request.user,
-                session_id=session_id,
-                user_agent=request.META.get('HTTP_USER_AGENT', ''),
-                is_recording=False,
-            )
-            print(f"🎵 Created participant: {participant}")
-
-        if not participant:
-            print(f"🎵 No participant after creation attempt!")
-            return Response(
-                {'error': 'Participant not found'},
-                status=status.HTTP_404_NOT_FOUND
-            )
-
-        # ADMIN-ONLY RECORDING: Only the meeting host can upload recordings
-        if not participant.user or participant.user != meeting.host:
-            return Response(
-                {'error': 'Only the meeting admin can record'},
-                status=status.HTTP_403_FORBIDDEN
-            )
+        # After a dropped live socket the client uploads the whole recording; it supersedes
+        # the partial live recording the server already stored
+        replaced = None
+        replaces_recording = request.data.get('replaces_recording')
+        if replaces_recording:
+            if str(replaces_recording).isdigit():
+                replaced = meeting.recordings.filter(
+                    pk=replaces_recording, transcription_service='deepgram_live'
+                ).first()
+            if not replaced:
+                return Response(
+                    {'error': 'Live recording not found'},
+                    status=status.HTTP_404_NOT_FOUND
+                )
         
         # Create audio recording
-        recording = AudioRecording.objects.create(
-            meeting=meeting,
-            participant=participant,
-            audio_file=audio_file,
-            format=audio_file.name.split('.')[-1].lower(),
-            file_size=audio_file.size
-        )
+        with transaction.atomic():
+            recording = AudioRecording.objects.create(
+                meeting=meeting,
+                participant=participant,
+                audio_file=audio_file,
+                format=audio_file.name.split('.')[-1].lower(),
+                file_size=audio_file.size
+            )
+            if replaced:
+                discard_replaced_live_recording(replaced)
         
-        # Queue for background processing
-        process_audio_recording.delay(recording.id)
+        # Queue transcription and the meeting stages that follow it
+        start_meeting_pipeline(meeting)
         
         return Response({
             'recording_id': recording.id,
@@ -104,6 +154,220 @@ def upload_audio(request):
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
         )
 
+@api_view(['POST'])
+@permission_classes([AllowAny])
+def start_audio_upload(request):
+    """Open a chunked upload session - the PWA then posts recorder chunks as they arrive"""
+    meeting_id = request.data.get('meeting_id')
+    session_id = request.data.get('session_id')
+    audio_format = (request.data.get('format') or 'webm').lower()
+
+    if not all([meeting_id, session_id]):
+        return Response(
+            {'error': 'Missing required fields'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    if audio_format not in settings.AUDIO_FORMATS:
+        return Response(
+            {'error': f'Unsupported format: {audio_format}'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    meeting = get_object_or_404(Meeting, meeting_id=meeting_id)
+
+    participant, error_response = _resolve_host_participant(request, meeting, session_id)
+    if error_response:
+        return error_response
+
+    upload = AudioUpload.objects.create(
+        meeting=meeting,
+        participant=participant,
+        format=audio_format,
+    )
+
+    return Response({
+        'upload_id': str(upload.upload_id),
+        'next_sequence': upload.next_sequence,
+    }, status=status.HTTP_201_CREATED)
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def audio_upload_status(request, upload_id):
+    """Report upload progress so a client can resume after a dropped connection"""
+    upload, error_response = _get_host_upload(request, upload_id)
+    if error_response:
+        return error_response
+
+    return Response({
+        'upload_id': str(upload.upload_id),
+        'status': upload.status,
+        'next_sequence': upload.next_sequence,
+        'bytes_received': upload.bytes_received,
+        'recording_id': upload.recording_id,
+    })
+
+@api_view(['POST'])
+@permission_classes([AllowAny])
+def upload_audio_chunk(request, upload_id):
+    """Append one recorder chunk to an open upload"""
+    upload, error_response = _get_host_upload(request, upload_id)
+    if error_response:
+        return error_response
+    chunk = request.FILES.get('chunk')
+
+    try:
+        sequence = int(request.data.get('sequence'))
+    except (TypeError, ValueError):
+        sequence = None
+
+    if chunk is None or sequence is None or sequence < 0:
+        return Response(
+            {'error': 'Missing required fields'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    if upload.bytes_received + chunk.size > settings.MAX_UPLOAD_SIZE:
+        return Response(
+            {'error': 'Upload exceeds maximum size'},
+            status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+        )
+
+    try:
+        stored = append_chunk(upload, sequence, chunk)
+    except ChunkOutOfOrder as e:
+        return Response(
+            {'error': str(e), 'next_sequence': e.expected},
+            status=status.HTTP_409_CONFLICT
+        )
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_409_CONFLICT)
+
+    upload.refresh_from_db(fields=['next_sequence'])
+
+    return Response({
+        'stored': stored,
+        'next_sequence': upload.next_sequence,
+    })
+
+@api_view(['POST'])
+@permission_classes([AllowAny])
+def finalize_audio_upload(request, upload_id):
+    """Stitch the uploaded chunks into a recording and queue it for transcription"""
+    upload, error_response = _get_host_upload(request, upload_id)
+    if error_response:
+        return error_response
+    already_finalized = upload.status == AudioUpload.Status.FINALIZED
+
+    try:
+        recording = finalize_upload(upload)
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_409_CONFLICT)
+
+    # Finalize is idempotent; only queue processing the first time
+    if not already_finalized:
+        start_meeting_pipeline(recording.meeting)
+
+    return Response({
+        'recording_id': recording.id,
+        'status': 'uploaded',
+        'queued_for_processing': True
+    })
+
+@api_view(['POST'])
+@permission_classes([AllowAny])
+def abort_audio_upload(request, upload_id):
+    """Discard an upload the client gave up on (e.g. it fell back to a single-file upload)"""
+    upload, error_response = _get_host_upload(request, upload_id)
+    if error_response:
+        return error_response
+
+    try:
+        abort_upload(upload)
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_409_CONFLICT)
+
+    return Response({
+        'upload_id': str(upload.upload_id),
+        'status': AudioUpload.Status.ABORTED,
+    })
+
+@api_view(['GET'])
+def my_action_items(request):
+    """Open action items assigned to the signed-in user across all meetings"""
+    if not request.user.email:
+        return Response({'action_items': []})
+
+    items = open_action_items_for(request.user.email)
+    return Response({
+        'action_items': [
+            {
+                **item.as_dict(),
+                'id': item.id,
+                'due_date_parsed': item.due_date,
+                'meeting_id': item.meeting.meeting_id,
+                'meeting_title': item.meeting.title,
+            }
+            for item in items
+        ]
+    })
+
+@api_view(['GET'])
+def search(request):
+    """Full-text search across the signed-in host's transcripts and summaries"""
+    query = request.GET.get('q', '').strip()
+    if not query:
+        return Response({'error': 'q is required'}, status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        limit = int(request.GET.get('limit', 20))
+    except ValueError:
+        return Response({'error': 'limit must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+    limit = max(1, min(limit, settings.SEARCH_MAX_RESULTS))
+
+    meetings = Meeting.objects.filter(host=request.user)
+    return Response({
+        'query': query,
+        'results': search_meetings(meetings, query, limit=limit),
+    })
+
+@api_view(['POST'])
+def ask_meetings(request):
+    """Answer a question from the signed-in host's meetings, citing meeting and timestamp"""
+    # Answers come only from the retrieval index, which is empty unless indexing is on
+    if not settings.RETRIEVAL_INDEX_ENABLED:
+        return Response({'error': 'Meeting Q&A is not enabled'}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+
+    question = str(request.data.get('question', '')).strip()
+    if not question:
+        return Response({'error': 'question is required'}, status=status.HTTP_400_BAD_REQUEST)
+    if len(question) > settings.QA_MAX_QUESTION_CHARS:
+        return Response({'error': f'question must be at most {settings.QA_MAX_QUESTION_CHARS} characters'},
+                        status=status.HTTP_400_BAD_REQUEST)
+
+    # Optionally restrict to some of the host's meetings (by public meeting_id)
+    meeting_ids = None
+    if request.data.get('meeting_ids'):
+        meeting_ids = list(Meeting.objects.filter(
+            host=request.user, meeting_id__in=request.data['meeting_ids']
+        ).values_list('pk', flat=True))
+
+    result = MeetingQA().answer(request.user, question, meeting_ids=meeting_ids)
+    return Response({
+        'question': question,
+        'answer': result['answer'],
+        'citations': result['citations'],
+    })
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def task_queue_metrics(request):
+    """Pending Celery messages per queue and priority lane"""
+    try:
+        return Response({'queues': queue_depths()})
+    except Exception as e:
+        return Response({'error': f'Broker unavailable: {e}'}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def meeting_status(request, meeting_id):
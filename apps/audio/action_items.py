@@ -0,0 +1,98 @@
+"""
+Normalized action items.
+MeetingSummary.action_items stays the source of truth written by the AI processors;
+sync_action_items() mirrors it into indexed ActionItem rows for per-owner queries.
+"""
+import logging
+from django.db import transaction
+from django.db.models import Count, Max
+from django.utils.dateparse import parse_date
+from .models import ActionItem
+
+logger = logging.getLogger(__name__)
+
+
+def _owner_emails(meeting):
+    """Map lower-cased display names (and emails) of known participants to their email"""
+    emails = set(meeting.expected_speakers or [])
+    emails.update(
+        meeting.agenda_items.exclude(assigned_participant='').values_list('assigned_participant', flat=True)
+    )
+
+    lookup = {}
+    for email in emails:
+        email = email.strip().lower()
+        if email:
+            lookup[email] = email
+            lookup[meeting.extract_name_from_email(email).lower()] = email
+    return lookup
+
+
+def resolve_owner_email(owner, lookup):
+    owner = (owner or '').strip()
+    if '@' in owner:
+        return owner.lower()
+    return lookup.get(owner.lower(), '')
+
+
+def _parse_due_date(value):
+    try:
+        return parse_date(str(value).strip()) if value else None
+    except ValueError:
+        return None
+
+
+def sync_action_items(meeting_summary):
+    """Replace the meeting's ActionItem rows with the summary's action_items"""
+    meeting = meeting_summary.meeting
+    lookup = _owner_emails(meeting)
+
+    # Keep completion state for items that survive a re-analysis unchanged
+    completed = set(
+        ActionItem.objects.filter(meeting=meeting, is_completed=True).values_list('task', 'owner')
+    )
+
+    rows = []
+    for position, item in enumerate(meeting_summary.action_items or []):
+        if not isinstance(item, dict) or not item.get('task'):
+            continue
+
+        task = str(item['task'])
+        owner = str(item.get('owner') or '')[:200]
+        due_date_text = str(item.get('due_date') or '')[:100]
+        rows.append(ActionItem(
+            meeting=meeting,
+            position=position,
+            task=task,
+            owner=owner,
+            owner_email=resolve_owner_email(owner, lookup),
+            due_date=_parse_due_date(due_date_text),
+            due_date_text=due_date_text,
+            priority=str(item.get('priority') or '')[:20],
+            agenda_item=str(item.get('agenda_item') or '')[:200],
+            is_completed=(task, owner) in completed,
+        ))
+
+    with transaction.atomic():
+        ActionItem.objects.filter(meeting=meeting).delete()
+        ActionItem.objects.bulk_create(rows)
+
+    logger.info(f"Synced {len(rows)} action items for meeting {meeting.meeting_id}")
+    return len(rows)
+
+
+def action_items_state(meeting):
+    """
+    (newest updated_at, row count) of the meeting's ActionItem rows.
+    Rows are synced after the summary is saved, so caches of them must key on this too.
+    """
+    state = ActionItem.objects.filter(meeting=meeting).aggregate(latest=Max('updated_at'), count=Count('id'))
+    return state['latest'], state['count']
+
+
+def open_action_items_for(email):
+    """Open action items owned by an email across all meetings - one indexed query"""
+    return ActionItem.objects.filter(
+        owner_email=email.strip().lower(),
+        is_completed=False
+    ).select_related('meeting').order_by('due_date', 'meeting_id', 'position')
@@ -1,12 +1,31 @@
 from django.contrib import admin
-from .models import AudioRecording, TranscriptionSegment, MeetingSummary
+from apps.meetings.models import Meeting
+from .action_items import sync_action_items
+from .pipeline import requeue_dead_letters
+from .search import index_segments
+from .transcripts import invalidate_transcript_document
+from .models import AudioRecording, AudioUpload, TranscriptionSegment, MeetingSummary, ActionItem, TranscriptDocument, AgendaItemSummary, LLMCacheEntry, TranscriptChunk, PipelineStageRun
 
 @admin.register(AudioRecording)
 class AudioRecordingAdmin(admin.ModelAdmin):
-    list_display = ['meeting', 'participant', 'duration_seconds', 'file_size', 'created_at']
-    list_filter = ['created_at', 'is_processed']
+    list_display = ['meeting', 'participant', 'duration_seconds', 'file_size', 'transcription_attempts', 'dead_lettered_at', 'created_at']
+    list_filter = ['created_at', 'is_processed', ('dead_lettered_at', admin.EmptyFieldListFilter)]
     search_fields = ['meeting__meeting_id', 'participant__user__username']
-    readonly_fields = ['created_at', 'updated_at', 'file_size']
+    readonly_fields = ['created_at', 'updated_at', 'file_size', 'transcription_attempts', 'last_transcription_error', 'dead_lettered_at']
+    actions = ['requeue_transcription']
+
+    def requeue_transcription(self, request, queryset):
+        """Retry dead-lettered recordings"""
+        count = requeue_dead_letters(queryset)
+        self.message_user(request, f"Requeued {count} recordings for transcription")
+    requeue_transcription.short_description = "Requeue dead-lettered recordings"
+
+@admin.register(AudioUpload)
+class AudioUploadAdmin(admin.ModelAdmin):
+    list_display = ['upload_id', 'meeting', 'status', 'next_sequence', 'bytes_received', 'created_at']
+    list_filter = ['status', 'created_at']
+    search_fields = ['upload_id', 'meeting__meeting_id']
+    readonly_fields = ['upload_id', 'created_at', 'updated_at']
 
 @admin.register(TranscriptionSegment)
 class TranscriptionSegmentAdmin(admin.ModelAdmin):
@@ -14,8 +33,73 @@ class TranscriptionSegmentAdmin(admin.ModelAdmin):
     list_filter = ['confidence', 'recording__created_at']
     search_fields = ['text', 'speaker_id', 'recording__meeting__meeting_id']
 
+    # Keep the stored transcript document and search vectors in step with hand edits
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        if not change or 'text' in form.changed_data:
+            index_segments([obj.pk])
+        invalidate_transcript_document(obj.recording.meeting)
+
+    def delete_model(self, request, obj):
+        meeting = obj.recording.meeting
+        super().delete_model(request, obj)
+        invalidate_transcript_document(meeting)
+
+    def delete_queryset(self, request, queryset):
+        meeting_ids = set(queryset.values_list('recording__meeting_id', flat=True))
+        super().delete_queryset(request, queryset)
+        for meeting in Meeting.objects.filter(pk__in=meeting_ids):
+            invalidate_transcript_document(meeting)
+
 @admin.register(MeetingSummary)
 class MeetingSummaryAdmin(admin.ModelAdmin):
     list_display = ['meeting', 'created_at']
     search_fields = ['meeting__meeting_id', 'summary']
-    readonly_fields = ['created_at', 'updated_at']
\ No newline at end of file
+    readonly_fields = ['created_at', 'updated_at']
+
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        if 'action_items' in form.changed_data:
+            sync_action_items(obj)
+
+@admin.register(ActionItem)
+class ActionItemAdmin(admin.ModelAdmin):
+    list_display = ['task', 'meeting', 'owner', 'owner_email', 'due_date', 'priority', 'is_completed']
+    list_filter = ['is_completed', 'priority', 'due_date']
+    search_fields = ['task', 'owner', 'owner_email', 'meeting__meeting_id']
+    readonly_fields = ['created_at', 'updated_at']
+
+@admin.register(TranscriptDocument)
+class TranscriptDocumentAdmin(admin.ModelAdmin):
+    list_display = ['meeting', 'version', 'built_version', 'segment_count', 'size', 'updated_at']
+    search_fields = ['meeting__meeting_id']
+    exclude = ['data']
+    readonly_fields = ['created_at', 'updated_at']
+
+@admin.register(AgendaItemSummary)
+class AgendaItemSummaryAdmin(admin.ModelAdmin):
+    list_display = ['meeting', 'agenda_item', 'segment_count', 'updated_at']
+    search_fields = ['meeting__meeting_id', 'agenda_item__title']
+    readonly_fields = ['created_at', 'updated_at']
+
+@admin.register(LLMCacheEntry)
+class LLMCacheEntryAdmin(admin.ModelAdmin):
+    list_display = ['key', 'model', 'size', 'hits', 'last_used_at', 'expires_at']
+    list_filter = ['model']
+    search_fields = ['key']
+    readonly_fields = ['created_at', 'updated_at']
+
+@admin.register(TranscriptChunk)
+class TranscriptChunkAdmin(admin.ModelAdmin):
+    list_display = ['meeting', 'speaker_name', 'start_time', 'end_time', 'embedding_model', 'created_at']
+    list_filter = ['embedding_model']
+    search_fields = ['meeting__meeting_id', 'speaker_name']
+    exclude = ['embedding']
+    readonly_fields = ['created_at', 'updated_at']
+
+@admin.register(PipelineStageRun)
+class PipelineStageRunAdmin(admin.ModelAdmin):
+    list_display = ['idempotency_key', 'meeting', 'stage', 'status', 'attempts', 'completed_at']
+    list_filter = ['stage', 'status']
+    search_fields = ['idempotency_key', 'meeting__meeting_id']
+    readonly_fields = ['created_at', 'updated_at']
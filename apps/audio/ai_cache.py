@@ -0,0 +1,170 @@
+"""
+Content-addressed cache for LLM responses.
+Identical requests (same model, prompts and parameters) are answered from Redis,
+falling back to the database when Redis is unavailable or has evicted the entry.
+"""
+import hashlib
+import json
+import logging
+from datetime import timedelta
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F
+from django.utils import timezone
+from .models import LLMCacheEntry
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = 'llm_cache'
+STATS_HITS_KEY = f'{KEY_PREFIX}:stats:hits'
+STATS_MISSES_KEY = f'{KEY_PREFIX}:stats:misses'
+
+
+def make_cache_key(params):
+    """Hash every request parameter - model, prompt template, input text and sampling options"""
+    payload = json.dumps(params, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def cached_chat_completion(client, response_cache, **params):
+    """
+    Chat completion served from response_cache (an LLMResponseCache, or None to always
+    call the API) when the exact request was seen before. Only complete answers are stored.
+    """
+    key = make_cache_key(params)
+    if response_cache:
+        cached = response_cache.get(key)
+        if cached is not None:
+            return cached
+
+    response = client.chat.completions.create(**params)
+    return _store(response_cache, key, response, params)
+
+
+async def acached_chat_completion(create, response_cache, **params):
+    """cached_chat_completion() for async callers; create(**params) is awaited for the response"""
+    key = make_cache_key(params)
+    if response_cache:
+        cached = await sync_to_async(response_cache.get)(key)
+        if cached is not None:
+            return cached
+
+    response = await create(**params)
+    return await sync_to_async(_store)(response_cache, key, response, params)
+
+
+def _store(response_cache, key, response, params):
+    content = response.choices[0].message.content
+    # A truncated answer (finish_reason 'length') would be served forever
+    if response_cache and response.choices[0].finish_reason == 'stop':
+        response_cache.set(key, content, params['model'])
+    return content
+
+
+class LLMResponseCache:
+    """Two-tier (Redis, then database) cache of LLM completions"""
+
+    def __init__(self):
+        self.ttl = getattr(settings, 'AI_CACHE_TTL', 30 * 24 * 3600)
+        self.max_entries = getattr(settings, 'AI_CACHE_MAX_ENTRIES', 10000)
+        self.max_entry_bytes = getattr(settings, 'AI_CACHE_MAX_ENTRY_BYTES', 256 * 1024)
+
+    def get(self, key):
+        """Return the cached response text, or None on a miss"""
+        value = None
+        try:
+            value = cache.get(f'{KEY_PREFIX}:{key}')
+        except Exception as e:
+            logger.warning(f"LLM cache: Redis lookup failed, using database: {e}")
+
+        if value is None:
+            value = self._get_from_database(key)
+            if value is not None:
+                self._set_in_redis(key, value)
+
+        self._record(hit=value is not None)
+        return value
+
+    def set(self, key, value, model):
+        """Store a response in both tiers, skipping oversized entries"""
+        size = len(value.encode('utf-8'))
+        if size > self.max_entry_bytes:
+            return
+
+        self._set_in_redis(key, value)
+
+        now = timezone.now()
+        try:
+            LLMCacheEntry.objects.update_or_create(
+                key=key,
+                defaults={
+                    'model': model,
+                    'response': value,
+                    'size': size,
+                    'last_used_at': now,
+                    'expires_at': now + timedelta(seconds=self.ttl) if self.ttl else None,
+                }
+            )
+            self._evict()
+        except Exception as e:
+            logger.warning(f"LLM cache: database write failed: {e}")
+
+    def stats(self):
+        """Hit/miss counters and database tier size"""
+        hits = misses = 0
+        try:
+            hits = cache.get(STATS_HITS_KEY, 0)
+            misses = cache.get(STATS_MISSES_KEY, 0)
+        except Exception as e:
+            logger.warning(f"LLM cache: could not read stats: {e}")
+
+        total = hits + misses
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': hits / total if total else 0.0,
+            'database_entries': LLMCacheEntry.objects.count(),
+        }
+
+    def reset_stats(self):
+        cache.delete_many([STATS_HITS_KEY, STATS_MISSES_KEY])
+
+    def _get_from_database(self, key):
+        now = timezone.now()
+        try:
+            entry = LLMCacheEntry.objects.filter(key=key).only('response', 'expires_at').first()
+            if entry is None:
+                return None
+            if entry.expires_at and entry.expires_at < now:
+                entry.delete()
+                return None
+
+            LLMCacheEntry.objects.filter(pk=entry.pk).update(hits=F('hits') + 1, last_used_at=now)
+            return entry.response
+        except Exception as e:
+            logger.warning(f"LLM cache: database lookup failed: {e}")
+            return None
+
+    def _set_in_redis(self, key, value):
+        try:
+            cache.set(f'{KEY_PREFIX}:{key}', value, timeout=self.ttl or None)
+        except Exception as e:
+            logger.warning(f"LLM cache: Redis write failed: {e}")
+
+    def _evict(self):
+        """Drop expired entries, then least recently used ones beyond max_entries"""
+        LLMCacheEntry.objects.filter(expires_at__lt=timezone.now()).delete()
+
+        excess = LLMCacheEntry.objects.count() - self.max_entries
+        if excess > 0:
+            stale = LLMCacheEntry.objects.order_by('last_used_at').values_list('pk', flat=True)[:excess]
+            LLMCacheEntry.objects.filter(pk__in=list(stale)).delete()
+
+    def _record(self, hit):
+        counter = STATS_HITS_KEY if hit else STATS_MISSES_KEY
+        try:
+            cache.add(counter, 0, timeout=None)
+            cache.incr(counter)
+        except Exception:
+            pass
@@ -6,19 +6,30 @@ Handles transcript cleanup, minutes generation, and action item extraction.
 import os
 import json
 import logging
+import re
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Tuple, Optional
 from django.conf import settings
+from django.db import connection
 from django.utils import timezone
 from openai import OpenAI
+from .ai_cache import LLMResponseCache, cached_chat_completion
+from .transcripts import get_transcript_document
 
 logger = logging.getLogger(__name__)
 
+SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?])\s+')
+
 
 class MeetingAIProcessor:
     """AI processor for meeting transcripts using OpenAI GPT-4"""
 
     def __init__(self):
         self.client = OpenAI(api_key=os.environ.get('OPENAI_API_KEY'))
+        self.chunk_max_chars = getattr(settings, 'AI_CHUNK_MAX_CHARS', 12000)
+        self.chunk_window_seconds = getattr(settings, 'AI_CHUNK_WINDOW_SECONDS', 600)
+        self.max_concurrency = getattr(settings, 'AI_MAX_CONCURRENCY', 4)
+        self.cache = LLMResponseCache() if getattr(settings, 'AI_CACHE_ENABLED', True) else None
 
     def process_meeting_transcript(self, meeting_summary) -> bool:
         """
@@ -41,11 +52,16 @@ class MeetingAIProcessor:
                 logger.error("No raw transcript available for processing")
                 return False
 
-            # Step 1: Clean the transcript
-            clean_transcript = self._clean_transcript(meeting_summary.raw_transcript)
+            # Step 1: Split on speaker-turn and agenda boundaries, clean chunks concurrently
+            chunks = self._build_transcript_chunks(meeting_summary)
+            cleaned_chunks = self._clean_chunks(chunks)
+            clean_transcript = '\n\n'.join(cleaned_chunks)
 
-            # Step 2: Generate meeting analysis
-            analysis = self._analyze_meeting(clean_transcript, meeting_summary.meeting)
+            # Step 2: Map - extract notes per chunk; Reduce - analyze the combined notes
+            chunk_notes = None
+            if len(cleaned_chunks) > 1:
+                chunk_notes = self._map_chunk_notes(chunks, cleaned_chunks)
+            analysis = self._analyze_meeting(clean_transcript, meeting_summary.meeting, chunk_notes=chunk_notes)
 
             # Step 3: Update the summary
             meeting_summary.clean_transcript = clean_transcript
@@ -67,8 +83,171 @@ class MeetingAIProcessor:
             logger.error(f"AI processing failed for meeting {meeting_summary.meeting.meeting_id}: {e}")
             return False
 
+    def _build_transcript_chunks(self, meeting_summary) -> List[Dict]:
+        """
+        Split the transcript into chunks of whole speaker turns.
+        A new chunk starts when the agenda item changes, at every chunk_window_seconds of
+        meeting time, or when the size limit is reached. Boundaries come from the content
+        rather than from packing, so editing one segment only changes the chunks (and LLM
+        cache keys) of its own time window.
+        """
+        document = get_transcript_document(meeting_summary.meeting)
+
+        # Collapse consecutive segments from the same speaker into turns
+        turns = []
+        for group in document['grouped_segments']:
+            for segment in group['segments']:
+                speaker, text, agenda_title = segment['speaker_name'], segment['text'], segment['agenda_item_title']
+                window = int(segment['start_time'] // self.chunk_window_seconds)
+                if (turns and turns[-1]['speaker'] == speaker and turns[-1]['agenda_item'] == agenda_title
+                        and turns[-1]['window'] == window):
+                    turns[-1]['text'] += f" {text}"
+                else:
+                    turns.append({'speaker': speaker, 'text': text, 'agenda_item': agenda_title, 'window': window})
+
+        if turns:
+            lines = [
+                (line, turn['agenda_item'], turn['window'])
+                for turn in turns
+                for line in self._split_turn(turn['speaker'], turn['text'])
+            ]
+        else:
+            # No segment data (e.g. transcript edited by hand) - each line is a speaker turn
+            lines = [
+                (part, None, None)
+                for line in meeting_summary.raw_transcript.splitlines() if line.strip()
+                for part in self._split_turn(None, line)
+            ]
+
+        chunks = []
+        for line, agenda_title, window in lines:
+            current = chunks[-1] if chunks else None
+            if (current is None
+                    or current['agenda_item'] != agenda_title
+                    or current['window'] != window
+                    or len(current['text']) + len(line) > self.chunk_max_chars):
+                chunks.append({'text': line, 'agenda_item': agenda_title, 'window': window})
+            else:
+                current['text'] += f"\n{line}"
+
+        logger.info(f"Split transcript into {len(chunks)} chunks from {len(lines)} speaker turns")
+        return chunks
+
+    def _split_turn(self, speaker: Optional[str], text: str) -> List[str]:
+        """
+        One speaker turn as "Speaker: text" lines of at most chunk_max_chars, broken at
+        sentence boundaries (or words, for a single overlong sentence) so no chunk overflows.
+        """
+        prefix = f"{speaker}: " if speaker else ''
+        limit = max(self.chunk_max_chars - len(prefix), 1)
+        if len(text) <= limit:
+            return [prefix + text]
+
+        pieces = []
+        current = ''
+        for sentence in SENTENCE_BOUNDARY.split(text):
+            while len(sentence) > limit:
+                cut = sentence.rfind(' ', 0, limit + 1)
+                cut = cut if cut > 0 else limit
+                if current:
+                    pieces.append(current)
+                    current = ''
+                pieces.append(sentence[:cut])
+                sentence = sentence[cut:].lstrip()
+            if current and len(current) + 1 + len(sentence) > limit:
+                pieces.append(current)
+                current = sentence
+            else:
+                current = f"{current} {sentence}" if current else sentence
+        if current:
+            pieces.append(current)
+        return [prefix + piece for piece in pieces]
+
+    def _clean_chunks(self, chunks: List[Dict]) -> List[str]:
+        """Clean chunks concurrently with bounded parallelism, preserving order"""
+        if len(chunks) <= 1:
+            return [self._clean_transcript(chunk['text']) for chunk in chunks]
+
+        return self._run_concurrently(lambda chunk: self._clean_transcript(chunk['text']), chunks)
+
+    def _map_chunk_notes(self, chunks: List[Dict], cleaned_chunks: List[str]) -> List[Dict]:
+        """Extract structured notes from each cleaned chunk concurrently (map step)"""
+        work = [
+            (index, chunk['agenda_item'], cleaned, chunk.get('window'))
+            for index, (chunk, cleaned) in enumerate(zip(chunks, cleaned_chunks))
+        ]
+
+        return self._run_concurrently(lambda item: self._extract_chunk_notes(*item), work)
+
+    def _run_concurrently(self, func, items: List) -> List:
+        """Map func over items with at most max_concurrency threads, preserving order"""
+        def run(item):
+            try:
+                return func(item)
+            finally:
+                # Cache lookups open a DB connection per executor thread
+                connection.close()
+
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            return list(executor.map(run, items))
+
+    def _chat_completion(self, **params) -> str:
+        return cached_chat_completion(self.client, self.cache, **params)
+
+    def _extract_chunk_notes(self, index: int, agenda_item: Optional[str], chunk_text: str,
+                             window: Optional[int] = None) -> Dict:
+        """Summarize one part of the meeting into notes for the reduce step"""
+
+        system_prompt = """You are taking notes on one part of a longer meeting transcript.
+
+Return valid JSON with these exact keys:
+- summary (string, 2-4 sentences)
+- key_points (array of strings)
+- action_items (array of objects with: task, owner, due_date, priority)
+- decisions_made (array of strings)
+- speakers (object mapping speaker label to a one-line description of their contribution)
+
+Only include what is in this part of the transcript."""
+
+        # Label by meeting time rather than position, so an earlier chunk splitting does not change this request
+        label = f"Part from minute {window * self.chunk_window_seconds // 60}" if window is not None else f"Part {index + 1}"
+        user_prompt = f"""{label}{f' (agenda item: {agenda_item})' if agenda_item else ''}:
+
+{chunk_text}"""
+
+        try:
+            content = self._chat_completion(
+                model="gpt-4o-mini",
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_prompt}
+                ],
+                temperature=0.1,
+                max_tokens=1500,
+                response_format={"type": "json_object"}
+            )
+            notes = json.loads(content)
+
+        except Exception as e:
+            logger.error(f"Note extraction failed for chunk {index + 1}: {e}")
+            notes = {'summary': chunk_text[:2000]}
+
+        notes['part'] = index + 1
+        notes['agenda_item'] = agenda_item
+        return notes
+
     def _clean_transcript(self, raw_transcript: str) -> str:
         """Clean and format the raw transcript"""
+        try:
+            content = self._chat_completion(**self._build_cleanup_request(raw_transcript))
+            return content.strip()
+
+        except Exception as e:
+            logger.error(f"Transcript cleaning failed: {e}")
+            return raw_transcript  # Return original if cleaning fails
+
+    def _build_cleanup_request(self, raw_transcript: str) -> Dict:
+        """Chat completion parameters for cleaning one transcript (or chunk)"""
 
         system_prompt = """You are a professional transcript editor. Your job is to clean up meeting transcripts while preserving all important content and speaker identification.
 
@@ -89,38 +268,23 @@ Return only the cleaned transcript."""
 
 Make it professional and readable while preserving all important information."""
 
-        try:
-            response = self.client.chat.completions.create(
-                model="gpt-4o-mini",  # Cost-effective for cleanup tasks
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                temperature=0.1,  # Low temperature for consistent formatting
-                max_tokens=4000
-            )
-
-            return response.choices[0].message.content.strip()
-
-        except Exception as e:
-            logger.error(f"Transcript cleaning failed: {e}")
-            return raw_transcript  # Return original if cleaning fails
-
-    def _analyze_meeting(self, clean_transcript: str, meeting) -> Dict:
-        """Analyze the meeting and extract structured information"""
-
-        # Get agenda items with assigned participants
-        agenda_context = self._build_agenda_context(meeting)
-
-        meeting_context = f"""
-Meeting Title: {meeting.title or 'Untitled Meeting'}
-Meeting Date: {meeting.created_at.strftime('%Y-%m-%d')}
-Host: {meeting.host.get_full_name() if meeting.host else 'Unknown'}
-Duration: {self._estimate_duration(meeting)}
+        return dict(
+            model="gpt-4o-mini",  # Cost-effective for cleanup tasks
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt}
+            ],
+            temperature=0.1,  # Low temperature for consistent formatting
+            max_tokens=4000
+        )
+
+    def _analyze_meeting(self, clean_transcript: str, meeting, chunk_notes: Optional[List[Dict]] = None) -> Dict:
+        """
+        Analyze the meeting and extract structured information.
+        For long meetings, chunk_notes (from the map step) are analyzed instead of the full transcript.
+        """
 
-Agenda Items:
-{agenda_context}
-"""
+        meeting_context = self._build_meeting_context(meeting)
 
         system_prompt = """You are an AI meeting assistant specialized in analyzing meeting transcripts and generating professional meeting minutes.
 
@@ -146,16 +310,22 @@ Return your analysis in valid JSON format with these exact keys:
 
 Be specific and actionable. Use agenda context to intelligently assign action items."""
 
+        if chunk_notes:
+            transcript_section = f"""Notes from each part of the meeting, in order (JSON):
+{json.dumps(chunk_notes, indent=1)}"""
+        else:
+            transcript_section = f"""Transcript:
+{clean_transcript}"""
+
         user_prompt = f"""Meeting Context:
 {meeting_context}
 
-Transcript:
-{clean_transcript}
+{transcript_section}
 
 Please analyze this meeting and provide structured output in JSON format."""
 
         try:
-            response = self.client.chat.completions.create(
+            content = self._chat_completion(
                 model="gpt-4o",  # Use full GPT-4 for complex analysis
                 messages=[
                     {"role": "system", "content": system_prompt},
@@ -166,7 +336,7 @@ Please analyze this meeting and provide structured output in JSON format."""
             )
 
             # Parse JSON response
-            analysis_text = response.choices[0].message.content.strip()
+            analysis_text = content.strip()
 
             # Remove markdown code blocks if present
             if analysis_text.startswith('```json'):
@@ -189,6 +359,34 @@ Please analyze this meeting and provide structured output in JSON format."""
             logger.error(f"Meeting analysis failed: {e}")
             return self._get_default_analysis()
 
+    def _build_meeting_context(self, meeting) -> str:
+        """Meeting metadata and agenda shared by all analysis prompts"""
+        # Get agenda items with assigned participants
+        agenda_context = self._build_agenda_context(meeting)
+
+        return f"""
+Meeting Title: {meeting.title or 'Untitled Meeting'}
+Meeting Date: {meeting.created_at.strftime('%Y-%m-%d')}
+Host: {meeting.host.get_full_name() if meeting.host else 'Unknown'}
+Duration: {self._estimate_duration(meeting)}
+
+Agenda Items:
+{agenda_context}
+"""
+
+    def _build_agenda_context(self, meeting) -> str:
+        """List agenda items with their assigned owners for action item assignment"""
+        lines = []
+        for index, item in enumerate(meeting.agenda_items.all(), start=1):
+            owner = f" (owner: {item.participant_name} <{item.assigned_participant}>)" if item.assigned_participant else ""
+            lines.append(f"{index}. {item.title}{owner}")
+
+        return '\n'.join(lines) if lines else "No agenda items"
+
+    def _build_participation_stats(self, meeting) -> Dict:
+        """Speaking time per speaker, computed from segment timings rather than by the LLM"""
+        return get_transcript_document(meeting)['speaker_stats']
+
     def _estimate_duration(self, meeting) -> str:
         """Estimate meeting duration based on available data"""
         if meeting.started_at and meeting.ended_at:
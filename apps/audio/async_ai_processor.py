@@ -0,0 +1,181 @@
+"""
+Asyncio variant of the meeting AI processor.
+Cleanup and the independent sub-analyses (key points, action items, decisions) run
+concurrently on the raw transcript chunks instead of waiting for the cleaned text.
+"""
+
+import asyncio
+import json
+import logging
+import os
+from typing import Dict, List
+from django.conf import settings
+from django.utils import timezone
+from openai import AsyncOpenAI
+from .ai_cache import acached_chat_completion
+from .ai_processor import MeetingAIProcessor
+
+logger = logging.getLogger(__name__)
+
+# Sub-analyses that only need the raw transcript: key -> (model, output instructions)
+SUB_ANALYSES = {
+    'key_points': (
+        "gpt-4o-mini",
+        """Extract the key discussion points.
+Return JSON: {"key_points": [string, ...]}"""
+    ),
+    'action_items': (
+        "gpt-4o",
+        """Extract action items (specific tasks with smart owner assignment).
+
+Assignment logic:
+- If discussion happens during a specific agenda item, assign related action items to that agenda item's owner
+- If no agenda context, look for explicit mentions in transcript ("John will handle...", "Sarah, can you...")
+- If no clear owner, leave as "TBD" for admin review
+
+Return JSON: {"action_items": [{"task": ..., "owner": ..., "due_date": ..., "priority": ..., "agenda_item": ...}, ...]}"""
+    ),
+    'decisions_made': (
+        "gpt-4o-mini",
+        """Extract the concrete decisions reached.
+Return JSON: {"decisions_made": [string, ...]}"""
+    ),
+}
+
+
+class AsyncMeetingAIProcessor(MeetingAIProcessor):
+    """Meeting AI processor that fans independent OpenAI calls out concurrently"""
+
+    def __init__(self):
+        super().__init__()
+        self.request_timeout = getattr(settings, 'AI_REQUEST_TIMEOUT', 120)
+        self.async_client = AsyncOpenAI(api_key=os.environ.get('OPENAI_API_KEY'))
+        self._semaphore = None
+
+    def process_meeting_transcript(self, meeting_summary) -> bool:
+        """Same contract as MeetingAIProcessor.process_meeting_transcript"""
+        try:
+            meeting = meeting_summary.meeting
+            logger.info(f"Starting async AI processing for meeting {meeting.meeting_id}")
+
+            meeting_summary.ai_processing_started_at = timezone.now()
+            meeting_summary.save()
+
+            if not meeting_summary.raw_transcript:
+                logger.error("No raw transcript available for processing")
+                return False
+
+            # Database work stays outside the event loop
+            chunks = self._build_transcript_chunks(meeting_summary)
+            meeting_context = self._build_meeting_context(meeting)
+            participants_summary = self._build_participation_stats(meeting)
+
+            cleaned_chunks, analysis = asyncio.run(self._run_pipeline(chunks, meeting_context))
+
+            meeting_summary.clean_transcript = '\n\n'.join(cleaned_chunks)
+            meeting_summary.executive_summary = analysis['executive_summary']
+            meeting_summary.key_points = analysis['key_points']
+            meeting_summary.action_items = analysis['action_items']
+            meeting_summary.decisions_made = analysis['decisions_made']
+            meeting_summary.participants_summary = participants_summary
+
+            meeting_summary.is_ai_processed = True
+            meeting_summary.ai_processing_completed_at = timezone.now()
+            meeting_summary.save()
+
+            logger.info(f"Async AI processing completed for meeting {meeting.meeting_id}")
+            return True
+
+        except Exception as e:
+            logger.error(f"Async AI processing failed for meeting {meeting_summary.meeting.meeting_id}: {e}")
+            return False
+
+    async def _run_pipeline(self, chunks: List[Dict], meeting_context: str):
+        """Clean all chunks and run every sub-analysis on every chunk concurrently"""
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        cleaning = asyncio.gather(*(self._clean_chunk(chunk['text']) for chunk in chunks))
+        extractions = {
+            key: asyncio.gather(*(self._extract(key, chunk, meeting_context) for chunk in chunks))
+            for key in SUB_ANALYSES
+        }
+
+        cleaned_chunks, *extracted = await asyncio.gather(cleaning, *extractions.values())
+
+        analysis = {
+            key: self._merge_lists(per_chunk)
+            for key, per_chunk in zip(extractions.keys(), extracted)
+        }
+
+        # The only dependent step: summarize what the sub-analyses found
+        analysis['executive_summary'] = await self._summarize(meeting_context, analysis)
+        return cleaned_chunks, analysis
+
+    async def _clean_chunk(self, raw_text: str) -> str:
+        try:
+            content = await self._achat_completion(**self._build_cleanup_request(raw_text))
+            return content.strip()
+        except Exception as e:
+            logger.error(f"Async transcript cleaning failed: {e}")
+            return raw_text
+
+    async def _extract(self, key: str, chunk: Dict, meeting_context: str) -> List:
+        model, instructions = SUB_ANALYSES[key]
+        agenda = f"\nActive agenda item: {chunk['agenda_item']}" if chunk['agenda_item'] else ""
+
+        try:
+            content = await self._achat_completion(
+                model=model,
+                messages=[
+                    {"role": "system", "content": f"You are an AI meeting assistant analyzing part of a meeting transcript.\n\n{instructions}"},
+                    {"role": "user", "content": f"Meeting Context:\n{meeting_context}{agenda}\n\nTranscript:\n{chunk['text']}"}
+                ],
+                temperature=0.2,
+                max_tokens=1500,
+                response_format={"type": "json_object"}
+            )
+            result = json.loads(content).get(key, [])
+            return result if isinstance(result, list) else []
+        except Exception as e:
+            logger.error(f"Async {key} extraction failed: {e}")
+            return []
+
+    async def _summarize(self, meeting_context: str, analysis: Dict) -> str:
+        findings = {key: analysis[key] for key in SUB_ANALYSES}
+        try:
+            content = await self._achat_completion(
+                model="gpt-4o",
+                messages=[
+                    {"role": "system", "content": "You write 2-3 sentence executive summaries of meetings from structured notes. Return only the summary."},
+                    {"role": "user", "content": f"Meeting Context:\n{meeting_context}\n\nNotes (JSON):\n{json.dumps(findings, indent=1)}"}
+                ],
+                temperature=0.2,
+                max_tokens=300
+            )
+            return content.strip()
+        except Exception as e:
+            logger.error(f"Async executive summary failed: {e}")
+            return self._get_default_analysis()['executive_summary']
+
+    async def _achat_completion(self, **params) -> str:
+        """Cached, semaphore-bounded chat completion with a per-call timeout"""
+        async def create(**params):
+            async with self._semaphore:
+                return await asyncio.wait_for(
+                    self.async_client.chat.completions.create(**params),
+                    timeout=self.request_timeout
+                )
+
+        return await acached_chat_completion(create, self.cache, **params)
+
+    @staticmethod
+    def _merge_lists(per_chunk: List[List]) -> List:
+        """Concatenate per-chunk results in order, dropping exact duplicates"""
+        merged, seen = [], set()
+        for items in per_chunk:
+            for item in items:
+                fingerprint = json.dumps(item, sort_keys=True)
+                if fingerprint not in seen:
+                    seen.add(fingerprint)
+                    merged.append(item)
+        return merged
@@ -0,0 +1,184 @@
+import json
+import logging
+import tempfile
+from channels.generic.websocket import AsyncWebsocketConsumer
+from channels.db import database_sync_to_async
+from django.conf import settings
+from django.core.files import File
+from django.db import DatabaseError
+from django.utils import timezone
+from apps.meetings.models import Meeting, MeetingParticipant
+from .models import AudioRecording
+from .pipeline import start_meeting_pipeline
+from .processors import AudioProcessor
+from .retrieval import schedule_retrieval_index
+from .rolling_summary import schedule_partial_summaries
+from .segment_writer import SegmentWriter
+from .streaming import LiveTranscriptionSession
+from .transcripts import invalidate_transcript_document
+
+logger = logging.getLogger(__name__)
+
+
+class LiveTranscriptionConsumer(AsyncWebsocketConsumer):
+    """
+    Receives audio frames from the host device and streams them to speech-to-text.
+    Partial and final segments are broadcast to the meeting group; finals are persisted as they arrive.
+    """
+
+    async def connect(self):
+        self.meeting_id = self.scope['url_route']['kwargs']['meeting_id']
+        self.room_group_name = f'meeting_{self.meeting_id}'
+        self.session = None
+        self.recording = None
+        self.writer = None
+        self.audio_buffer = None
+
+        if not settings.LIVE_TRANSCRIPTION_ENABLED:
+            await self.close()
+            return
+
+        self.recording = await self.create_live_recording()
+        if not self.recording:
+            await self.close()
+            return
+
+        self.writer = SegmentWriter(self.recording, AudioProcessor._identify_speaker)
+        self.audio_buffer = tempfile.TemporaryFile()
+
+        try:
+            self.session = LiveTranscriptionSession(self.handle_segment)
+            await self.session.start()
+        except Exception as e:
+            logger.error(f"Could not start live transcription for {self.meeting_id}: {e}")
+            await self.discard_live_recording()
+            await self.close()
+            return
+
+        await self.accept()
+        # The client ties a fallback upload to this recording if the socket drops mid-meeting
+        await self.send(text_data=json.dumps({'type': 'live_recording', 'recording_id': self.recording.id}))
+
+    async def disconnect(self, close_code):
+        if self.session:
+            await self.session.finish()
+            self.session = None
+
+        if self.recording:
+            await self.complete_live_recording()
+
+    async def receive(self, text_data=None, bytes_data=None):
+        if bytes_data:
+            self.audio_buffer.write(bytes_data)
+            await self.session.send(bytes_data)
+        elif text_data:
+            data = json.loads(text_data)
+            if data.get('type') == 'stop':
+                await self.close()
+
+    async def handle_segment(self, segment):
+        """Broadcast a partial or final result and persist finals"""
+        if segment['is_final']:
+            speaker_name = await self.save_segment(segment)
+            await self.channel_layer.group_send(
+                self.room_group_name,
+                {
+                    'type': 'transcript_update',
+                    'transcript': {
+                        'speaker': speaker_name,
+                        'speaker_id': segment['speaker_id'],
+                        'speaker_confidence': 1.0,
+                        'text': segment['text'],
+                        'start_time': segment['start_time'],
+                        'end_time': segment['end_time'],
+                    },
+                }
+            )
+        else:
+            await self.channel_layer.group_send(
+                self.room_group_name,
+                {
+                    'type': 'transcript_partial',
+                    'transcript': {
+                        'speaker_id': segment['speaker_id'],
+                        'text': segment['text'],
+                        'start_time': segment['start_time'],
+                    },
+                }
+            )
+
+    @database_sync_to_async
+    def create_live_recording(self):
+        """Create the AudioRecording that live segments attach to - host only"""
+        try:
+            meeting = Meeting.objects.get(meeting_id=self.meeting_id)
+        except Meeting.DoesNotExist:
+            return None
+
+        user = self.scope.get('user')
+        if meeting.status == Meeting.Status.COMPLETED:
+            return None
+        if not user or not user.is_authenticated or user != meeting.host:
+            return None
+
+        participant, _ = MeetingParticipant.objects.get_or_create(
+            meeting=meeting,
+            session_id=f"live_{user.id}",
+            defaults={'user': user, 'is_recording': True}
+        )
+
+        return AudioRecording.objects.create(
+            meeting=meeting,
+            participant=participant,
+            format='webm',
+            transcription_service='deepgram_live',
+            processing_started_at=timezone.now(),
+        )
+
+    @database_sync_to_async
+    def discard_live_recording(self):
+        """Remove a live recording whose STT session never started"""
+        self.recording.delete()
+        self.recording = None
+        self.audio_buffer.close()
+
+    @database_sync_to_async
+    def save_segment(self, segment):
+        """Persist one final segment, tagged with the agenda item active right now"""
+        self.writer.refresh_agenda_item()
+        saved = self.writer.add(
+            start_time=segment['start_time'],
+            end_time=segment['end_time'],
+            text=segment['text'],
+            speaker_id=segment['speaker_id'],
+            confidence=segment['confidence'],
+        )
+        self.writer.flush()
+        schedule_partial_summaries(self.recording.meeting, [saved.agenda_item_id])
+        return saved.speaker_name
+
+    @database_sync_to_async
+    def complete_live_recording(self):
+        """Store the captured audio and mark the live recording processed"""
+        recording = self.recording
+        size = self.audio_buffer.tell()
+        self.audio_buffer.seek(0)
+
+        if size:
+            recording.audio_file.save(f"live_recording_{recording.id}.webm", File(self.audio_buffer), save=False)
+        self.audio_buffer.close()
+
+        recording.file_size = size
+        recording.is_processed = True
+        recording.processing_completed_at = timezone.now()
+        try:
+            recording.save(update_fields=['audio_file', 'file_size', 'is_processed', 'processing_completed_at', 'updated_at'])
+        except DatabaseError:
+            # Already replaced by the client's full upload; update_fields keeps save() from re-inserting it
+            logger.info(f"Live recording {recording.id} was replaced before it completed")
+            recording.audio_file.delete(save=False)
+            return
+        invalidate_transcript_document(recording.meeting)
+        schedule_retrieval_index(recording.meeting)
+
+        start_meeting_pipeline(recording.meeting)
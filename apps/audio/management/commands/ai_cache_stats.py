@@ -0,0 +1,33 @@
+"""
+Show LLM response cache hit rate and size.
+Run: python manage.py ai_cache_stats [--reset] [--clear]
+"""
+
+from django.core.management.base import BaseCommand
+from apps.audio.ai_cache import LLMResponseCache
+from apps.audio.models import LLMCacheEntry
+
+
+class Command(BaseCommand):
+    help = 'Report LLM response cache hit-rate metrics'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reset', action='store_true', help='Reset hit/miss counters after reporting')
+        parser.add_argument('--clear', action='store_true', help='Delete all database cache entries')
+
+    def handle(self, *args, **options):
+        llm_cache = LLMResponseCache()
+        stats = llm_cache.stats()
+
+        self.stdout.write(f"Hits:             {stats['hits']}")
+        self.stdout.write(f"Misses:           {stats['misses']}")
+        self.stdout.write(f"Hit rate:         {stats['hit_rate']:.1%}")
+        self.stdout.write(f"Database entries: {stats['database_entries']}")
+
+        if options['reset']:
+            llm_cache.reset_stats()
+            self.stdout.write(self.style.SUCCESS("Counters reset"))
+
+        if options['clear']:
+            deleted, _ = LLMCacheEntry.objects.all().delete()
+            self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} database entries"))
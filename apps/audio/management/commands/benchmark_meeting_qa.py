@@ -0,0 +1,139 @@
+"""
+Benchmark "ask my meetings" latency with a stubbed embedding model and LLM.
+Run: python manage.py benchmark_meeting_qa [--meetings 500] [--chunks-per-meeting 200] [--questions 200]
+
+Builds a synthetic organization with random chunk vectors, then times retrieval + prompt
+assembly (cold and cached) against QA_P95_TARGET_MS. All rows are rolled back afterwards.
+"""
+
+import random
+import statistics
+import time
+from types import SimpleNamespace
+import numpy as np
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from apps.meetings.models import Meeting
+from apps.audio.meeting_qa import MeetingQA
+from apps.audio.models import TranscriptChunk
+from apps.audio.retrieval import get_vector_index, to_bytes
+
+WORDS = "budget roadmap hiring pricing churn launch security vendor contract migration forecast review".split()
+
+
+class StubClient:
+    """Deterministic embeddings and a fixed cited answer after an optional delay"""
+
+    def __init__(self, dimensions, llm_latency):
+        self.dimensions = dimensions
+        self.llm_latency = llm_latency
+        self.embeddings = SimpleNamespace(create=self._embed)
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._complete))
+
+    def _embed(self, model, input, dimensions):
+        data = []
+        for index, text in enumerate(input):
+            rng = np.random.default_rng(abs(hash(text)) % (2 ** 32))
+            data.append(SimpleNamespace(index=index, embedding=rng.standard_normal(dimensions)))
+        return SimpleNamespace(data=data)
+
+    def _complete(self, **params):
+        time.sleep(self.llm_latency)
+        message = SimpleNamespace(content="The budget was approved [1] and the owner confirmed the date [2].")
+        return SimpleNamespace(choices=[SimpleNamespace(message=message, finish_reason='stop')])
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Measure p50/p95 latency of meeting question answering with a stubbed LLM'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--meetings', type=int, default=500)
+        parser.add_argument('--chunks-per-meeting', type=int, default=200)
+        parser.add_argument('--questions', type=int, default=200)
+        parser.add_argument('--distinct-questions', type=int, default=50, help='Repeats exercise the caches')
+        parser.add_argument('--llm-latency-ms', type=float, default=0, help='Simulated model latency')
+
+    def handle(self, *args, **options):
+        dimensions = settings.EMBEDDING_DIMENSIONS
+        rng = random.Random(42)
+        questions = [
+            f"What did we decide about {rng.choice(WORDS)} and {rng.choice(WORDS)} ({i})?"
+            for i in range(options['distinct_questions'])
+        ]
+
+        qa = MeetingQA(client=StubClient(dimensions, options['llm_latency_ms'] / 1000))
+        qa.cache = None  # Keep stub answers out of the shared LLM response cache
+        qa.min_score = -1.0  # Random vectors are near-orthogonal; keep every retrieved excerpt
+
+        try:
+            with transaction.atomic():
+                organization = self._create_corpus(options, dimensions)
+
+                cold, warm, total = [], [], []
+                seen = set()
+                for _ in range(options['questions']):
+                    question = rng.choice(questions)
+                    start = time.perf_counter()
+                    result = qa.answer(organization, question)
+                    total.append((time.perf_counter() - start) * 1000)
+                    (warm if question in seen else cold).append(result['timings']['context_ms'])
+                    seen.add(question)
+
+                raise _Rollback()
+        except _Rollback:
+            pass
+
+        self._report('context (cold)', cold)
+        self._report('context (cached)', warm)
+        self._report('end to end', total)
+
+        context_p95 = self._p95(cold + warm)
+        target = settings.QA_P95_TARGET_MS
+        style = self.style.SUCCESS if context_p95 <= target else self.style.ERROR
+        self.stdout.write(style(f"Retrieval + assembly p95 {context_p95:.1f}ms (target {target}ms)"))
+
+    def _create_corpus(self, options, dimensions):
+        start = time.perf_counter()
+        organization = User.objects.create(username='qa-benchmark')
+        meetings = Meeting.objects.bulk_create([
+            Meeting(title=f'QA benchmark {i}', host=organization) for i in range(options['meetings'])
+        ], batch_size=1000)
+
+        generator = np.random.default_rng(7)
+        for meeting in meetings:
+            vectors = generator.standard_normal((options['chunks_per_meeting'], dimensions)).astype(np.float32)
+            vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+            chunks = [
+                TranscriptChunk(
+                    meeting=meeting, organization=organization,
+                    speaker_name=f'Speaker {i % 5}', start_time=i * 30.0, end_time=i * 30.0 + 25,
+                    text=' '.join(random.choices(WORDS, k=60)),
+                    first_segment_id=i * 10 + 1, last_segment_id=i * 10 + 10,
+                    embedding=to_bytes(vector), embedding_model='benchmark',
+                )
+                for i, vector in enumerate(vectors)
+            ]
+            TranscriptChunk.objects.bulk_create(chunks, batch_size=1000)
+            get_vector_index().add(chunks, vectors)
+
+        total = options['meetings'] * options['chunks_per_meeting']
+        self.stdout.write(f"Corpus: {options['meetings']} meetings, {total} chunks "
+                          f"({time.perf_counter() - start:.1f}s to build)")
+        return organization
+
+    @staticmethod
+    def _p95(timings):
+        timings = sorted(timings)
+        return timings[max(int(len(timings) * 0.95) - 1, 0)] if timings else 0.0
+
+    def _report(self, label, timings):
+        if not timings:
+            return
+        self.stdout.write(f"  {label:<18} p50 {statistics.median(timings):8.1f}ms  "
+                          f"p95 {self._p95(timings):8.1f}ms  ({len(timings)} questions)")
@@ -0,0 +1,136 @@
+"""
+Benchmark full-text search latency on a synthetic corpus.
+Run: python manage.py benchmark_search [--meetings 200] [--segments-per-meeting 1000] [--hosts 20]
+
+The sizing target is --meetings 10000 --segments-per-meeting 1000 (10M segments).
+Segments are generated server-side with generate_series, so this needs PostgreSQL.
+All rows are rolled back afterwards unless --keep is given.
+"""
+
+import random
+import statistics
+import time
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from apps.meetings.models import Meeting, MeetingParticipant
+from apps.audio.models import AudioRecording, MeetingSummary, TranscriptionSegment
+from apps.audio.search import (
+    is_search_available, matching_meetings_q, search_config, search_meetings, summary_search_vector,
+)
+
+VOCABULARY = (
+    "we should ship the release next week once review is done and budget approved "
+    "customer onboarding churn pricing roadmap hiring migration database latency "
+    "dashboard contract renewal security audit vendor forecast quarterly launch "
+    "marketing campaign partnership retention invoice compliance kubernetes"
+).split()
+
+QUERIES = ['budget', 'pricing roadmap', 'security audit', 'churn', '"contract renewal"', 'kubernetes -latency']
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Measure p50/p95 full-text search latency over synthetic transcripts'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--meetings', type=int, default=200)
+        parser.add_argument('--segments-per-meeting', type=int, default=1000)
+        parser.add_argument('--hosts', type=int, default=20, help='Meetings are spread across this many hosts')
+        parser.add_argument('--queries', type=int, default=200, help='Searches to time')
+        parser.add_argument('--keep', action='store_true', help='Keep the synthetic rows (for repeated runs)')
+
+    def handle(self, *args, **options):
+        if not is_search_available():
+            raise CommandError('benchmark_search requires a PostgreSQL database')
+
+        try:
+            with transaction.atomic():
+                hosts = self._create_corpus(options)
+                self._time_searches(hosts, options['queries'])
+                if not options['keep']:
+                    raise _Rollback()
+        except _Rollback:
+            pass
+
+    def _create_corpus(self, options):
+        start = time.perf_counter()
+        hosts = [User(username=f'search-benchmark-{i}') for i in range(options['hosts'])]
+        User.objects.bulk_create(hosts)
+
+        meetings = Meeting.objects.bulk_create([
+            Meeting(title=f'Search benchmark {i}', host=hosts[i % len(hosts)])
+            for i in range(options['meetings'])
+        ], batch_size=1000)
+        participants = MeetingParticipant.objects.bulk_create([
+            MeetingParticipant(meeting=meeting, session_id='benchmark') for meeting in meetings
+        ], batch_size=1000)
+        recordings = AudioRecording.objects.bulk_create([
+            AudioRecording(meeting=meeting, participant=participant,
+                           audio_file='recordings/benchmark.webm', format='webm', is_processed=True)
+            for meeting, participant in zip(meetings, participants)
+        ], batch_size=1000)
+
+        # Twelve pseudo-random vocabulary words per segment, generated inside the database
+        with connection.cursor() as cursor:
+            for offset in range(0, len(recordings), 100):
+                cursor.execute(f"""
+                    INSERT INTO {TranscriptionSegment._meta.db_table}
+                        (created_at, updated_at, recording_id, start_time, end_time, text,
+                         speaker_id, speaker_name, words, search_vector)
+                    SELECT now(), now(), r.id, n * 4.0, n * 4.0 + 3.5, t.text,
+                           'speaker_' || (n % 6), 'Speaker ' || (n % 6), '[]'::jsonb,
+                           to_tsvector(%s::regconfig, t.text)
+                    FROM unnest(%s::bigint[]) AS r(id)
+                    CROSS JOIN generate_series(1, %s) AS n
+                    CROSS JOIN LATERAL (
+                        SELECT array_to_string(ARRAY(
+                            SELECT (%s::text[])[1 + ((n * 7919 + k * 104729 + r.id * 31) %% %s)]
+                            FROM generate_series(1, 12) AS k
+                        ), ' ') AS text
+                    ) AS t
+                """, [search_config(), [r.id for r in recordings[offset:offset + 100]],
+                      options['segments_per_meeting'], VOCABULARY, len(VOCABULARY)])
+
+        summaries = MeetingSummary.objects.bulk_create([
+            MeetingSummary(meeting=meeting, executive_summary=f'Discussed {VOCABULARY[i % len(VOCABULARY)]} '
+                                                              f'and {VOCABULARY[(i * 7) % len(VOCABULARY)]}.')
+            for i, meeting in enumerate(meetings)
+        ], batch_size=1000)
+        with connection.cursor() as cursor:
+            cursor.execute(f"ANALYZE {TranscriptionSegment._meta.db_table}")
+        MeetingSummary.objects.filter(pk__in=[s.pk for s in summaries]).update(search_vector=summary_search_vector())
+
+        total = options['meetings'] * options['segments_per_meeting']
+        self.stdout.write(f"Corpus: {options['meetings']} meetings, {total} segments, "
+                          f"{len(hosts)} hosts ({time.perf_counter() - start:.1f}s to build)")
+        return hosts
+
+    def _time_searches(self, hosts, count):
+        rng = random.Random(42)
+        api_timings = []
+        list_timings = []
+        for _ in range(count):
+            host = rng.choice(hosts)
+            query = rng.choice(QUERIES)
+            meetings = Meeting.objects.filter(host=host)
+
+            start = time.perf_counter()
+            search_meetings(meetings, query, limit=20)
+            api_timings.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            list(meetings.filter(matching_meetings_q(query, host)).values_list('pk', flat=True)[:50])
+            list_timings.append(time.perf_counter() - start)
+
+        self._report('search API', api_timings)
+        self._report('meeting list filter', list_timings)
+
+    def _report(self, label, timings):
+        timings = sorted(timings)
+        p50 = statistics.median(timings) * 1000
+        p95 = timings[int(len(timings) * 0.95) - 1] * 1000 if len(timings) > 1 else p50
+        self.stdout.write(f"  {label:<20} p50 {p50:8.1f}ms  p95 {p95:8.1f}ms  ({len(timings)} queries)")
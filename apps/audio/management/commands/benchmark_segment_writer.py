@@ -0,0 +1,105 @@
+"""
+Benchmark per-row segment inserts against the batched SegmentWriter.
+Run: python manage.py benchmark_segment_writer [--hours 2] [--batch-size 500]
+
+Uses a synthetic Deepgram response; all rows are rolled back afterwards.
+"""
+
+import random
+import time
+from types import SimpleNamespace
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from apps.meetings.models import Meeting, MeetingParticipant
+from apps.audio.models import AudioRecording, TranscriptionSegment
+from apps.audio.processors import AudioProcessor
+from apps.audio.segment_writer import SegmentWriter
+
+
+def build_synthetic_paragraphs(hours, speakers=6, seed=42):
+    """Build Deepgram-shaped paragraphs covering the given duration"""
+    rng = random.Random(seed)
+    words = "we should ship the release next week once the review is done and the budget is approved".split()
+
+    paragraphs = []
+    clock = 0.0
+    end_of_meeting = hours * 3600
+    while clock < end_of_meeting:
+        speaker = rng.randrange(speakers)
+        sentences = []
+        for _ in range(rng.randint(1, 6)):
+            duration = rng.uniform(1.5, 6.0)
+            text = ' '.join(rng.choice(words) for _ in range(int(duration * 2.5))).capitalize() + '.'
+            sentences.append(SimpleNamespace(start=clock, end=clock + duration, text=text, speaker=speaker))
+            clock += duration
+        paragraphs.append(SimpleNamespace(sentences=sentences))
+    return paragraphs
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Compare segments/second for per-row inserts vs. batched SegmentWriter'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hours', type=float, default=2.0, help='Length of the synthetic recording')
+        parser.add_argument('--batch-size', type=int, default=None, help='Rows per bulk INSERT')
+
+    def handle(self, *args, **options):
+        paragraphs = build_synthetic_paragraphs(options['hours'])
+        sentences = [s for p in paragraphs for s in p.sentences]
+        self.stdout.write(f"Synthetic response: {len(sentences)} sentences over {options['hours']}h")
+
+        # Only the speaker helper is needed, so skip the Deepgram client setup
+        processor = AudioProcessor.__new__(AudioProcessor)
+
+        try:
+            with transaction.atomic():
+                recording = self._create_fixture_recording()
+
+                start = time.perf_counter()
+                for sentence in sentences:
+                    speaker_id = f"speaker_{sentence.speaker}"
+                    TranscriptionSegment.objects.create(
+                        recording=recording,
+                        start_time=sentence.start,
+                        end_time=sentence.end,
+                        text=sentence.text,
+                        confidence=None,
+                        speaker_id=speaker_id,
+                        speaker_name=processor._identify_speaker(recording.meeting, speaker_id),
+                        agenda_item=recording.meeting.current_agenda_item
+                    )
+                legacy_seconds = time.perf_counter() - start
+
+                start = time.perf_counter()
+                writer = SegmentWriter(recording, processor._identify_speaker, batch_size=options['batch_size'])
+                for sentence in sentences:
+                    writer.add(sentence.start, sentence.end, sentence.text, speaker_id=f"speaker_{sentence.speaker}")
+                writer.flush()
+                batched_seconds = time.perf_counter() - start
+
+                raise _Rollback()
+        except _Rollback:
+            pass
+
+        self._report('Per-row create()', len(sentences), legacy_seconds)
+        self._report('SegmentWriter', len(sentences), batched_seconds)
+        if batched_seconds > 0:
+            self.stdout.write(self.style.SUCCESS(f"Speedup: {legacy_seconds / batched_seconds:.1f}x"))
+
+    def _create_fixture_recording(self):
+        meeting = Meeting.objects.create(title='Segment writer benchmark')
+        participant = MeetingParticipant.objects.create(meeting=meeting, session_id='benchmark')
+        return AudioRecording.objects.create(
+            meeting=meeting,
+            participant=participant,
+            audio_file='recordings/benchmark.webm',
+            format='webm',
+        )
+
+    def _report(self, label, count, seconds):
+        rate = count / seconds if seconds else float('inf')
+        self.stdout.write(f"  {label:<18} {seconds:8.2f}s  {rate:10.0f} segments/s")
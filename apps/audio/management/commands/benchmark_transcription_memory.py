@@ -0,0 +1,91 @@
+"""
+Measure peak RSS per transcription task for each Deepgram input mode.
+Run: python manage.py benchmark_transcription_memory [--size-mb 100] [--name recordings/x.webm]
+
+Each mode runs in a forked child so its high-water mark is isolated. The Deepgram
+request is simulated by consuming the source the way the HTTP client would, so no
+API calls are made.
+"""
+
+import multiprocessing
+import os
+import resource
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+from apps.audio.sources import open_transcription_source, INPUT_MODES, INPUT_MODE_URL
+
+# httpx reads file-like request bodies in 64 KB chunks
+REQUEST_CHUNK_SIZE = 64 * 1024
+
+
+def _current_rss_kb():
+    """Current resident set size in KB (Linux)"""
+    with open('/proc/self/statm') as statm:
+        pages = int(statm.read().split()[1])
+    return pages * os.sysconf('SC_PAGE_SIZE') // 1024
+
+
+def _simulate_request(mode, source):
+    """Consume a source the way the Deepgram REST client sends it"""
+    if 'buffer' in source:
+        return len(source['buffer'])
+    if 'stream' in source:
+        sent = 0
+        while True:
+            chunk = source['stream'].read(REQUEST_CHUNK_SIZE)
+            if not chunk:
+                return sent
+            sent += len(chunk)
+    return len(source['url'])
+
+
+def _run_task(name, mode, results):
+    baseline_kb = _current_rss_kb()
+    with open_transcription_source(name, mode=mode) as (_, source):
+        sent = _simulate_request(mode, source)
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    results.put((mode, sent, max(peak_kb - baseline_kb, 0)))
+
+
+class Command(BaseCommand):
+    help = 'Compare peak RSS per transcription task for url/stream/buffer input modes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--size-mb', type=int, default=100, help='Size of the synthetic recording')
+        parser.add_argument('--name', help='Existing recording in storage to use instead of a synthetic one')
+
+    def handle(self, *args, **options):
+        name = options['name']
+        created = False
+        if not name:
+            name = default_storage.save(
+                'recordings/benchmark/memory_profile.webm',
+                ContentFile(os.urandom(options['size_mb'] * 1024 * 1024))
+            )
+            created = True
+
+        try:
+            size_mb = default_storage.size(name) / (1024 * 1024)
+            self.stdout.write(f"Recording: {name} ({size_mb:.1f} MB)")
+
+            context = multiprocessing.get_context('fork')
+            for mode in INPUT_MODES:
+                if mode == INPUT_MODE_URL and not hasattr(default_storage, 'bucket'):
+                    self.stdout.write(f"  {mode:<7} skipped (needs S3/Spaces storage)")
+                    continue
+
+                results = context.Queue()
+                child = context.Process(target=_run_task, args=(name, mode, results))
+                child.start()
+                child.join()
+
+                if child.exitcode != 0:
+                    self.stdout.write(self.style.ERROR(f"  {mode:<7} failed (exit code {child.exitcode})"))
+                    continue
+
+                _, sent, peak_kb = results.get()
+                self.stdout.write(f"  {mode:<7} peak RSS +{peak_kb / 1024:8.1f} MB  ({sent / (1024 * 1024):.1f} MB sent)")
+        finally:
+            if created:
+                default_storage.delete(name)
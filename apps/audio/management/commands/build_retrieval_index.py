@@ -0,0 +1,37 @@
+"""
+Embed transcripts of meetings that are not yet (fully) in the retrieval index.
+Run: python manage.py build_retrieval_index [--meeting MEETING_ID] [--rebuild]
+
+Incremental by default: only segments newer than a meeting's last embedded chunk are sent.
+"""
+
+from django.core.management.base import BaseCommand
+from apps.meetings.models import Meeting
+from apps.audio.retrieval import INDEX_LOCK_TIMEOUT, Embedder, build_meeting_index
+
+
+class Command(BaseCommand):
+    help = 'Chunk and embed processed transcripts for semantic retrieval'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--meeting', help='Only index this meeting_id')
+        parser.add_argument('--rebuild', action='store_true', help='Drop and re-embed existing chunks')
+
+    def handle(self, *args, **options):
+        meetings = Meeting.objects.filter(recordings__is_processed=True).distinct()
+        if options['meeting']:
+            meetings = meetings.filter(meeting_id=options['meeting'])
+
+        embedder = Embedder()
+        total = 0
+        for meeting in meetings.iterator():
+            # Wait out a background run rather than skipping the meeting
+            added = build_meeting_index(meeting, embedder=embedder, rebuild=options['rebuild'], wait=INDEX_LOCK_TIMEOUT)
+            if added is None:
+                self.stdout.write(self.style.WARNING(f"  {meeting.meeting_id}: still locked by another run, skipped"))
+                continue
+            if added:
+                self.stdout.write(f"  {meeting.meeting_id}: {added} chunks")
+            total += added
+
+        self.stdout.write(self.style.SUCCESS(f"Embedded {total} chunks"))
@@ -0,0 +1,45 @@
+"""
+Backfill full-text search vectors for transcripts and summaries.
+Run: python manage.py rebuild_search_index [--meeting MEETING_ID] [--all]
+
+New segments and summaries are indexed as they are written; this covers rows
+created before search existed, or a change of SEARCH_CONFIG (--all).
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+from apps.audio.models import MeetingSummary, TranscriptionSegment
+from apps.audio.search import index_summary, index_unindexed_segments, is_search_available
+
+
+class Command(BaseCommand):
+    help = 'Write tsvector columns for transcription segments and meeting summaries'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--meeting', help='Only index this meeting_id')
+        parser.add_argument('--all', action='store_true', help='Re-index rows that already have a vector')
+
+    def handle(self, *args, **options):
+        if not is_search_available():
+            raise CommandError('Full-text search requires a PostgreSQL database')
+
+        segments = TranscriptionSegment.objects.all()
+        summaries = MeetingSummary.objects.all()
+        if options['meeting']:
+            segments = segments.filter(recording__meeting__meeting_id=options['meeting'])
+            summaries = summaries.filter(meeting__meeting_id=options['meeting'])
+        if options['all']:
+            segments.update(search_vector=None)
+
+        # One recording per UPDATE keeps transactions short on large tables
+        recording_ids = segments.filter(search_vector__isnull=True).values_list('recording_id', flat=True).distinct()
+        indexed = 0
+        for recording_id in list(recording_ids):
+            indexed += index_unindexed_segments(segments.filter(recording_id=recording_id))
+
+        if not options['all']:
+            summaries = summaries.filter(search_vector__isnull=True)
+        summary_count = 0
+        for summary in summaries.iterator():
+            summary_count += index_summary(summary)
+
+        self.stdout.write(self.style.SUCCESS(f"Indexed {indexed} segments and {summary_count} summaries"))
@@ -0,0 +1,106 @@
+"""
+Local stand-in for Deepgram's live transcription API, for development and tests.
+Run: python manage.py run_fake_stt_server [--port 8765]
+Then set DEEPGRAM_LIVE_URL=http://localhost:8765 and LIVE_TRANSCRIPTION_ENABLED=true.
+
+For every few audio frames received it emits an interim result, then a final one,
+cycling through a canned script and alternating speakers.
+"""
+
+import asyncio
+import json
+from django.core.management.base import BaseCommand
+
+SCRIPT = [
+    "Good morning everyone, let's get started.",
+    "First item is the release schedule for next week.",
+    "The build is green and the review is nearly done.",
+    "Can you send the final numbers by Friday?",
+    "Sure, I will share them with the team tomorrow.",
+    "Great, let's move on to the budget discussion.",
+]
+
+
+def build_result(text, start, duration, speaker, is_final):
+    """Deepgram-shaped live Results message"""
+    words = text.split()
+    step = duration / max(len(words), 1)
+    return json.dumps({
+        'type': 'Results',
+        'channel_index': [0, 1],
+        'duration': duration,
+        'start': start,
+        'is_final': is_final,
+        'speech_final': is_final,
+        'channel': {
+            'alternatives': [{
+                'transcript': text,
+                'confidence': 0.95,
+                'words': [
+                    {
+                        'word': word.strip('.,?!').lower(),
+                        'punctuated_word': word,
+                        'start': start + i * step,
+                        'end': start + (i + 1) * step,
+                        'confidence': 0.95,
+                        'speaker': speaker,
+                    }
+                    for i, word in enumerate(words)
+                ],
+            }],
+        },
+        'metadata': {
+            'request_id': 'fake-stt',
+            'model_uuid': 'fake-stt',
+            'model_info': {'name': 'fake', 'version': '0', 'arch': 'fake'},
+        },
+    })
+
+
+class Command(BaseCommand):
+    help = 'Run a local fake streaming speech-to-text server that speaks the Deepgram live protocol'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', default='127.0.0.1')
+        parser.add_argument('--port', type=int, default=8765)
+        parser.add_argument('--frames-per-segment', type=int, default=8,
+                            help='Audio frames received before a segment is finalized')
+
+    def handle(self, *args, **options):
+        asyncio.run(self.serve(options['host'], options['port'], options['frames_per_segment']))
+
+    async def serve(self, host, port, frames_per_segment):
+        from websockets.asyncio.server import serve
+
+        async def session(websocket):
+            frames = 0
+            line = 0
+            start = 0.0
+            segment_duration = 3.0
+            partial_at = max(frames_per_segment // 2, 1)
+
+            async for message in websocket:
+                if isinstance(message, str):
+                    if json.loads(message).get('type') == 'CloseStream':
+                        if frames % frames_per_segment:
+                            text = SCRIPT[line % len(SCRIPT)]
+                            await websocket.send(build_result(text, start, segment_duration, line % 2, True))
+                        break
+                    continue
+
+                frames += 1
+                text = SCRIPT[line % len(SCRIPT)]
+                if frames % frames_per_segment == partial_at:
+                    words = text.split()
+                    partial = ' '.join(words[:max(len(words) // 2, 1)])
+                    await websocket.send(build_result(partial, start, segment_duration / 2, line % 2, False))
+                elif frames % frames_per_segment == 0:
+                    await websocket.send(build_result(text, start, segment_duration, line % 2, True))
+                    start += segment_duration
+                    line += 1
+
+            await websocket.close()
+
+        async with serve(session, host, port) as server:
+            self.stdout.write(self.style.SUCCESS(f"Fake STT server listening on ws://{host}:{port}"))
+            await server.serve_forever()
@@ -0,0 +1,26 @@
+"""
+Rebuild normalized ActionItem rows from MeetingSummary.action_items.
+Run: python manage.py sync_action_items [--meeting MEETING_ID]
+"""
+
+from django.core.management.base import BaseCommand
+from apps.audio.action_items import sync_action_items
+from apps.audio.models import MeetingSummary
+
+
+class Command(BaseCommand):
+    help = 'Backfill indexed action-item rows from AI-processed meeting summaries'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--meeting', help='Only sync this meeting_id')
+
+    def handle(self, *args, **options):
+        summaries = MeetingSummary.objects.filter(is_ai_processed=True).select_related('meeting')
+        if options['meeting']:
+            summaries = summaries.filter(meeting__meeting_id=options['meeting'])
+
+        total = 0
+        for summary in summaries.iterator():
+            total += sync_action_items(summary)
+
+        self.stdout.write(self.style.SUCCESS(f"Synced {total} action items"))
@@ -0,0 +1,34 @@
+"""
+List or requeue recordings whose transcription failed permanently.
+Run: python manage.py transcription_dead_letters [--meeting MEETING_ID] [--requeue]
+"""
+
+from django.core.management.base import BaseCommand
+from apps.audio.models import AudioRecording
+from apps.audio.pipeline import requeue_dead_letters
+
+
+class Command(BaseCommand):
+    help = 'Inspect the transcription dead-letter queue and optionally retry it'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--meeting', help='Only recordings of this meeting_id')
+        parser.add_argument('--requeue', action='store_true', help='Restart transcription for the listed recordings')
+
+    def handle(self, *args, **options):
+        recordings = AudioRecording.objects.filter(dead_lettered_at__isnull=False).select_related('meeting')
+        if options['meeting']:
+            recordings = recordings.filter(meeting__meeting_id=options['meeting'])
+
+        for recording in recordings.order_by('dead_lettered_at'):
+            self.stdout.write(
+                f"  #{recording.id} meeting {recording.meeting.meeting_id} "
+                f"({recording.transcription_attempts} attempts, {recording.dead_lettered_at:%Y-%m-%d %H:%M}): "
+                f"{recording.last_transcription_error[:120]}"
+            )
+
+        if options['requeue']:
+            count = requeue_dead_letters(recordings)
+            self.stdout.write(self.style.SUCCESS(f"Requeued {count} recordings"))
+        else:
+            self.stdout.write(f"{recordings.count()} dead-lettered recordings")
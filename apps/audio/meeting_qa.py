@@ -0,0 +1,207 @@
+"""
+"Ask my meetings": question answering over an organization's meeting corpus.
+retrieve chunks -> assemble a bounded, numbered context -> answer citing [n] sources.
+
+The question embedding and the assembled context are cached (keyed by the
+organization's index version, so new meetings invalidate them) and the answer goes
+through the LLM response cache, so a repeated question costs no model calls at all.
+"""
+import hashlib
+import logging
+import os
+import re
+import time
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+from openai import OpenAI
+from .ai_cache import LLMResponseCache, cached_chat_completion
+from .models import MeetingSummary
+from .retrieval import Embedder, index_version, retrieve_by_vector
+
+logger = logging.getLogger(__name__)
+
+CONTEXT_KEY_PREFIX = 'meeting_qa:context'
+EMBEDDING_KEY_PREFIX = 'meeting_qa:embedding'
+CITATION_PATTERN = re.compile(r'\[(\d+)\]')
+NO_RESULTS_ANSWER = "I couldn't find anything about that in your meetings."
+
+SYSTEM_PROMPT = """You answer questions about an organization's past meetings using only the numbered transcript excerpts provided.
+
+Rules:
+- Cite every claim with the excerpt number in square brackets, e.g. [2] or [1][3]
+- If the excerpts do not contain the answer, say so plainly - do not guess
+- Be concise: a short paragraph or a few bullet points
+- Refer to people by the speaker names shown in the excerpts"""
+
+
+def format_timestamp(seconds):
+    minutes, seconds = divmod(int(seconds or 0), 60)
+    return f"{minutes:02d}:{seconds:02d}"
+
+
+def _question_hash(question):
+    normalized = ' '.join(question.lower().split())
+    return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+
+
+class MeetingQA:
+    """Retrieval-augmented answers with citations to meeting and timestamp"""
+
+    def __init__(self, client=None):
+        self.client = client or OpenAI(api_key=os.environ.get('OPENAI_API_KEY'))
+        self.embedder = Embedder(client=self.client)
+        self.cache = LLMResponseCache() if getattr(settings, 'AI_CACHE_ENABLED', True) else None
+        self.model = getattr(settings, 'QA_MODEL', 'gpt-4o-mini')
+        self.top_k = getattr(settings, 'QA_TOP_K', 12)
+        self.context_max_chars = getattr(settings, 'QA_CONTEXT_MAX_CHARS', 8000)
+        self.min_score = getattr(settings, 'QA_MIN_SCORE', 0.15)
+        self.cache_timeout = getattr(settings, 'QA_CACHE_TIMEOUT', 3600)
+
+    def answer(self, organization, question, meeting_ids=None):
+        """
+        Answer a question from the organization's meetings.
+
+        Args:
+            organization: host User whose meetings are searched
+            question: natural-language question
+            meeting_ids: optional Meeting primary keys to restrict retrieval to
+
+        Returns:
+            dict with answer, citations (meeting, speaker, timestamps) and per-stage timings in ms
+        """
+        timings = {}
+        start = time.perf_counter()
+        context = self.build_context(organization, question, meeting_ids)
+        timings['context_ms'] = (time.perf_counter() - start) * 1000
+
+        if not context['sources']:
+            return {'answer': NO_RESULTS_ANSWER, 'citations': [], 'timings': timings}
+
+        start = time.perf_counter()
+        answer = self._chat_completion(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": context['prompt']},
+            ],
+            temperature=0.1,
+            max_tokens=getattr(settings, 'QA_MAX_ANSWER_TOKENS', 500),
+        )
+        timings['answer_ms'] = (time.perf_counter() - start) * 1000
+
+        return {
+            'answer': answer,
+            'citations': self._citations(answer, context['sources']),
+            'timings': timings,
+        }
+
+    def build_context(self, organization, question, meeting_ids=None):
+        """Retrieved sources and the assembled prompt, cached until the organization's index changes"""
+        scope = ','.join(str(pk) for pk in sorted(meeting_ids)) if meeting_ids is not None else 'all'
+        key = (f"{CONTEXT_KEY_PREFIX}:{organization.pk}:{index_version(organization)}:"
+               f"{hashlib.sha256(scope.encode()).hexdigest()[:16]}:{_question_hash(question)}")
+
+        context = self._cache_get(key)
+        if context is not None:
+            return context
+
+        chunks = retrieve_by_vector(organization, self._embed_question(question), k=self.top_k, meeting_ids=meeting_ids)
+        sources = self._select_sources(chunks)
+        context = {
+            'sources': sources,
+            'prompt': self._build_prompt(question, sources),
+        }
+        self._cache_set(key, context)
+        return context
+
+    def _embed_question(self, question):
+        key = f"{EMBEDDING_KEY_PREFIX}:{self.embedder.model}:{self.embedder.dimensions}:{_question_hash(question)}"
+        cached = self._cache_get(key)
+        if cached is not None:
+            return np.frombuffer(cached, dtype=np.float32)
+
+        vector = self.embedder.embed([question])[0]
+        self._cache_set(key, vector.tobytes())
+        return vector
+
+    def _select_sources(self, chunks):
+        """Best-scoring chunks that fit the context budget, numbered for citation"""
+        sources = []
+        used = 0
+        for chunk in chunks:
+            if chunk['score'] < self.min_score:
+                break
+            if used + len(chunk['text']) > self.context_max_chars:
+                if sources:
+                    break
+                chunk = {**chunk, 'text': chunk['text'][:self.context_max_chars]}
+            used += len(chunk['text'])
+            sources.append({
+                'ref': len(sources) + 1,
+                'meeting_pk': chunk['meeting_id'],
+                'meeting_id': chunk['meeting__meeting_id'],
+                'meeting_title': chunk['meeting__title'],
+                'speaker': chunk['speaker_name'],
+                'start_time': chunk['start_time'],
+                'end_time': chunk['end_time'],
+                'timestamp': format_timestamp(chunk['start_time']),
+                'text': chunk['text'],
+                'score': chunk['score'],
+            })
+        return sources
+
+    def _build_prompt(self, question, sources):
+        # One short summary line per cited meeting gives the excerpts their context
+        summaries = dict(
+            MeetingSummary.objects.filter(meeting_id__in={s['meeting_pk'] for s in sources})
+            .exclude(executive_summary='')
+            .values_list('meeting_id', 'executive_summary')
+        )
+
+        lines = ["Meetings:"]
+        listed = set()
+        for source in sources:
+            if source['meeting_pk'] not in listed:
+                listed.add(source['meeting_pk'])
+                overview = summaries.get(source['meeting_pk'], '')[:300]
+                lines.append(f"- {source['meeting_title'] or source['meeting_id']}"
+                             f"{f': {overview}' if overview else ''}")
+
+        lines.append("\nExcerpts:")
+        for source in sources:
+            lines.append(f"[{source['ref']}] {source['meeting_title'] or source['meeting_id']} "
+                         f"@ {source['timestamp']} - {source['speaker']}: {source['text']}")
+
+        lines.append(f"\nQuestion: {question}")
+        return '\n'.join(lines)
+
+    @staticmethod
+    def _citations(answer, sources):
+        """Sources the answer actually cites, in order of first citation"""
+        by_ref = {source['ref']: source for source in sources}
+        citations = []
+        for ref in CITATION_PATTERN.findall(answer):
+            source = by_ref.pop(int(ref), None)
+            if source:
+                citations.append({
+                    key: source[key]
+                    for key in ('ref', 'meeting_id', 'meeting_title', 'speaker', 'start_time', 'end_time', 'timestamp')
+                })
+        return citations
+
+    def _chat_completion(self, **params):
+        return cached_chat_completion(self.client, self.cache, **params)
+
+    def _cache_get(self, key):
+        try:
+            return cache.get(key)
+        except Exception as e:
+            logger.warning(f"Meeting QA cache lookup failed for {key}: {e}")
+            return None
+
+    def _cache_set(self, key, value):
+        try:
+            cache.set(key, value, timeout=self.cache_timeout)
+        except Exception as e:
+            logger.warning(f"Meeting QA cache write failed for {key}: {e}")
@@ -0,0 +1,80 @@
+# Generated by Django 4.2.30 on 2026-10-17 06:37
+
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("meetings", "0008_add_meeting_access_tokens"),
+        ("audio", "0005_add_agenda_item_to_segments"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AudioUpload",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "upload_id",
+                    models.UUIDField(default=uuid.uuid4, editable=False, unique=True),
+                ),
+                ("format", models.CharField(default="webm", max_length=10)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("receiving", "Receiving"),
+                            ("finalized", "Finalized"),
+                            ("aborted", "Aborted"),
+                        ],
+                        default="receiving",
+                        max_length=10,
+                    ),
+                ),
+                ("next_sequence", models.PositiveIntegerField(default=0)),
+                ("bytes_received", models.PositiveBigIntegerField(default=0)),
+                (
+                    "meeting",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="audio_uploads",
+                        to="meetings.meeting",
+                    ),
+                ),
+                (
+                    "participant",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="meetings.meetingparticipant",
+                    ),
+                ),
+                (
+                    "recording",
+                    models.OneToOneField(
+                        blank=True,
+                        help_text="Recording created when the upload was finalized",
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="upload",
+                        to="audio.audiorecording",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "huddle_audio_upload",
+            },
+        ),
+    ]
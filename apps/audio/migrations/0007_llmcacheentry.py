@@ -0,0 +1,51 @@
+# Generated by Django 4.2.30 on 2026-10-17 06:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("audio", "0006_audioupload"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="LLMCacheEntry",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "key",
+                    models.CharField(
+                        help_text="SHA-256 of model, prompts and parameters",
+                        max_length=64,
+                        unique=True,
+                    ),
+                ),
+                ("model", models.CharField(max_length=50)),
+                ("response", models.TextField()),
+                (
+                    "size",
+                    models.PositiveIntegerField(
+                        default=0, help_text="Response size in bytes"
+                    ),
+                ),
+                ("hits", models.PositiveIntegerField(default=0)),
+                ("last_used_at", models.DateTimeField(db_index=True)),
+                ("expires_at", models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                "db_table": "huddle_llm_cache_entry",
+            },
+        ),
+    ]
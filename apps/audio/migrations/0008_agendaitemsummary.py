@@ -0,0 +1,66 @@
+# Generated by Django 4.2.30 on 2026-10-17 06:46
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("meetings", "0008_add_meeting_access_tokens"),
+        ("audio", "0007_llmcacheentry"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AgendaItemSummary",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("summary", models.TextField(blank=True)),
+                (
+                    "clean_transcript",
+                    models.TextField(
+                        blank=True,
+                        help_text="Cleaned transcript of the segments summarized so far",
+                    ),
+                ),
+                ("key_points", models.JSONField(default=list)),
+                ("action_items", models.JSONField(default=list)),
+                ("decisions_made", models.JSONField(default=list)),
+                ("last_segment_id", models.PositiveBigIntegerField(default=0)),
+                ("segment_count", models.PositiveIntegerField(default=0)),
+                (
+                    "agenda_item",
+                    models.ForeignKey(
+                        blank=True,
+                        help_text="Empty for discussion outside any agenda item",
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="meetings.agendaitem",
+                    ),
+                ),
+                (
+                    "meeting",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="partial_summaries",
+                        to="meetings.meeting",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "huddle_agenda_item_summary",
+                "unique_together": {("meeting", "agenda_item")},
+            },
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 4.2.30 on 2026-10-17 06:49
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("meetings", "0008_add_meeting_access_tokens"),
+        ("audio", "0008_agendaitemsummary"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TranscriptDocument",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("version", models.PositiveIntegerField(default=1)),
+                ("built_version", models.PositiveIntegerField(default=0)),
+                (
+                    "data",
+                    models.BinaryField(
+                        blank=True, help_text="zlib-compressed JSON document"
+                    ),
+                ),
+                ("segment_count", models.PositiveIntegerField(default=0)),
+                (
+                    "size",
+                    models.PositiveIntegerField(
+                        default=0, help_text="Compressed size in bytes"
+                    ),
+                ),
+                (
+                    "meeting",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="transcript_document",
+                        to="meetings.meeting",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "huddle_transcript_document",
+            },
+        ),
+    ]
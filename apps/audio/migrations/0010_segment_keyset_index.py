@@ -0,0 +1,20 @@
+# Generated by Django 4.2.30 on 2026-10-17 06:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("audio", "0009_transcriptdocument"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="transcriptionsegment",
+            index=models.Index(
+                fields=["recording", "start_time", "id"],
+                name="huddle_tran_recordi_1e4b9c_idx",
+            ),
+        ),
+    ]
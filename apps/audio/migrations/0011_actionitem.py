@@ -0,0 +1,91 @@
+# Generated by Django 4.2.30 on 2026-10-17 06:53
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("meetings", "0008_add_meeting_access_tokens"),
+        ("audio", "0010_segment_keyset_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ActionItem",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "position",
+                    models.PositiveIntegerField(
+                        default=0, help_text="Order within the summary's action_items"
+                    ),
+                ),
+                ("task", models.TextField()),
+                (
+                    "owner",
+                    models.CharField(
+                        blank=True,
+                        help_text="Owner as written by the AI (name, email or TBD)",
+                        max_length=200,
+                    ),
+                ),
+                (
+                    "owner_email",
+                    models.CharField(
+                        blank=True,
+                        help_text="Lower-cased owner email, when it could be resolved",
+                        max_length=254,
+                    ),
+                ),
+                ("due_date", models.DateField(blank=True, null=True)),
+                (
+                    "due_date_text",
+                    models.CharField(
+                        blank=True,
+                        help_text="Due date as written by the AI",
+                        max_length=100,
+                    ),
+                ),
+                ("priority", models.CharField(blank=True, max_length=20)),
+                ("agenda_item", models.CharField(blank=True, max_length=200)),
+                ("is_completed", models.BooleanField(default=False)),
+                (
+                    "meeting",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="action_item_rows",
+                        to="meetings.meeting",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "huddle_action_item",
+                "ordering": ["meeting", "position"],
+                "indexes": [
+                    models.Index(
+                        fields=["owner_email", "is_completed", "due_date"],
+                        name="huddle_acti_owner_e_0d015a_idx",
+                    ),
+                    models.Index(
+                        fields=["meeting", "position"],
+                        name="huddle_acti_meeting_7c8344_idx",
+                    ),
+                    models.Index(
+                        fields=["due_date"], name="huddle_acti_due_dat_d3c0d6_idx"
+                    ),
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 4.2.30 on 2026-10-17 06:54
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("audio", "0011_actionitem"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="meetingsummary",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="transcriptionsegment",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, help_text="Full-text index of text", null=True
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="meetingsummary",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_vector"], name="huddle_meet_search__364147_gin"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="transcriptionsegment",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_vector"], name="huddle_tran_search__0c56e1_gin"
+            ),
+        ),
+    ]
@@ -0,0 +1,108 @@
+# Generated by Django 4.2.30 on 2026-10-17 06:57
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def add_pgvector_column(apps, schema_editor):
+    """Mirror embeddings into a pgvector column when the extension is available"""
+    connection = schema_editor.connection
+    if connection.vendor != 'postgresql':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_available_extensions WHERE name = 'vector'")
+        if not cursor.fetchone():
+            return
+        cursor.execute("CREATE EXTENSION IF NOT EXISTS vector")
+        cursor.execute(
+            f"ALTER TABLE huddle_transcript_chunk ADD COLUMN IF NOT EXISTS embedding_vector vector({settings.EMBEDDING_DIMENSIONS})"
+        )
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS huddle_transcript_chunk_embedding_hnsw "
+            "ON huddle_transcript_chunk USING hnsw (embedding_vector vector_ip_ops)"
+        )
+
+
+def drop_pgvector_column(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute("ALTER TABLE huddle_transcript_chunk DROP COLUMN IF EXISTS embedding_vector")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("meetings", "0008_add_meeting_access_tokens"),
+        ("audio", "0012_search_vectors"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TranscriptChunk",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("speaker_name", models.CharField(blank=True, max_length=100)),
+                ("start_time", models.FloatField()),
+                ("end_time", models.FloatField()),
+                ("text", models.TextField()),
+                ("first_segment_id", models.PositiveBigIntegerField()),
+                ("last_segment_id", models.PositiveBigIntegerField()),
+                (
+                    "embedding",
+                    models.BinaryField(help_text="float32 vector, L2-normalized"),
+                ),
+                ("embedding_model", models.CharField(max_length=50)),
+                (
+                    "agenda_item",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        to="meetings.agendaitem",
+                    ),
+                ),
+                (
+                    "meeting",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="retrieval_chunks",
+                        to="meetings.meeting",
+                    ),
+                ),
+                (
+                    "organization",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "huddle_transcript_chunk",
+                "indexes": [
+                    models.Index(
+                        fields=["organization", "id"],
+                        name="huddle_tran_organiz_3ec711_idx",
+                    ),
+                    models.Index(
+                        fields=["meeting", "last_segment_id"],
+                        name="huddle_tran_meeting_ddc3e5_idx",
+                    ),
+                ],
+            },
+        ),
+        migrations.RunPython(add_pgvector_column, drop_pgvector_column),
+    ]
@@ -0,0 +1,76 @@
+# Generated by Django 4.2.30 on 2026-10-17 07:02
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("meetings", "0008_add_meeting_access_tokens"),
+        ("audio", "0013_transcript_chunks"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PipelineStageRun",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "stage",
+                    models.CharField(
+                        choices=[
+                            ("transcribe", "Transcribe"),
+                            ("merge", "Merge"),
+                            ("analyze", "Analyze"),
+                            ("notify", "Notify"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("idempotency_key", models.CharField(max_length=200, unique=True)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("running", "Running"),
+                            ("completed", "Completed"),
+                            ("failed", "Failed"),
+                        ],
+                        default="running",
+                        max_length=20,
+                    ),
+                ),
+                ("attempts", models.PositiveIntegerField(default=0)),
+                ("error", models.TextField(blank=True)),
+                ("completed_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "meeting",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="pipeline_runs",
+                        to="meetings.meeting",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "huddle_pipeline_stage_run",
+                "indexes": [
+                    models.Index(
+                        fields=["meeting", "stage"],
+                        name="huddle_pipe_meeting_d7bbd5_idx",
+                    )
+                ],
+            },
+        ),
+    ]
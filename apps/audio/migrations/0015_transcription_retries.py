@@ -0,0 +1,28 @@
+# Generated by Django 4.2.30 on 2026-10-17 07:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("audio", "0014_pipeline_stage_runs"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="audiorecording",
+            name="dead_lettered_at",
+            field=models.DateTimeField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="audiorecording",
+            name="last_transcription_error",
+            field=models.TextField(blank=True),
+        ),
+        migrations.AddField(
+            model_name="audiorecording",
+            name="transcription_attempts",
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 4.2.30 on 2026-10-17 07:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("audio", "0015_transcription_retries"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="audioupload",
+            name="status",
+            field=models.CharField(
+                choices=[
+                    ("receiving", "Receiving"),
+                    ("finalizing", "Finalizing"),
+                    ("finalized", "Finalized"),
+                    ("aborted", "Aborted"),
+                ],
+                default="receiving",
+                max_length=10,
+            ),
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 4.2.30 on 2026-10-17 07:23
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def backfill_chunk_recordings(apps, schema_editor):
+    """Existing chunks take the recording of their first segment"""
+    TranscriptChunk = apps.get_model("audio", "TranscriptChunk")
+    TranscriptionSegment = apps.get_model("audio", "TranscriptionSegment")
+    TranscriptChunk.objects.filter(recording__isnull=True).update(
+        recording_id=models.Subquery(
+            TranscriptionSegment.objects.filter(pk=models.OuterRef("first_segment_id")).values("recording_id")[:1]
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("audio", "0016_upload_finalizing_status"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="transcriptchunk",
+            name="huddle_tran_meeting_ddc3e5_idx",
+        ),
+        migrations.AddField(
+            model_name="transcriptchunk",
+            name="recording",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="retrieval_chunks",
+                to="audio.audiorecording",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="transcriptchunk",
+            index=models.Index(
+                fields=["meeting", "recording", "last_segment_id"],
+                name="huddle_tran_meeting_6aff91_idx",
+            ),
+        ),
+        migrations.RunPython(backfill_chunk_recordings, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,73 @@
+from django.db import migrations
+from django.utils.dateparse import parse_date
+
+
+def _name_from_email(email):
+    # Same as Meeting.extract_name_from_email, which historical models don't carry
+    name_part = email.split('@')[0]
+    return ' '.join(word.capitalize() for word in name_part.replace('.', ' ').replace('_', ' ').split())
+
+
+def _parse_due_date(value):
+    try:
+        return parse_date(value.strip()) if value else None
+    except ValueError:
+        return None
+
+
+def backfill_action_items(apps, schema_editor):
+    """Mirror MeetingSummary.action_items into ActionItem rows for summaries analyzed before 0011"""
+    ActionItem = apps.get_model("audio", "ActionItem")
+    MeetingSummary = apps.get_model("audio", "MeetingSummary")
+
+    synced = set(ActionItem.objects.values_list("meeting_id", flat=True).distinct())
+    summaries = (
+        MeetingSummary.objects.exclude(meeting_id__in=synced)
+        .exclude(action_items=[])
+        .select_related("meeting")
+    )
+
+    for summary in summaries.iterator(chunk_size=200):
+        meeting = summary.meeting
+        emails = set(meeting.expected_speakers or [])
+        emails.update(
+            meeting.agenda_items.exclude(assigned_participant="").values_list("assigned_participant", flat=True)
+        )
+        lookup = {}
+        for email in emails:
+            email = email.strip().lower()
+            if email:
+                lookup[email] = email
+                lookup[_name_from_email(email).lower()] = email
+
+        rows = []
+        for position, item in enumerate(summary.action_items or []):
+            if not isinstance(item, dict) or not item.get("task"):
+                continue
+            owner = str(item.get("owner") or "")[:200]
+            owner_key = owner.strip()
+            due_date_text = str(item.get("due_date") or "")[:100]
+            rows.append(ActionItem(
+                meeting=meeting,
+                position=position,
+                task=str(item["task"]),
+                owner=owner,
+                owner_email=owner_key.lower() if "@" in owner_key else lookup.get(owner_key.lower(), ""),
+                due_date=_parse_due_date(due_date_text),
+                due_date_text=due_date_text,
+                priority=str(item.get("priority") or "")[:20],
+                agenda_item=str(item.get("agenda_item") or "")[:200],
+            ))
+        ActionItem.objects.bulk_create(rows, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("audio", "0017_transcript_chunk_recording"),
+        ("meetings", "0009_invitation_batch"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_action_items, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,41 @@
+from django.db import migrations, models
+from django.db.models import Max
+
+
+def backfill_recording_watermarks(apps, schema_editor):
+    """Split each partial's meeting-wide watermark into the newest summarized segment per recording"""
+    AgendaItemSummary = apps.get_model("audio", "AgendaItemSummary")
+    TranscriptionSegment = apps.get_model("audio", "TranscriptionSegment")
+
+    for partial in AgendaItemSummary.objects.filter(last_segment_id__gt=0).iterator(chunk_size=200):
+        rows = (
+            TranscriptionSegment.objects.filter(
+                recording__meeting_id=partial.meeting_id,
+                agenda_item_id=partial.agenda_item_id,
+                id__lte=partial.last_segment_id,
+            )
+            .values("recording_id")
+            .annotate(last=Max("id"))
+        )
+        partial.recording_watermarks = {str(row["recording_id"]): row["last"] for row in rows}
+        partial.save(update_fields=["recording_watermarks"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("audio", "0018_backfill_action_items"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="agendaitemsummary",
+            name="recording_watermarks",
+            field=models.JSONField(default=dict),
+        ),
+        migrations.RunPython(backfill_recording_watermarks, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name="agendaitemsummary",
+            name="last_segment_id",
+        ),
+    ]
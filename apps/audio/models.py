@@ -1,4 +1,8 @@
+import uuid
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
+from django.contrib.auth.models import User
 from apps.core.models import TimeStampedModel
 from apps.meetings.models import Meeting, MeetingParticipant
 
@@ -11,6 +15,13 @@ def huddle_recording_upload_path(instance, filename):
     # Create a structured path: recordings/user_X/meeting_Y/filename
     return f"recordings/user_{user_id}/meeting_{meeting_id}/{filename}"
 
+def huddle_upload_chunk_path(upload, sequence):
+    """Storage path for one chunk of an in-progress chunked upload"""
+    user_id = upload.meeting.host.id if upload.meeting.host else 'anonymous'
+    meeting_id = upload.meeting.meeting_id
+
+    return f"recordings/user_{user_id}/meeting_{meeting_id}/chunks/{upload.upload_id}/{sequence:06d}.part"
+
 class AudioRecording(TimeStampedModel):
     meeting = models.ForeignKey(Meeting, on_delete=models.CASCADE, related_name='recordings')
     participant = models.ForeignKey(MeetingParticipant, on_delete=models.CASCADE)
@@ -30,6 +41,11 @@ class AudioRecording(TimeStampedModel):
     )
     deepgram_request_id = models.CharField(max_length=100, null=True, blank=True)
     transcription_raw = models.JSONField(default=dict, blank=True, help_text="Raw API response")
+
+    # Retry tracking; recordings that exhaust their retries are dead-lettered for manual requeue
+    transcription_attempts = models.PositiveIntegerField(default=0)
+    last_transcription_error = models.TextField(blank=True)
+    dead_lettered_at = models.DateTimeField(null=True, blank=True, db_index=True)
     
     class Meta:
         db_table = 'huddle_audio_recording'
@@ -37,6 +53,43 @@ class AudioRecording(TimeStampedModel):
     def __str__(self):
         return f"Recording for {self.meeting.meeting_id} by {self.participant.session_id}"
 
+class AudioUpload(TimeStampedModel):
+    """Chunked/resumable upload of a recording, stitched into an AudioRecording on finalize"""
+
+    class Status(models.TextChoices):
+        RECEIVING = 'receiving', 'Receiving'
+        FINALIZING = 'finalizing', 'Finalizing'
+        FINALIZED = 'finalized', 'Finalized'
+        ABORTED = 'aborted', 'Aborted'
+
+    upload_id = models.UUIDField(default=uuid.uuid4, unique=True, editable=False)
+    meeting = models.ForeignKey(Meeting, on_delete=models.CASCADE, related_name='audio_uploads')
+    participant = models.ForeignKey(MeetingParticipant, on_delete=models.CASCADE)
+    format = models.CharField(max_length=10, default='webm')
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.RECEIVING)
+
+    # Chunks must arrive in order; next_sequence is what the client should send next
+    next_sequence = models.PositiveIntegerField(default=0)
+    bytes_received = models.PositiveBigIntegerField(default=0)
+
+    recording = models.OneToOneField(
+        AudioRecording,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='upload',
+        help_text="Recording created when the upload was finalized"
+    )
+
+    class Meta:
+        db_table = 'huddle_audio_upload'
+
+    def __str__(self):
+        return f"Upload {self.upload_id} for {self.meeting.meeting_id} ({self.status})"
+
+    def chunk_path(self, sequence):
+        return huddle_upload_chunk_path(self, sequence)
+
 class TranscriptionSegment(TimeStampedModel):
     recording = models.ForeignKey(AudioRecording, on_delete=models.CASCADE, related_name='segments')
     start_time = models.FloatField()
@@ -46,6 +99,7 @@ class TranscriptionSegment(TimeStampedModel):
     speaker_id = models.CharField(max_length=50, null=True, blank=True)
     speaker_name = models.CharField(max_length=100, null=True, blank=True, help_text="Identified speaker name")
     words = models.JSONField(default=list, blank=True, help_text="Word-level timing data")
+    search_vector = SearchVectorField(null=True, editable=False, help_text="Full-text index of text")
 
     # Agenda context for this segment
     agenda_item = models.ForeignKey(
@@ -59,6 +113,11 @@ class TranscriptionSegment(TimeStampedModel):
     class Meta:
         db_table = 'huddle_transcription_segment'
         ordering = ['start_time']
+        indexes = [
+            # Time-ordered reads of one recording; transcript pages scan one range per recording
+            models.Index(fields=['recording', 'start_time', 'id']),
+            GinIndex(fields=['search_vector']),
+        ]
 
 class MeetingSummary(TimeStampedModel):
     """AI-generated meeting summary and insights"""
@@ -83,10 +142,187 @@ class MeetingSummary(TimeStampedModel):
     ai_processing_started_at = models.DateTimeField(null=True, blank=True)
     ai_processing_completed_at = models.DateTimeField(null=True, blank=True)
 
+    # Full-text index of the summary, key points, decisions and action items
+    search_vector = SearchVectorField(null=True, editable=False)
+
     @property
     def full_transcript(self):
         """Backward compatibility - returns clean transcript if available, else raw"""
         return self.clean_transcript or self.raw_transcript
+
+    @property
+    def version(self):
+        """Changes on every save - used to key caches of content rendered from this summary"""
+        return int(self.updated_at.timestamp() * 1_000_000) if self.updated_at else 0
     
     class Meta:
-        db_table = 'huddle_meeting_summary'
\ No newline at end of file
+        db_table = 'huddle_meeting_summary'
+        indexes = [
+            GinIndex(fields=['search_vector']),
+        ]
+
+class ActionItem(TimeStampedModel):
+    """One row per action item in MeetingSummary.action_items, indexed for per-owner queries"""
+    meeting = models.ForeignKey(Meeting, on_delete=models.CASCADE, related_name='action_item_rows')
+    position = models.PositiveIntegerField(default=0, help_text="Order within the summary's action_items")
+
+    task = models.TextField()
+    owner = models.CharField(max_length=200, blank=True, help_text="Owner as written by the AI (name, email or TBD)")
+    owner_email = models.CharField(max_length=254, blank=True, help_text="Lower-cased owner email, when it could be resolved")
+    due_date = models.DateField(null=True, blank=True)
+    due_date_text = models.CharField(max_length=100, blank=True, help_text="Due date as written by the AI")
+    priority = models.CharField(max_length=20, blank=True)
+    agenda_item = models.CharField(max_length=200, blank=True)
+    is_completed = models.BooleanField(default=False)
+
+    class Meta:
+        db_table = 'huddle_action_item'
+        ordering = ['meeting', 'position']
+        indexes = [
+            models.Index(fields=['owner_email', 'is_completed', 'due_date']),
+            models.Index(fields=['meeting', 'position']),
+            models.Index(fields=['due_date']),
+        ]
+
+    def __str__(self):
+        return f"{self.meeting.meeting_id}: {self.task[:50]}"
+
+    def as_dict(self):
+        """Same shape as an entry of MeetingSummary.action_items"""
+        return {
+            'task': self.task,
+            'owner': self.owner,
+            'due_date': self.due_date_text,
+            'priority': self.priority,
+            'agenda_item': self.agenda_item,
+        }
+
+class TranscriptDocument(TimeStampedModel):
+    """Materialized speaker-grouped transcript, plain text and speaker stats for a meeting"""
+    meeting = models.OneToOneField(Meeting, on_delete=models.CASCADE, related_name='transcript_document')
+
+    # Bumped whenever segments change; the document is current while built_version == version
+    version = models.PositiveIntegerField(default=1)
+    built_version = models.PositiveIntegerField(default=0)
+
+    data = models.BinaryField(blank=True, help_text="zlib-compressed JSON document")
+    segment_count = models.PositiveIntegerField(default=0)
+    size = models.PositiveIntegerField(default=0, help_text="Compressed size in bytes")
+
+    class Meta:
+        db_table = 'huddle_transcript_document'
+
+    def __str__(self):
+        return f"Transcript document for {self.meeting.meeting_id} (v{self.version})"
+
+    @property
+    def is_current(self):
+        return self.built_version == self.version
+
+class AgendaItemSummary(TimeStampedModel):
+    """Rolling summary of one agenda item (or of un-itemized discussion), updated while the meeting runs"""
+    meeting = models.ForeignKey(Meeting, on_delete=models.CASCADE, related_name='partial_summaries')
+    agenda_item = models.ForeignKey(
+        'meetings.AgendaItem',
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        help_text="Empty for discussion outside any agenda item"
+    )
+
+    summary = models.TextField(blank=True)
+    clean_transcript = models.TextField(blank=True, help_text="Cleaned transcript of the segments summarized so far")
+    key_points = models.JSONField(default=list)
+    action_items = models.JSONField(default=list)
+    decisions_made = models.JSONField(default=list)
+
+    # Segments are folded in by insertion order within each recording: {recording_id: newest summarized id}
+    recording_watermarks = models.JSONField(default=dict)
+    segment_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        db_table = 'huddle_agenda_item_summary'
+        unique_together = ['meeting', 'agenda_item']
+
+    def __str__(self):
+        return f"Partial summary for {self.meeting.meeting_id}: {self.agenda_item.title if self.agenda_item else 'General'}"
+
+class LLMCacheEntry(TimeStampedModel):
+    """Database fallback for cached LLM responses, keyed by a hash of the full request"""
+    key = models.CharField(max_length=64, unique=True, help_text="SHA-256 of model, prompts and parameters")
+    model = models.CharField(max_length=50)
+    response = models.TextField()
+    size = models.PositiveIntegerField(default=0, help_text="Response size in bytes")
+    hits = models.PositiveIntegerField(default=0)
+    last_used_at = models.DateTimeField(db_index=True)
+    expires_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'huddle_llm_cache_entry'
+
+    def __str__(self):
+        return f"{self.model} {self.key[:12]}"
+
+class TranscriptChunk(TimeStampedModel):
+    """One speaker turn within an agenda item, embedded for semantic retrieval"""
+    meeting = models.ForeignKey(Meeting, on_delete=models.CASCADE, related_name='retrieval_chunks')
+    recording = models.ForeignKey(AudioRecording, on_delete=models.CASCADE, null=True, blank=True, related_name='retrieval_chunks')
+    # Denormalized meeting host so top-k queries scan a single organization's vectors
+    organization = models.ForeignKey(User, on_delete=models.CASCADE, null=True, blank=True)
+    agenda_item = models.ForeignKey('meetings.AgendaItem', on_delete=models.SET_NULL, null=True, blank=True)
+
+    speaker_name = models.CharField(max_length=100, blank=True)
+    start_time = models.FloatField()
+    end_time = models.FloatField()
+    text = models.TextField()
+
+    # Segments are chunked by insertion order; each recording is embedded up to its newest last_segment_id
+    first_segment_id = models.PositiveBigIntegerField()
+    last_segment_id = models.PositiveBigIntegerField()
+
+    embedding = models.BinaryField(help_text="float32 vector, L2-normalized")
+    embedding_model = models.CharField(max_length=50)
+
+    class Meta:
+        db_table = 'huddle_transcript_chunk'
+        indexes = [
+            models.Index(fields=['organization', 'id']),
+            models.Index(fields=['meeting', 'recording', 'last_segment_id']),
+        ]
+
+    def __str__(self):
+        return f"{self.meeting.meeting_id} {self.start_time:.0f}s {self.speaker_name}"
+
+class PipelineStageRun(TimeStampedModel):
+    """
+    Idempotency record for one stage of the meeting processing pipeline.
+    The key identifies the stage's input, so a stage re-enqueued for the same input is skipped.
+    """
+
+    class Stage(models.TextChoices):
+        TRANSCRIBE = 'transcribe', 'Transcribe'
+        MERGE = 'merge', 'Merge'
+        ANALYZE = 'analyze', 'Analyze'
+        NOTIFY = 'notify', 'Notify'
+
+    class Status(models.TextChoices):
+        RUNNING = 'running', 'Running'
+        COMPLETED = 'completed', 'Completed'
+        FAILED = 'failed', 'Failed'
+
+    meeting = models.ForeignKey(Meeting, on_delete=models.CASCADE, related_name='pipeline_runs')
+    stage = models.CharField(max_length=20, choices=Stage.choices)
+    idempotency_key = models.CharField(max_length=200, unique=True)
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.RUNNING)
+    attempts = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'huddle_pipeline_stage_run'
+        indexes = [
+            models.Index(fields=['meeting', 'stage']),
+        ]
+
+    def __str__(self):
+        return f"{self.idempotency_key} ({self.status})"
@@ -0,0 +1,167 @@
+"""
+Meeting processing pipeline.
+    chord(transcribe each pending recording) -> merge -> analyze -> notify
+
+Every stage runs through run_stage(): a cache lock serializes concurrent attempts and a
+PipelineStageRun row keyed by the stage's input records completion, so when two recordings
+finish at once (or a task is redelivered) each stage still runs exactly once.
+"""
+import hashlib
+import logging
+from celery import chain, chord, group
+from django.conf import settings
+from django.utils import timezone
+from apps.core.locks import CacheLock
+from apps.core.task_queues import meeting_priority
+from .models import AudioRecording, MeetingSummary, PipelineStageRun
+from .transcripts import get_transcript_document
+
+logger = logging.getLogger(__name__)
+
+Stage = PipelineStageRun.Stage
+
+# run_stage() outcomes
+COMPLETED = 'completed'
+ALREADY_DONE = 'already_done'
+LOCKED = 'locked'
+FAILED = 'failed'
+
+
+def _lock_key(idempotency_key):
+    return f'pipeline:lock:{idempotency_key}'
+
+
+def recordings_key(meeting):
+    """Identifies the set of processed recordings a merge/analysis was built from"""
+    recording_ids = meeting.recordings.filter(is_processed=True).order_by('id').values_list('id', flat=True)
+    digest = hashlib.sha256(','.join(str(pk) for pk in recording_ids).encode()).hexdigest()[:16]
+    return digest
+
+
+def stage_key(stage, meeting, suffix=''):
+    return f"{stage}:{meeting.meeting_id}{f':{suffix}' if suffix else ''}"
+
+
+def run_stage(meeting, stage, idempotency_key, func):
+    """
+    Run func() at most once per idempotency key.
+    func returns truthy on success; a falsy return or an exception marks the run failed so it can be retried.
+    """
+    lock = CacheLock(_lock_key(idempotency_key), getattr(settings, 'PIPELINE_LOCK_TIMEOUT', 30 * 60))
+    if not lock.acquire():
+        logger.info(f"Pipeline stage {idempotency_key} is running elsewhere, skipping")
+        return LOCKED
+
+    try:
+        run, _ = PipelineStageRun.objects.get_or_create(
+            idempotency_key=idempotency_key,
+            defaults={'meeting': meeting, 'stage': stage}
+        )
+        if run.status == PipelineStageRun.Status.COMPLETED:
+            logger.info(f"Pipeline stage {idempotency_key} already completed, skipping")
+            return ALREADY_DONE
+
+        run.status = PipelineStageRun.Status.RUNNING
+        run.attempts += 1
+        run.save(update_fields=['status', 'attempts', 'updated_at'])
+
+        try:
+            succeeded = func()
+        except Exception as e:
+            run.status = PipelineStageRun.Status.FAILED
+            run.error = str(e)
+            run.save(update_fields=['status', 'error', 'updated_at'])
+            raise
+
+        if succeeded:
+            run.status = PipelineStageRun.Status.COMPLETED
+            run.error = ''
+            run.completed_at = timezone.now()
+        else:
+            run.status = PipelineStageRun.Status.FAILED
+        run.save(update_fields=['status', 'error', 'completed_at', 'updated_at'])
+        return COMPLETED if succeeded else FAILED
+    finally:
+        lock.release()
+
+
+def all_recordings_processed(meeting):
+    """True once no recording is still waiting for transcription (dead-lettered ones don't block minutes)"""
+    recordings = meeting.recordings.all()
+    return (
+        recordings.filter(is_processed=True).exists()
+        and not recordings.filter(is_processed=False, dead_lettered_at__isnull=True).exists()
+    )
+
+
+def dead_letter_recording(recording, error):
+    """Park a recording that failed permanently; requeue_dead_letters() retries it later"""
+    AudioRecording.objects.filter(pk=recording.pk).update(
+        dead_lettered_at=timezone.now(),
+        last_transcription_error=error,
+    )
+    logger.error(f"Recording {recording.pk} moved to the dead-letter queue: {error}")
+
+
+def requeue_dead_letters(recordings):
+    """Clear the dead-letter mark and restart the pipeline for each affected meeting"""
+    recordings = recordings.filter(dead_lettered_at__isnull=False, is_processed=False).select_related('meeting')
+    meetings = {recording.meeting_id: recording.meeting for recording in recordings}
+    count = recordings.update(dead_lettered_at=None, transcription_attempts=0)
+
+    for meeting in meetings.values():
+        start_meeting_pipeline(meeting)
+    return count
+
+
+def merge_transcript(meeting):
+    """Materialize the full transcript and store it on the MeetingSummary"""
+    full_transcript = get_transcript_document(meeting)['text']
+
+    summary, created = MeetingSummary.objects.get_or_create(
+        meeting=meeting,
+        defaults={'raw_transcript': full_transcript}
+    )
+    if not created and summary.raw_transcript != full_transcript:
+        summary.raw_transcript = full_transcript
+        summary.save(update_fields=['raw_transcript', 'updated_at'])
+
+    logger.info(f"Merged transcript for meeting {meeting.meeting_id} ({len(full_transcript)} chars)")
+    return True
+
+
+def build_pipeline(meeting):
+    """Canvas for the meeting: transcribe pending recordings in parallel, then the meeting-level stages"""
+    from apps.meetings.tasks import send_meeting_complete_notifications
+    from .tasks import merge_meeting_transcript, process_audio_recording, process_meeting_ai_analysis
+
+    # Meetings still in progress get the live lane of each queue
+    priority = meeting_priority(meeting)
+
+    meeting_stages = chain(
+        merge_meeting_transcript.si(meeting.meeting_id).set(priority=priority),
+        process_meeting_ai_analysis.si(meeting.meeting_id).set(priority=priority),
+        send_meeting_complete_notifications.si(meeting.meeting_id).set(priority=priority),
+    )
+
+    pending = list(meeting.recordings.filter(
+        is_processed=False, dead_lettered_at__isnull=True
+    ).values_list('id', flat=True))
+    if not pending:
+        return meeting_stages
+    return chord(
+        group(process_audio_recording.si(recording_id).set(priority=priority) for recording_id in pending),
+        meeting_stages
+    )
+
+
+def start_meeting_pipeline(meeting):
+    """
+    Enqueue the pipeline for a meeting. Safe to call on every upload or recording
+    completion: stages already done (or in progress) for the same input are skipped.
+    """
+    try:
+        build_pipeline(meeting).apply_async()
+        logger.info(f"Started processing pipeline for meeting {meeting.meeting_id}")
+    except Exception as e:
+        logger.error(f"Could not start processing pipeline for {meeting.meeting_id}: {e}")
@@ -3,13 +3,25 @@ Audio processing using Deepgram for transcription with speaker diarization
 """
 import os
 import logging
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models import F
 from django.utils import timezone
-from .models import AudioRecording, TranscriptionSegment, MeetingSummary
-from deepgram import DeepgramClient, PrerecordedOptions, FileSource
+from .models import AudioRecording
+from .segment_writer import SegmentWriter
+from .retrieval import schedule_retrieval_index
+from .rolling_summary import reset_partials_for_recording, schedule_partial_summaries
+from .transcripts import invalidate_transcript_document
+from .sources import open_transcription_source, INPUT_MODE_URL
+from deepgram import DeepgramClient, PrerecordedOptions
 
 logger = logging.getLogger(__name__)
 
 
+class TranscriptionError(Exception):
+    """Transient transcription failure; the Celery task retries these with backoff"""
+
+
 class AudioProcessor:
     """Process audio using Deepgram API with speaker diarization"""
     
@@ -22,37 +34,44 @@ class AudioProcessor:
         self.deepgram_client = DeepgramClient(self.deepgram_api_key)
     
     def transcribe_audio(self, audio_recording):
-        """Transcribe audio using Deepgram with speaker diarization"""
+        """
+        Transcribe audio using Deepgram with speaker diarization.
+        Raises TranscriptionError for failures worth retrying; the caller schedules the retry.
+        """
         # Mark processing started
         audio_recording.processing_started_at = timezone.now()
+        audio_recording.transcription_attempts = F('transcription_attempts') + 1
         audio_recording.save()
+        audio_recording.refresh_from_db(fields=['transcription_attempts'])
         
         try:
             success = self._transcribe_with_deepgram(audio_recording)
-            
-            if success:
-                audio_recording.is_processed = True
-                audio_recording.processing_completed_at = timezone.now()
-                audio_recording.save()
-                
-                # Generate meeting summary if all recordings are processed
-                self._check_and_generate_summary(audio_recording.meeting)
-            
-            return success
-            
         except Exception as e:
             logger.error(f"Error transcribing audio: {str(e)}")
+            audio_recording.last_transcription_error = str(e)
+            audio_recording.save(update_fields=['last_transcription_error', 'updated_at'])
+            if isinstance(e, TranscriptionError):
+                raise
             return False
+
+        if success:
+            audio_recording.is_processed = True
+            audio_recording.processing_completed_at = timezone.now()
+            audio_recording.last_transcription_error = ''
+            audio_recording.save()
+            invalidate_transcript_document(audio_recording.meeting)
+            schedule_retrieval_index(audio_recording.meeting)
+
+        return success
     
-    def _transcribe_with_deepgram(self, audio_recording, retry_count=0):
-        """Transcribe audio using Deepgram API with retry logic"""
-        max_retries = 3
-        
+    def _transcribe_with_deepgram(self, audio_recording):
+        """Transcribe audio using Deepgram API; transient failures raise TranscriptionError"""
         try:
-            logger.info(f"Starting Deepgram transcription for recording {audio_recording.id} (attempt {retry_count + 1})")
+            logger.info(f"Starting Deepgram transcription for recording {audio_recording.id} "
+                        f"(attempt {audio_recording.transcription_attempts})")
             
-            # Read the audio file using Django storage API (works with both local and cloud storage)
-            logger.info(f"🎵 Reading file using Django storage: {audio_recording.audio_file.name}")
+            # Locate the audio file using Django storage API (works with both local and cloud storage)
+            logger.info(f"🎵 Locating file using Django storage: {audio_recording.audio_file.name}")
 
             from django.core.files.storage import default_storage
 
@@ -78,19 +97,6 @@ class AudioProcessor:
                     logger.error(f"🎵 Cannot list directory: {e}")
                     raise FileNotFoundError(f"Audio file not found in storage: {audio_recording.audio_file.name}")
 
-            # Read the file from storage (works with local files, S3, Spaces, etc.)
-            try:
-                with default_storage.open(audio_recording.audio_file.name, 'rb') as audio_file:
-                    buffer_data = audio_file.read()
-                logger.info(f"🎵 Successfully read {len(buffer_data) / 1024:.1f} KB from storage")
-            except Exception as e:
-                logger.error(f"🎵 Failed to read from storage: {e}")
-                raise
-            
-            payload: FileSource = {
-                "buffer": buffer_data,
-            }
-            
             # Configure Deepgram options for best results
             options = PrerecordedOptions(
                 model="nova-2",  # Best model for accuracy
@@ -103,11 +109,21 @@ class AudioProcessor:
                 numerals=True,  # Format numbers
             )
             
-            # Make the API request
-            logger.info("Calling Deepgram API...")
-            response = self.deepgram_client.listen.prerecorded.v("1").transcribe_file(
-                payload, options
-            )
+            # Make the API request - hand Deepgram a URL or a stream rather than an in-memory copy
+            try:
+                with open_transcription_source(audio_recording.audio_file.name) as (input_mode, payload):
+                    logger.info(f"Calling Deepgram API (input mode: {input_mode})...")
+                    if input_mode == INPUT_MODE_URL:
+                        response = self.deepgram_client.listen.prerecorded.v("1").transcribe_url(
+                            payload, options
+                        )
+                    else:
+                        response = self.deepgram_client.listen.prerecorded.v("1").transcribe_file(
+                            payload, options
+                        )
+            except Exception as e:
+                logger.error(f"🎵 Failed to send recording to Deepgram: {e}")
+                raise
             
             # Store raw response for debugging
             audio_recording.transcription_raw = response.to_dict()
@@ -117,13 +133,7 @@ class AudioProcessor:
             results = response.results
             if not results or not results.channels:
                 logger.error("No results from Deepgram")
-                
-                # Retry if we haven't exceeded max retries
-                if retry_count < max_retries - 1:
-                    logger.info(f"Retrying transcription... (attempt {retry_count + 2})")
-                    return self._transcribe_with_deepgram(audio_recording, retry_count + 1)
-                
-                return False
+                raise TranscriptionError("Deepgram returned no results")
             
             channel = results.channels[0]
             
@@ -132,7 +142,7 @@ class AudioProcessor:
                 audio_recording.deepgram_request_id = response.metadata.request_id
             
             # Process utterances with speaker diarization
-            segments_created = 0
+            writer = SegmentWriter(audio_recording, self._identify_speaker)
             if hasattr(channel, 'alternatives') and channel.alternatives:
                 alternative = channel.alternatives[0]
                 
@@ -140,45 +150,46 @@ class AudioProcessor:
                 if hasattr(alternative, 'paragraphs') and alternative.paragraphs:
                     for paragraph in alternative.paragraphs.paragraphs:
                         for sentence in paragraph.sentences:
-                            # Create segment with speaker info
+                            # Buffer segment with speaker info
                             speaker_id = f"speaker_{sentence.speaker}" if hasattr(sentence, 'speaker') else None
                             
-                            TranscriptionSegment.objects.create(
-                                recording=audio_recording,
+                            writer.add(
                                 start_time=sentence.start,
                                 end_time=sentence.end,
                                 text=sentence.text,
-                                confidence=None,
                                 speaker_id=speaker_id,
-                                speaker_name=self._identify_speaker(audio_recording.meeting, speaker_id),
-                                agenda_item=audio_recording.meeting.current_agenda_item
                             )
                             
-                            segments_created += 1
-                            
-                            if segments_created <= 3:  # Log first few segments
+                            if len(writer) <= 3:  # Log first few segments
                                 logger.info(f"Created segment: Speaker {speaker_id}: {sentence.text[:50]}...")
             
+        except (TranscriptionError, FileNotFoundError):
+            raise
+        except Exception as e:
+            # Network errors, rate limits and 5xx responses from Deepgram are usually transient
+            logger.error(f"Deepgram transcription error: {str(e)}")
+            raise TranscriptionError(str(e)) from e
+
+        # Outside the retry wrapper: a failure from here on is not a Deepgram error. The write
+        # replaces whatever an earlier attempt stored, so a retried recording is never duplicated.
+        # The replacement segments get new ids, so partials that folded the old ones start over.
+        reset_agenda_item_ids = []
+        with transaction.atomic():
+            replaced = audio_recording.segments.all().delete()[0]
+            if replaced:
+                audio_recording.retrieval_chunks.all().delete()
+                reset_agenda_item_ids = reset_partials_for_recording(audio_recording)
+                logger.info(f"Replacing {replaced} segments from an earlier attempt for recording {audio_recording.id}")
+            segments_created = writer.flush()
             audio_recording.save()
-            logger.info(f"Deepgram transcription completed for recording {audio_recording.id} - {segments_created} segments created")
 
-            # Trigger AI processing after successful transcription
-            self._trigger_ai_processing_if_ready(audio_recording.meeting)
+        schedule_partial_summaries(audio_recording.meeting, writer.flushed_agenda_item_ids | set(reset_agenda_item_ids))
+        logger.info(f"Deepgram transcription completed for recording {audio_recording.id} - {segments_created} segments created")
 
-            return True
-            
-        except Exception as e:
-            logger.error(f"Deepgram transcription error: {str(e)}")
-            
-            # Retry on failure if we haven't exceeded max retries
-            if retry_count < max_retries - 1:
-                logger.info(f"Retrying after error... (attempt {retry_count + 2})")
-                return self._transcribe_with_deepgram(audio_recording, retry_count + 1)
-            
-            logger.error(f"Failed after {max_retries} attempts")
-            return False
+        return True
     
-    def _identify_speaker(self, meeting, speaker_id):
+    @staticmethod
+    def _identify_speaker(meeting, speaker_id):
         """Identify speaker based on voice profiles or speaker number"""
         if not speaker_id:
             return "Unknown Speaker"
@@ -189,78 +200,21 @@ class AudioProcessor:
         # TODO: In the future, we can match this with voice profiles
         # For now, return a friendly speaker label
         return f"Speaker {int(speaker_num) + 1}"  # Use 1-based numbering for users
-    
-    def _check_and_generate_summary(self, meeting):
-        """Check if all recordings are processed and generate summary"""
-        try:
-            # Check if all recordings for this meeting are processed
-            all_recordings = meeting.recordings.all()
-            if not all_recordings.exists():
-                return
-            
-            if not all(r.is_processed for r in all_recordings):
-                logger.info(f"Not all recordings processed for meeting {meeting.meeting_id}")
-                return
-            
-            # Generate full transcript
-            logger.info(f"Generating meeting summary for {meeting.meeting_id}")
-            
-            # Collect all segments ordered by time
-            all_segments = []
-            for recording in all_recordings:
-                segments = recording.segments.all().order_by('start_time')
-                all_segments.extend(segments)
-            
-            # Sort all segments by start time
-            all_segments.sort(key=lambda x: x.start_time)
-            
-            # Build full transcript with speaker labels
-            transcript_lines = []
-            current_speaker = None
-            
-            for segment in all_segments:
-                speaker = segment.speaker_name or "Unknown"
-                if speaker != current_speaker:
-                    transcript_lines.append(f"\n{speaker}:")
-                    current_speaker = speaker
-                transcript_lines.append(segment.text)
-            
-            full_transcript = " ".join(transcript_lines)
-            
-            # Create or update meeting summary
-            summary, created = MeetingSummary.objects.get_or_create(
-                meeting=meeting,
-                defaults={'full_transcript': full_transcript}
-            )
-            
-            if not created:
-                summary.full_transcript = full_transcript
-                summary.save()
-            
-            # TODO: Generate AI summary using GPT-4 if needed for summaries/action items
-            # This would require OpenAI API key but only for AI summaries, not transcription
-            
-            logger.info(f"Meeting summary {'created' if created else 'updated'} for {meeting.meeting_id}")
-            
-        except Exception as e:
-            logger.error(f"Error generating meeting summary: {str(e)}")
-    def _trigger_ai_processing_if_ready(self, meeting):
-        """Trigger AI processing if all recordings for meeting are processed"""
-        try:
-            total_recordings = meeting.recordings.count()
-            processed_recordings = meeting.recordings.filter(is_processed=True).count()
 
-            logger.info(f"Meeting {meeting.meeting_id}: {processed_recordings}/{total_recordings} recordings processed")
 
-            # If all recordings are processed, trigger AI analysis
-            if processed_recordings > 0 and processed_recordings == total_recordings:
-                logger.info(f"All recordings processed for meeting {meeting.meeting_id}, triggering AI analysis")
+def discard_replaced_live_recording(recording):
+    """
+    Remove a live recording whose full audio was uploaded again after its socket dropped,
+    so the meeting is not transcribed twice. Its segments and retrieval chunks go with it
+    and the partial summaries that folded them start over.
+    """
+    recording_id, audio_file = recording.id, recording.audio_file.name
+    with transaction.atomic():
+        reset_agenda_item_ids = reset_partials_for_recording(recording)
+        recording.delete()
+        if audio_file:
+            transaction.on_commit(lambda: default_storage.delete(audio_file))
 
-                # Import here to avoid circular imports
-                from .tasks import process_meeting_ai_analysis
-
-                # Queue AI processing
-                process_meeting_ai_analysis.delay(meeting.meeting_id)
-
-        except Exception as e:
-            logger.error(f"Error checking AI processing readiness: {e}")
+    invalidate_transcript_document(recording.meeting)
+    schedule_partial_summaries(recording.meeting, reset_agenda_item_ids)
+    logger.info(f"Discarded live recording {recording_id}, replaced by a full upload")
@@ -0,0 +1,318 @@
+"""
+Semantic retrieval over meeting transcripts.
+After transcription, processed segments are grouped into chunks (one speaker turn within
+an agenda item), embedded in batches and stored as compact float32 vectors on TranscriptChunk.
+Top-k queries are scoped to one organization (the meeting host) and served by pgvector when
+the database has it, otherwise by a brute-force NumPy scan of the organization's vectors.
+"""
+import logging
+import os
+import threading
+import numpy as np
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Count, Max
+from openai import OpenAI
+from apps.core.locks import CacheLock
+from .models import TranscriptChunk
+from .transcripts import UNKNOWN_SPEAKER, pending_segments_q, processed_segments
+
+logger = logging.getLogger(__name__)
+
+CHUNK_FIELDS = ('id', 'recording_id', 'start_time', 'end_time', 'speaker_name', 'agenda_item_id', 'text')
+INDEX_LOCK_TIMEOUT = 600  # seconds; longer than embedding one meeting's new segments
+
+
+def schedule_retrieval_index(meeting):
+    """Queue embedding of the meeting's new segments (after transcription completes)"""
+    if not getattr(settings, 'RETRIEVAL_INDEX_ENABLED', False):
+        return
+    from .tasks import build_retrieval_index
+    build_retrieval_index.delay(meeting.meeting_id)
+
+
+def chunk_segments(rows, max_chars=None):
+    """
+    Group consecutive segment rows into chunks, splitting on recording, speaker or agenda
+    item changes and when a chunk would exceed max_chars.
+    """
+    max_chars = max_chars or getattr(settings, 'RETRIEVAL_CHUNK_MAX_CHARS', 1500)
+    chunks = []
+    current = None
+
+    for row in rows:
+        text = (row['text'] or '').strip()
+        if not text:
+            continue
+        speaker = row['speaker_name'] or UNKNOWN_SPEAKER
+        if (current is None
+                or row['recording_id'] != current['recording_id']
+                or speaker != current['speaker_name']
+                or row['agenda_item_id'] != current['agenda_item_id']
+                or current['chars'] + len(text) + 1 > max_chars):
+            current = {
+                'recording_id': row['recording_id'],
+                'speaker_name': speaker,
+                'agenda_item_id': row['agenda_item_id'],
+                'start_time': row['start_time'],
+                'first_segment_id': row['id'],
+                'texts': [],
+                'chars': 0,
+            }
+            chunks.append(current)
+        current['texts'].append(text)
+        current['chars'] += len(text) + 1
+        current['end_time'] = row['end_time']
+        current['last_segment_id'] = row['id']
+
+    for chunk in chunks:
+        chunk['text'] = ' '.join(chunk.pop('texts'))
+        del chunk['chars']
+    return chunks
+
+
+def to_bytes(vector):
+    return np.asarray(vector, dtype=np.float32).tobytes()
+
+
+def from_bytes(data):
+    return np.frombuffer(bytes(data), dtype=np.float32)
+
+
+class Embedder:
+    """Batched OpenAI embeddings, returned as L2-normalized float32 rows"""
+
+    def __init__(self, client=None):
+        self.client = client or OpenAI(api_key=os.environ.get('OPENAI_API_KEY'))
+        self.model = getattr(settings, 'EMBEDDING_MODEL', 'text-embedding-3-small')
+        self.dimensions = getattr(settings, 'EMBEDDING_DIMENSIONS', 1536)
+        self.batch_size = getattr(settings, 'EMBEDDING_BATCH_SIZE', 100)
+
+    def embed(self, texts):
+        vectors = np.empty((len(texts), self.dimensions), dtype=np.float32)
+        for start in range(0, len(texts), self.batch_size):
+            batch = texts[start:start + self.batch_size]
+            response = self.client.embeddings.create(model=self.model, input=batch, dimensions=self.dimensions)
+            for item in response.data:
+                vectors[start + item.index] = item.embedding
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+
+def build_meeting_index(meeting, embedder=None, rebuild=False, wait=0):
+    """
+    Embed the meeting's processed segments that are not yet in the index.
+    Returns the number of chunks added, or None if another worker is indexing the meeting
+    (two concurrent runs would both read the same watermarks and insert duplicate chunks).
+    """
+    lock = CacheLock(f'retrieval_index:lock:{meeting.id}', INDEX_LOCK_TIMEOUT)
+    if not lock.acquire(wait=wait):
+        return None
+
+    try:
+        return _build_meeting_index(meeting, embedder, rebuild, lock)
+    finally:
+        lock.release()
+
+
+def _build_meeting_index(meeting, embedder, rebuild, lock):
+    if rebuild:
+        TranscriptChunk.objects.filter(meeting=meeting).delete()
+
+    # Incremental, per recording: segments written after the recording's newest embedded one,
+    # plus every segment of recordings not indexed yet. A meeting-wide watermark would skip a
+    # recording that finished processing after another one with higher segment ids.
+    watermarks = dict(
+        TranscriptChunk.objects.filter(meeting=meeting, recording__isnull=False)
+        .values('recording_id')
+        .annotate(last=Max('last_segment_id'))
+        .values_list('recording_id', 'last')
+    )
+    rows = (
+        processed_segments(meeting)
+        .filter(pending_segments_q(watermarks))
+        .order_by('recording_id', 'id')
+        .values(*CHUNK_FIELDS)
+    )
+    chunks = chunk_segments(rows.iterator(chunk_size=2000))
+    if not chunks:
+        return 0
+
+    embedder = embedder or Embedder()
+    vectors = embedder.embed([f"{chunk['speaker_name']}: {chunk['text']}" for chunk in chunks])
+
+    if not lock.extend():
+        # Embedding outlasted the lock and another run may have taken over; writing now could duplicate chunks
+        logger.warning(f"Lost retrieval index lock for meeting {meeting.meeting_id}; discarding {len(chunks)} chunks")
+        return 0
+
+    objects = [
+        TranscriptChunk(
+            meeting=meeting,
+            organization_id=meeting.host_id,
+            embedding=to_bytes(vector),
+            embedding_model=embedder.model,
+            **chunk,
+        )
+        for chunk, vector in zip(chunks, vectors)
+    ]
+    with transaction.atomic():
+        TranscriptChunk.objects.bulk_create(objects, batch_size=500)
+        get_vector_index().add(objects, vectors)
+
+    logger.info(f"Embedded {len(objects)} chunks for meeting {meeting.meeting_id}")
+    return len(objects)
+
+
+class NumpyVectorIndex:
+    """
+    Brute-force inner product over an organization's vectors, cached in process memory.
+    The cache is keyed by the organization's chunk count and newest id, so new chunks
+    (or deletions) trigger a reload on the next query.
+    """
+
+    _cache = {}
+    _lock = threading.Lock()
+
+    def add(self, chunks, vectors):
+        # Vectors already live in TranscriptChunk.embedding; the next query reloads
+        pass
+
+    def search(self, organization_id, query_vector, k, meeting_ids=None):
+        ids, meetings, matrix = self._load(organization_id)
+        if not len(ids):
+            return []
+
+        scores = matrix @ np.asarray(query_vector, dtype=np.float32)
+        if meeting_ids is not None:
+            scores = np.where(np.isin(meetings, list(meeting_ids)), scores, -np.inf)
+
+        k = min(k, len(ids))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(int(ids[i]), float(scores[i])) for i in top if np.isfinite(scores[i])]
+
+    def _load(self, organization_id):
+        chunks = TranscriptChunk.objects.filter(organization_id=organization_id)
+        signature = tuple(chunks.aggregate(count=Count('id'), newest=Max('id')).values())
+
+        cached = self._cache.get(organization_id)
+        if cached and cached[0] == signature:
+            return cached[1]
+
+        rows = list(chunks.order_by('id').values_list('id', 'meeting_id', 'embedding'))
+        if rows:
+            ids = np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows))
+            meetings = np.fromiter((row[1] for row in rows), dtype=np.int64, count=len(rows))
+            matrix = np.frombuffer(b''.join(bytes(row[2]) for row in rows), dtype=np.float32).reshape(len(rows), -1)
+        else:
+            ids = meetings = np.empty(0, dtype=np.int64)
+            matrix = np.empty((0, 0), dtype=np.float32)
+
+        with self._lock:
+            self._cache[organization_id] = (signature, (ids, meetings, matrix))
+        return ids, meetings, matrix
+
+
+class PgvectorIndex:
+    """Approximate top-k via the embedding_vector column (HNSW, inner product) created by migration 0013"""
+
+    table = TranscriptChunk._meta.db_table
+
+    def add(self, chunks, vectors):
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f"UPDATE {self.table} SET embedding_vector = %s::vector WHERE id = %s",
+                [(_vector_literal(vector), chunk.pk) for chunk, vector in zip(chunks, vectors)]
+            )
+
+    # HNSW applies the WHERE clause after the index scan: only ef_search candidates are
+    # considered, so a small organization among many would get fewer than k results.
+    # The candidate list is widened with k, and a short result falls back to an exact scan.
+    ef_search_per_result = 10
+    max_ef_search = 1000
+
+    def search(self, organization_id, query_vector, k, meeting_ids=None):
+        sql = f"SELECT id, -(embedding_vector <#> %s::vector) FROM {self.table} WHERE organization_id = %s"
+        literal = _vector_literal(query_vector)
+        params = [literal, organization_id]
+        if meeting_ids is not None:
+            sql += " AND meeting_id = ANY(%s)"
+            params.append(list(meeting_ids))
+        sql += " ORDER BY embedding_vector <#> %s::vector LIMIT %s"
+        params += [literal, k]
+
+        ef_search = min(max(k * self.ef_search_per_result, 40), self.max_ef_search)
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(f"SET LOCAL hnsw.ef_search = {int(ef_search)}")
+            cursor.execute(sql, params)
+            rows = cursor.fetchall()
+            if len(rows) < k:
+                # Either the organization has fewer than k chunks (cheap to scan) or the filter
+                # discarded too many candidates; the exact scan is correct in both cases
+                cursor.execute("SET LOCAL enable_indexscan = off")
+                cursor.execute(sql, params)
+                rows = cursor.fetchall()
+            return [(row[0], float(row[1])) for row in rows]
+
+
+def _vector_literal(vector):
+    return '[' + ','.join(f'{value:.7g}' for value in vector) + ']'
+
+
+_pgvector_available = None
+
+
+def pgvector_available():
+    global _pgvector_available
+    if _pgvector_available is None:
+        _pgvector_available = False
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT 1 FROM information_schema.columns WHERE table_name = %s AND column_name = 'embedding_vector'",
+                    [TranscriptChunk._meta.db_table]
+                )
+                _pgvector_available = cursor.fetchone() is not None
+    return _pgvector_available
+
+
+def get_vector_index():
+    backend = getattr(settings, 'RETRIEVAL_BACKEND', 'auto')
+    if backend == 'pgvector' or (backend == 'auto' and pgvector_available()):
+        return PgvectorIndex()
+    return NumpyVectorIndex()
+
+
+def retrieve(organization, query_text, k=None, meeting_ids=None, embedder=None):
+    """
+    Top-k chunks for a query within one organization.
+    Returns dicts with meeting, speaker, timestamps, text and similarity score, best first.
+    """
+    embedder = embedder or Embedder()
+    return retrieve_by_vector(organization, embedder.embed([query_text])[0], k=k, meeting_ids=meeting_ids)
+
+
+def retrieve_by_vector(organization, query_vector, k=None, meeting_ids=None):
+    """retrieve() for an already-embedded query"""
+    k = k or getattr(settings, 'RETRIEVAL_TOP_K', 8)
+    hits = get_vector_index().search(organization.pk, query_vector, k, meeting_ids=meeting_ids)
+    if not hits:
+        return []
+
+    chunks = TranscriptChunk.objects.filter(pk__in=[chunk_id for chunk_id, _ in hits]).values(
+        'id', 'meeting_id', 'meeting__meeting_id', 'meeting__title', 'agenda_item_id',
+        'speaker_name', 'start_time', 'end_time', 'text'
+    )
+    by_id = {chunk['id']: chunk for chunk in chunks}
+    return [
+        {**by_id[chunk_id], 'score': score}
+        for chunk_id, score in hits
+        if chunk_id in by_id
+    ]
+
+
+def index_version(organization):
+    """Changes whenever the organization's chunks change; used to key cached retrievals"""
+    stats = TranscriptChunk.objects.filter(organization=organization).aggregate(count=Count('id'), newest=Max('id'))
+    return f"{stats['count']}-{stats['newest'] or 0}"
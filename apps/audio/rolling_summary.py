@@ -0,0 +1,333 @@
+"""
+Progressive meeting minutes.
+Each time segments land for an agenda item, its partial summary is updated from just the
+new segments. When the meeting ends, the final MeetingSummary is a merge of the partials.
+"""
+
+import json
+import logging
+from typing import Dict, List, Optional
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Max
+from django.utils import timezone
+from apps.core.locks import CacheLock
+from apps.core.task_queues import PRIORITY_LIVE
+from .ai_processor import MeetingAIProcessor
+from .models import AgendaItemSummary, TranscriptionSegment
+from .transcripts import UNKNOWN_SPEAKER, pending_segments_q
+
+logger = logging.getLogger(__name__)
+
+LOCK_TIMEOUT = 300  # seconds; longer than folding in one chunk, and renewed after each
+
+
+def _lock_key(meeting_id, agenda_item_id):
+    return f'rolling_summary:lock:{meeting_id}:{agenda_item_id}'
+
+
+def schedule_partial_summaries(meeting, agenda_item_ids):
+    """
+    Queue a partial summary update for each agenda item that received segments.
+    Updates are debounced so a burst of live segments produces one LLM call.
+    """
+    if not getattr(settings, 'ROLLING_SUMMARY_ENABLED', False):
+        return
+
+    from .tasks import update_agenda_item_summary
+
+    debounce = getattr(settings, 'ROLLING_SUMMARY_DEBOUNCE', 30)
+    for agenda_item_id in agenda_item_ids:
+        scheduled_key = f'rolling_summary:scheduled:{meeting.id}:{agenda_item_id}'
+        try:
+            if not cache.add(scheduled_key, 1, timeout=debounce):
+                continue  # An update is already queued and will pick these segments up
+            update_agenda_item_summary.apply_async(
+                (meeting.meeting_id, agenda_item_id), countdown=debounce, priority=PRIORITY_LIVE
+            )
+        except Exception as e:
+            logger.error(f"Could not schedule partial summary for {meeting.meeting_id}/{agenda_item_id}: {e}")
+
+
+def reset_partials_for_recording(recording):
+    """
+    Clear the partial summaries that folded in a recording's segments, for use in the same
+    transaction that replaces those segments (their new ids would otherwise be folded again).
+    A fold cannot be undone for one recording, so each affected partial starts over from the
+    segments of every recording. Returns the affected agenda item ids, to reschedule.
+    """
+    partials = AgendaItemSummary.objects.filter(
+        meeting_id=recording.meeting_id,
+        recording_watermarks__has_key=str(recording.id)
+    )
+    agenda_item_ids = list(partials.values_list('agenda_item_id', flat=True))
+    partials.update(
+        summary='',
+        clean_transcript='',
+        key_points=[],
+        action_items=[],
+        decisions_made=[],
+        recording_watermarks={},
+        segment_count=0,
+        updated_at=timezone.now(),
+    )
+    return agenda_item_ids
+
+
+class RollingSummarizer(MeetingAIProcessor):
+    """Maintains AgendaItemSummary rows and merges them into the MeetingSummary"""
+
+    def update_partial(self, meeting, agenda_item_id: Optional[int], wait: int = 0) -> bool:
+        """
+        Fold segments added since the last update into the agenda item's partial summary.
+        Returns False if another worker holds the lock for this agenda item.
+        Raises if the notes could not be updated; the segments stay pending for the next run.
+        """
+        lock = CacheLock(_lock_key(meeting.id, agenda_item_id), LOCK_TIMEOUT)
+        if not lock.acquire(wait=wait):
+            return False
+
+        try:
+            self._update_partial(meeting, agenda_item_id, lock)
+            return True
+        finally:
+            lock.release()
+
+    def _update_partial(self, meeting, agenda_item_id: Optional[int], lock: CacheLock):
+        partial, _ = AgendaItemSummary.objects.select_related('agenda_item').get_or_create(
+            meeting=meeting,
+            agenda_item_id=agenda_item_id
+        )
+
+        segments = list(TranscriptionSegment.objects.filter(
+            pending_segments_q(partial.recording_watermarks),
+            recording__meeting=meeting,
+            agenda_item_id=agenda_item_id,
+        ).order_by('recording_id', 'id').values_list('id', 'recording_id', 'speaker_name', 'text'))
+
+        if not segments:
+            return
+
+        agenda_title = partial.agenda_item.title if partial.agenda_item else None
+
+        # Collapse into speaker turns and pack into chunks, then fold chunks in one at a time
+        turns = []
+        previous_recording = None
+        for _, recording_id, speaker, text in segments:
+            speaker = speaker or UNKNOWN_SPEAKER
+            if turns and turns[-1][0] == speaker and recording_id == previous_recording:
+                turns[-1][1] += f" {text}"
+            else:
+                turns.append([speaker, text])
+            previous_recording = recording_id
+        lines = [line for speaker, text in turns for line in self._split_turn(speaker, text)]
+
+        chunks = []
+        for line in lines:
+            if chunks and len(chunks[-1]) + len(line) <= self.chunk_max_chars:
+                chunks[-1] += f"\n{line}"
+            else:
+                chunks.append(line)
+
+        for chunk in chunks:
+            cleaned = self._clean_transcript(chunk)
+            notes = self._fold_notes(partial, agenda_title, cleaned)
+
+            partial.clean_transcript = f"{partial.clean_transcript}\n\n{cleaned}" if partial.clean_transcript else cleaned
+            partial.summary = notes['summary']
+            partial.key_points = notes['key_points']
+            partial.action_items = notes['action_items']
+            partial.decisions_made = notes['decisions_made']
+
+            if not lock.extend():
+                # Another worker has taken over this agenda item; saving would fold these segments twice
+                logger.warning(f"Lost partial summary lock for {meeting.meeting_id}/{agenda_item_id}; discarding update")
+                return
+
+        for segment_id, recording_id, _, _ in segments:
+            partial.recording_watermarks[str(recording_id)] = segment_id
+        partial.segment_count += len(segments)
+
+        # Conditional on updated_at: a partial reset while we were folding must not get stale notes back
+        saved = AgendaItemSummary.objects.filter(pk=partial.pk, updated_at=partial.updated_at).update(
+            summary=partial.summary,
+            clean_transcript=partial.clean_transcript,
+            key_points=partial.key_points,
+            action_items=partial.action_items,
+            decisions_made=partial.decisions_made,
+            recording_watermarks=partial.recording_watermarks,
+            segment_count=partial.segment_count,
+            updated_at=timezone.now(),
+        )
+        if not saved:
+            logger.warning(f"Partial summary for {meeting.meeting_id}/{agenda_item_id} was reset during the update; discarding")
+            return
+
+        logger.info(f"Updated partial summary for {meeting.meeting_id} "
+                    f"({agenda_title or 'general discussion'}): +{len(segments)} segments")
+
+    def _fold_notes(self, partial, agenda_title: Optional[str], new_transcript: str) -> Dict:
+        """
+        Update the running notes with a newly transcribed part of the discussion.
+        Raises if the model call fails, so the caller does not mark these segments as summarized.
+        """
+
+        previous = {
+            'summary': partial.summary,
+            'key_points': partial.key_points,
+            'action_items': partial.action_items,
+            'decisions_made': partial.decisions_made,
+        }
+
+        system_prompt = """You keep running notes for one agenda item of a meeting that is still in progress.
+You receive the notes so far and the next part of the transcript. Return the updated notes.
+
+Return valid JSON with these exact keys:
+- summary (string, 2-4 sentences covering the whole discussion so far)
+- key_points (array of strings)
+- action_items (array of objects with: task, owner, due_date, priority)
+- decisions_made (array of strings)
+
+Keep existing entries unless the new transcript revises them. Do not invent content.
+If the agenda item has an owner, assign its action items to that owner unless someone else is named."""
+
+        owner = ""
+        if partial.agenda_item and partial.agenda_item.assigned_participant:
+            owner = f" (owner: {partial.agenda_item.participant_name} <{partial.agenda_item.assigned_participant}>)"
+
+        user_prompt = f"""Agenda item: {agenda_title or 'General discussion'}{owner}
+
+Notes so far (JSON):
+{json.dumps(previous, indent=1)}
+
+New transcript:
+{new_transcript}"""
+
+        try:
+            content = self._chat_completion(
+                model="gpt-4o-mini",
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_prompt}
+                ],
+                temperature=0.1,
+                max_tokens=1500,
+                response_format={"type": "json_object"}
+            )
+            notes = json.loads(content)
+        except Exception as e:
+            logger.error(f"Partial summary update failed: {e}")
+            raise
+
+        if not isinstance(notes, dict):
+            raise ValueError("Partial summary update returned no notes object")
+
+        # Keep the previous notes for anything the model did not return
+        for field, value in previous.items():
+            expected = str if field == 'summary' else list
+            if not isinstance(notes.get(field), expected):
+                notes[field] = value
+        return notes
+
+    def process_meeting_transcript(self, meeting_summary) -> bool:
+        """Catch up any partials with unsummarized segments, then merge them"""
+        try:
+            meeting = meeting_summary.meeting
+            logger.info(f"Merging partial summaries for meeting {meeting.meeting_id}")
+
+            meeting_summary.ai_processing_started_at = timezone.now()
+            meeting_summary.save()
+
+            if not meeting_summary.raw_transcript:
+                logger.error("No raw transcript available for processing")
+                return False
+
+            self._catch_up(meeting)
+
+            partials = sorted(
+                AgendaItemSummary.objects.filter(meeting=meeting, segment_count__gt=0).select_related('agenda_item'),
+                key=lambda p: (p.agenda_item is not None, p.agenda_item.order if p.agenda_item else 0, p.agenda_item_id or 0)
+            )
+            if not partials:
+                logger.error(f"No partial summaries for meeting {meeting.meeting_id}")
+                return False
+
+            merged = self._merge_partials(partials)
+            merged['executive_summary'] = self._summarize_partials(meeting, partials)
+
+            meeting_summary.clean_transcript = merged['clean_transcript']
+            meeting_summary.executive_summary = merged['executive_summary']
+            meeting_summary.key_points = merged['key_points']
+            meeting_summary.action_items = merged['action_items']
+            meeting_summary.decisions_made = merged['decisions_made']
+            meeting_summary.participants_summary = self._build_participation_stats(meeting)
+
+            meeting_summary.is_ai_processed = True
+            meeting_summary.ai_processing_completed_at = timezone.now()
+            meeting_summary.save()
+
+            logger.info(f"Merged {len(partials)} partial summaries for meeting {meeting.meeting_id}")
+            return True
+
+        except Exception as e:
+            logger.error(f"Partial summary merge failed for meeting {meeting_summary.meeting.meeting_id}: {e}")
+            return False
+
+    def _catch_up(self, meeting):
+        """Update every partial that is behind the latest segment of any recording for its agenda item"""
+        latest = TranscriptionSegment.objects.filter(
+            recording__meeting=meeting
+        ).values('agenda_item_id', 'recording_id').annotate(last_id=Max('id'))
+
+        watermarks = dict(
+            AgendaItemSummary.objects.filter(meeting=meeting).values_list('agenda_item_id', 'recording_watermarks')
+        )
+        stale = list({
+            row['agenda_item_id'] for row in latest
+            if row['last_id'] > watermarks.get(row['agenda_item_id'], {}).get(str(row['recording_id']), 0)
+        })
+
+        if stale:
+            logger.info(f"Catching up {len(stale)} partial summaries for meeting {meeting.meeting_id}")
+            # A scheduled update may be mid-flight; wait for it rather than summarizing twice
+            wait = LOCK_TIMEOUT
+            self._run_concurrently(lambda agenda_item_id: self.update_partial(meeting, agenda_item_id, wait=wait), stale)
+
+    def _merge_partials(self, partials: List[AgendaItemSummary]) -> Dict:
+        merged = {'clean_transcript': [], 'key_points': [], 'action_items': [], 'decisions_made': []}
+
+        for partial in partials:
+            title = partial.agenda_item.title if partial.agenda_item else None
+            merged['clean_transcript'].append(partial.clean_transcript)
+            merged['key_points'].extend(partial.key_points)
+            merged['decisions_made'].extend(partial.decisions_made)
+            for item in partial.action_items:
+                if isinstance(item, dict):
+                    item = {**item, 'agenda_item': item.get('agenda_item') or title}
+                merged['action_items'].append(item)
+
+        merged['clean_transcript'] = '\n\n'.join(merged['clean_transcript'])
+        return merged
+
+    def _summarize_partials(self, meeting, partials: List[AgendaItemSummary]) -> str:
+        """Executive summary from the per-item summaries - a small prompt regardless of meeting length"""
+        sections = '\n\n'.join(
+            f"{partial.agenda_item.title if partial.agenda_item else 'General discussion'}:\n{partial.summary}"
+            for partial in partials
+        )
+
+        try:
+            content = self._chat_completion(
+                model="gpt-4o-mini",
+                messages=[
+                    {"role": "system", "content": "You write 2-3 sentence executive summaries of meetings from per-agenda-item summaries. Return only the summary."},
+                    {"role": "user", "content": f"Meeting Context:\n{self._build_meeting_context(meeting)}\n\nAgenda item summaries:\n{sections}"}
+                ],
+                temperature=0.2,
+                max_tokens=300
+            )
+            return content.strip()
+        except Exception as e:
+            logger.error(f"Executive summary from partials failed: {e}")
+            return ' '.join(partial.summary for partial in partials if partial.summary) or \
+                self._get_default_analysis()['executive_summary']
@@ -0,0 +1,173 @@
+"""
+Full-text search over transcripts and meeting summaries.
+Segments and summaries carry a PostgreSQL tsvector (GIN indexed) that is written
+alongside the row - SegmentWriter indexes each flushed batch, the AI task indexes
+the summary - so queries never parse raw text.
+"""
+import logging
+from django.conf import settings
+from django.contrib.postgres.search import SearchHeadline, SearchQuery, SearchRank, SearchVector
+from django.db import connection
+from django.db.models import F, Q, TextField
+from django.db.models.functions import Cast
+from django.utils.html import escape
+from .models import MeetingSummary, TranscriptionSegment
+from .transcripts import UNKNOWN_SPEAKER
+
+logger = logging.getLogger(__name__)
+
+# Headlines are marked with control characters so the text can be escaped before the
+# <mark> tags go in; transcript text never contains them
+MARK_START = '\x02'
+MARK_STOP = '\x03'
+
+HEADLINE_OPTIONS = {
+    'start_sel': MARK_START,
+    'stop_sel': MARK_STOP,
+    'max_words': 30,
+    'min_words': 12,
+}
+
+
+def search_config():
+    return getattr(settings, 'SEARCH_CONFIG', 'english')
+
+
+def is_search_available():
+    """Full-text search needs PostgreSQL; other backends skip indexing"""
+    return connection.vendor == 'postgresql'
+
+
+def index_segments(segment_ids):
+    """Write search vectors for newly created segments"""
+    if not segment_ids or not is_search_available():
+        return 0
+    return TranscriptionSegment.objects.filter(pk__in=segment_ids).update(
+        search_vector=SearchVector('text', config=search_config())
+    )
+
+
+def index_unindexed_segments(queryset=None):
+    """Backfill segments written before indexing existed"""
+    if not is_search_available():
+        return 0
+    queryset = queryset if queryset is not None else TranscriptionSegment.objects.all()
+    return queryset.filter(search_vector__isnull=True).update(
+        search_vector=SearchVector('text', config=search_config())
+    )
+
+
+def summary_search_vector():
+    """Weighted vector: summary text ranks above key points/decisions, above action items"""
+    config = search_config()
+    return (
+        SearchVector('executive_summary', weight='A', config=config)
+        + SearchVector(Cast('key_points', TextField()), weight='B', config=config)
+        + SearchVector(Cast('decisions_made', TextField()), weight='B', config=config)
+        + SearchVector(Cast('action_items', TextField()), weight='C', config=config)
+    )
+
+
+def index_summary(meeting_summary):
+    if not is_search_available():
+        return 0
+    return MeetingSummary.objects.filter(pk=meeting_summary.pk).update(search_vector=summary_search_vector())
+
+
+def build_query(query_text):
+    return SearchQuery(query_text, search_type='websearch', config=search_config())
+
+
+def matching_meetings_q(query_text, host):
+    """
+    Q for the host's meetings whose transcript or summary matches, evaluated as index-backed
+    subqueries. Scoping the subqueries to the host keeps them from scanning every
+    organization's matches.
+    """
+    query = build_query(query_text)
+    segment_meetings = TranscriptionSegment.objects.filter(
+        recording__meeting__host=host, search_vector=query
+    ).values('recording__meeting_id')
+    summary_meetings = MeetingSummary.objects.filter(meeting__host=host, search_vector=query).values('meeting_id')
+    return Q(pk__in=segment_meetings) | Q(pk__in=summary_meetings)
+
+
+def highlight(snippet):
+    """HTML for a headline: the text escaped, matches wrapped in <mark>"""
+    return escape(snippet or '').replace(MARK_START, '<mark>').replace(MARK_STOP, '</mark>')
+
+
+def search_meetings(meetings, query_text, limit=20):
+    """
+    Ranked hits across the given meetings' transcripts and summaries.
+    Each hit carries the meeting, speaker and timestamp (segment hits) so clients can deep-link.
+    """
+    query_text = (query_text or '').strip()
+    if not query_text or not is_search_available():
+        return []
+
+    query = build_query(query_text)
+    config = search_config()
+
+    # The GIN index narrows to matching rows, all of which are ranked to pick the top `limit`;
+    # the headline, which re-parses the text, only runs on those
+    top_segment_ids = list(
+        TranscriptionSegment.objects
+        .filter(recording__meeting__in=meetings, search_vector=query)
+        .annotate(rank=SearchRank(F('search_vector'), query))
+        .order_by('-rank', 'start_time')
+        .values_list('pk', flat=True)[:limit]
+    )
+    segment_hits = list(
+        TranscriptionSegment.objects
+        .filter(pk__in=top_segment_ids)
+        .annotate(
+            rank=SearchRank(F('search_vector'), query),
+            snippet=SearchHeadline('text', query, config=config, **HEADLINE_OPTIONS),
+        )
+        .values(
+            'id', 'rank', 'snippet', 'speaker_name', 'start_time', 'end_time',
+            'recording__meeting__meeting_id', 'recording__meeting__title',
+        )
+    )
+
+    summary_hits = list(
+        MeetingSummary.objects
+        .filter(meeting__in=meetings, search_vector=query)
+        .annotate(
+            rank=SearchRank(F('search_vector'), query),
+            snippet=SearchHeadline('executive_summary', query, config=config, **HEADLINE_OPTIONS),
+        )
+        .order_by('-rank')
+        .values('rank', 'snippet', 'meeting__meeting_id', 'meeting__title')[:limit]
+    )
+
+    hits = [
+        {
+            'type': 'transcript',
+            'meeting_id': row['recording__meeting__meeting_id'],
+            'meeting_title': row['recording__meeting__title'],
+            'segment_id': row['id'],
+            'speaker': row['speaker_name'] or UNKNOWN_SPEAKER,
+            'start_time': row['start_time'],
+            'end_time': row['end_time'],
+            'snippet': highlight(row['snippet']),
+            'rank': row['rank'],
+        }
+        for row in segment_hits
+    ] + [
+        {
+            'type': 'summary',
+            'meeting_id': row['meeting__meeting_id'],
+            'meeting_title': row['meeting__title'],
+            'segment_id': None,
+            'speaker': None,
+            'start_time': None,
+            'end_time': None,
+            'snippet': highlight(row['snippet']),
+            'rank': row['rank'],
+        }
+        for row in summary_hits
+    ]
+    hits.sort(key=lambda hit: (-hit['rank'], hit['start_time'] or 0))
+    return hits[:limit]
@@ -0,0 +1,84 @@
+"""
+Batched persistence of transcription segments.
+Builds segments in memory and writes them with bulk_create instead of one INSERT per sentence.
+"""
+import logging
+from django.conf import settings
+from django.db import transaction
+from .models import TranscriptionSegment
+from .search import index_segments
+from .transcripts import invalidate_transcript_document
+
+logger = logging.getLogger(__name__)
+
+
+class SegmentWriter:
+    """Collect transcription segments for a recording and persist them in bulk"""
+
+    def __init__(self, audio_recording, speaker_resolver, batch_size=None):
+        """
+        Args:
+            audio_recording: AudioRecording the segments belong to
+            speaker_resolver: callable(meeting, speaker_id) -> speaker name
+            batch_size: rows per INSERT (defaults to TRANSCRIPT_SEGMENT_BATCH_SIZE)
+        """
+        self.audio_recording = audio_recording
+        self.speaker_resolver = speaker_resolver
+        self.batch_size = batch_size or getattr(settings, 'TRANSCRIPT_SEGMENT_BATCH_SIZE', 500)
+
+        # Resolve the active agenda item once for the whole recording
+        self.agenda_item = audio_recording.meeting.current_agenda_item
+
+        self._speaker_names = {}
+        self._pending = []
+
+        # Agenda items that received segments, for scheduling partial summary updates
+        self.flushed_agenda_item_ids = set()
+
+    def __len__(self):
+        return len(self._pending)
+
+    def add(self, start_time, end_time, text, speaker_id=None, confidence=None):
+        """Buffer a segment in memory"""
+        segment = TranscriptionSegment(
+            recording=self.audio_recording,
+            start_time=start_time,
+            end_time=end_time,
+            text=text,
+            confidence=confidence,
+            speaker_id=speaker_id,
+            speaker_name=self._resolve_speaker(speaker_id),
+            agenda_item=self.agenda_item,
+        )
+        self._pending.append(segment)
+        return segment
+
+    def refresh_agenda_item(self):
+        """Re-read the meeting's active agenda item (for long-lived writers such as live sessions)"""
+        meeting = self.audio_recording.meeting
+        meeting.refresh_from_db(fields=['current_agenda_item'])
+        self.agenda_item = meeting.current_agenda_item
+
+    def _resolve_speaker(self, speaker_id):
+        """Resolve a speaker name once per distinct speaker_id"""
+        if speaker_id not in self._speaker_names:
+            self._speaker_names[speaker_id] = self.speaker_resolver(self.audio_recording.meeting, speaker_id)
+        return self._speaker_names[speaker_id]
+
+    def flush(self):
+        """Persist all buffered segments in chunks inside a single transaction"""
+        if not self._pending:
+            return 0
+
+        with transaction.atomic():
+            TranscriptionSegment.objects.bulk_create(self._pending, batch_size=self.batch_size)
+            # Index only this batch so search stays current during live meetings
+            index_segments([segment.pk for segment in self._pending])
+            invalidate_transcript_document(self.audio_recording.meeting)
+
+        written = len(self._pending)
+        self.flushed_agenda_item_ids.update(segment.agenda_item_id for segment in self._pending)
+        logger.info(f"Persisted {written} segments for recording {self.audio_recording.id} "
+                    f"({len(self._speaker_names)} speakers, batch size {self.batch_size})")
+        self._pending = []
+        return written
@@ -0,0 +1,73 @@
+"""
+Transcription input sources for Deepgram.
+Chooses how a stored recording is handed to the API without loading it fully into memory.
+"""
+import logging
+from contextlib import contextmanager
+from django.conf import settings
+from django.core.files.storage import default_storage
+
+logger = logging.getLogger(__name__)
+
+INPUT_MODE_URL = 'url'          # Deepgram fetches a short-lived presigned URL itself
+INPUT_MODE_STREAM = 'stream'    # File object streamed in the request body
+INPUT_MODE_BUFFER = 'buffer'    # Whole file read into memory (legacy behaviour)
+
+INPUT_MODES = (INPUT_MODE_URL, INPUT_MODE_STREAM, INPUT_MODE_BUFFER)
+
+
+def get_input_mode():
+    """Configured input mode, falling back to streaming when no cloud storage is available"""
+    mode = getattr(settings, 'DEEPGRAM_INPUT_MODE', INPUT_MODE_STREAM)
+    if mode not in INPUT_MODES:
+        logger.warning(f"Unknown DEEPGRAM_INPUT_MODE '{mode}', using '{INPUT_MODE_STREAM}'")
+        return INPUT_MODE_STREAM
+
+    if mode == INPUT_MODE_URL and not hasattr(default_storage, 'bucket'):
+        logger.info("Presigned URLs need S3/Spaces storage, streaming from local storage instead")
+        return INPUT_MODE_STREAM
+
+    return mode
+
+
+def generate_presigned_url(name, expires_in=None):
+    """Short-lived signed GET URL for a private or public Spaces object"""
+    expires_in = expires_in or getattr(settings, 'DEEPGRAM_PRESIGNED_URL_EXPIRY', 900)
+    client = default_storage.bucket.meta.client
+
+    return client.generate_presigned_url(
+        'get_object',
+        Params={
+            'Bucket': default_storage.bucket_name,
+            'Key': default_storage._normalize_name(name),
+        },
+        ExpiresIn=expires_in,
+    )
+
+
+@contextmanager
+def open_transcription_source(name, mode=None):
+    """
+    Yield (mode, source) for a stored recording.
+
+    The source is a Deepgram UrlSource for 'url' and a FileSource otherwise.
+    Any opened file is closed when the context exits.
+    """
+    mode = mode or get_input_mode()
+
+    if mode == INPUT_MODE_URL:
+        logger.info(f"🎵 Passing presigned URL to Deepgram for {name}")
+        yield mode, {"url": generate_presigned_url(name)}
+        return
+
+    audio_file = default_storage.open(name, 'rb')
+    try:
+        if mode == INPUT_MODE_STREAM:
+            logger.info(f"🎵 Streaming {name} to Deepgram")
+            yield mode, {"stream": audio_file}
+        else:
+            buffer_data = audio_file.read()
+            logger.info(f"🎵 Successfully read {len(buffer_data) / 1024:.1f} KB from storage")
+            yield mode, {"buffer": buffer_data}
+    finally:
+        audio_file.close()
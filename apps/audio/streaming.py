@@ -0,0 +1,90 @@
+"""
+Live (streaming) transcription sessions using Deepgram's WebSocket API.
+Set DEEPGRAM_LIVE_URL to point sessions at a local fake server (see run_fake_stt_server).
+"""
+import logging
+import os
+from collections import Counter
+from django.conf import settings
+from deepgram import DeepgramClient, DeepgramClientOptions, LiveOptions, LiveTranscriptionEvents
+
+logger = logging.getLogger(__name__)
+
+
+class LiveTranscriptionSession:
+    """Streaming speech-to-text session that reports partial and final segments"""
+
+    def __init__(self, on_segment):
+        """
+        Args:
+            on_segment: async callable(segment: dict) called for every non-empty result.
+                The dict has text, start_time, end_time, speaker_id, confidence and is_final.
+        """
+        self.on_segment = on_segment
+
+        live_url = getattr(settings, 'DEEPGRAM_LIVE_URL', '')
+        api_key = os.environ.get('DEEPGRAM_API_KEY', '')
+        if not api_key and not live_url:
+            raise ValueError("DEEPGRAM_API_KEY not configured in environment variables")
+
+        # A fake server does not check the key, so any placeholder will do
+        config = DeepgramClientOptions(url=live_url) if live_url else DeepgramClientOptions()
+        self.client = DeepgramClient(api_key or 'fake-stt', config)
+        self.connection = None
+
+    async def start(self):
+        """Open the streaming connection"""
+        self.connection = self.client.listen.asyncwebsocket.v("1")
+        self.connection.on(LiveTranscriptionEvents.Transcript, self._handle_transcript)
+        self.connection.on(LiveTranscriptionEvents.Error, self._handle_error)
+
+        options = LiveOptions(
+            model="nova-2",
+            language="en",
+            smart_format=True,
+            punctuate=True,
+            diarize=True,
+            interim_results=True,
+        )
+
+        started = await self.connection.start(options)
+        if not started:
+            raise ConnectionError("Could not open live transcription connection")
+        return started
+
+    async def send(self, audio_data):
+        """Forward an audio frame to the STT service"""
+        if self.connection:
+            await self.connection.send(audio_data)
+
+    async def finish(self):
+        """Flush pending results and close the connection"""
+        if self.connection:
+            await self.connection.finish()
+            self.connection = None
+
+    async def _handle_transcript(self, client, result, **kwargs):
+        alternatives = result.channel.alternatives if result.channel else []
+        if not alternatives or not alternatives[0].transcript:
+            return
+
+        alternative = alternatives[0]
+        await self.on_segment({
+            'text': alternative.transcript,
+            'start_time': result.start,
+            'end_time': result.start + result.duration,
+            'speaker_id': self._dominant_speaker(alternative.words),
+            'confidence': alternative.confidence,
+            'is_final': result.is_final,
+        })
+
+    async def _handle_error(self, client, error, **kwargs):
+        logger.error(f"Live transcription error: {error}")
+
+    @staticmethod
+    def _dominant_speaker(words):
+        """Speaker who said most of the words in a result"""
+        speakers = Counter(word.speaker for word in words if word.speaker is not None)
+        if not speakers:
+            return None
+        return f"speaker_{speakers.most_common(1)[0][0]}"
@@ -1,88 +1,235 @@
 from celery import shared_task
 from .models import AudioRecording, MeetingSummary
-from .processors import AudioProcessor
+from .processors import AudioProcessor, TranscriptionError
+from .action_items import sync_action_items
 from .ai_processor import MeetingAIProcessor
+from .async_ai_processor import AsyncMeetingAIProcessor
+from .pipeline import (
+    ALREADY_DONE, COMPLETED, FAILED, LOCKED, Stage,
+    all_recordings_processed, dead_letter_recording, merge_transcript, recordings_key, run_stage, stage_key,
+    start_meeting_pipeline,
+)
+from .retrieval import build_meeting_index
+from .rolling_summary import RollingSummarizer
+from .search import index_summary
+from .transcripts import get_transcript_document
+from .uploads import reap_abandoned_uploads
+from django.conf import settings
+from apps.core.task_queues import PRIORITY_LIVE
 
-@shared_task
-def process_audio_recording(recording_id):
-    """Background task to process audio recording with Deepgram"""
+@shared_task(
+    bind=True,
+    # Transient Deepgram failures are retried with exponential backoff and jitter; the worker
+    # slot is released between attempts instead of retrying in-process
+    autoretry_for=(TranscriptionError,),
+    retry_backoff=getattr(settings, 'TRANSCRIPTION_RETRY_BACKOFF', 30),
+    retry_backoff_max=getattr(settings, 'TRANSCRIPTION_RETRY_BACKOFF_MAX', 900),
+    retry_jitter=True,
+    max_retries=getattr(settings, 'TRANSCRIPTION_MAX_RETRIES', 5),
+)
+def process_audio_recording(self, recording_id):
+    """Pipeline stage: transcribe one recording with Deepgram"""
+    recording = None
     try:
-        recording = AudioRecording.objects.get(id=recording_id)
-        
-        # Process with Deepgram
-        processor = AudioProcessor()
-        success = processor.transcribe_audio(recording)
-        
+        recording = AudioRecording.objects.select_related('meeting').get(id=recording_id)
+        meeting = recording.meeting
+
+        def transcribe():
+            if recording.is_processed:
+                return True
+            return AudioProcessor().transcribe_audio(recording)
+
+        outcome = run_stage(meeting, Stage.TRANSCRIBE, stage_key(Stage.TRANSCRIBE, meeting, recording_id), transcribe)
+        success = outcome in (COMPLETED, ALREADY_DONE)
+
         if success:
             print(f"Successfully processed recording {recording_id} via Deepgram")
+            # Queued on its own rather than as part of a pipeline chord: continue with the meeting stages
+            if not self.request.chord:
+                start_meeting_pipeline(meeting)
+        elif outcome == LOCKED:
+            print(f"Recording {recording_id} is already being transcribed")
         else:
-            print(f"Failed to process recording {recording_id} - will retry if configured")
-            
+            print(f"Failed to process recording {recording_id} - not retryable")
+            dead_letter_recording(recording, recording.last_transcription_error or 'Transcription failed')
+
         return success
-        
+
     except AudioRecording.DoesNotExist:
         print(f"Recording {recording_id} not found")
         return False
+    except TranscriptionError as e:
+        if self.request.retries >= self.max_retries:
+            print(f"Giving up on recording {recording_id} after {self.request.retries + 1} attempts: {e}")
+            dead_letter_recording(recording, str(e))
+            return False
+        print(f"Transcription of recording {recording_id} failed (attempt {self.request.retries + 1}), retrying: {e}")
+        raise
     except ValueError as e:
         print(f"Configuration error: {e}")
+        dead_letter_recording(recording, f"Configuration error: {e}")
         return False
     except Exception as e:
         print(f"Unexpected error processing recording {recording_id}: {e}")
+        if recording:
+            dead_letter_recording(recording, str(e))
+        return False
+
+
+@shared_task
+def merge_meeting_transcript(meeting_id):
+    """Pipeline stage: once every recording is transcribed, materialize the meeting transcript"""
+    try:
+        from apps.meetings.models import Meeting
+
+        meeting = Meeting.objects.get(meeting_id=meeting_id)
+
+        # Another recording is still being transcribed; its pipeline will merge when it finishes
+        if not all_recordings_processed(meeting):
+            print(f"Not all recordings processed for meeting {meeting_id}, deferring merge")
+            return False
+
+        key = stage_key(Stage.MERGE, meeting, recordings_key(meeting))
+        return run_stage(meeting, Stage.MERGE, key, lambda: merge_transcript(meeting)) != FAILED
+
+    except Meeting.DoesNotExist:
+        print(f"Meeting {meeting_id} not found")
+        return False
+    except Exception as e:
+        print(f"Unexpected error merging transcript for meeting {meeting_id}: {e}")
         return False
 
 
 @shared_task
 def process_meeting_ai_analysis(meeting_id):
-    """Background task to process meeting with AI for cleanup and minutes generation"""
+    """Pipeline stage: AI cleanup and minutes generation, once per set of transcribed recordings"""
     try:
         from apps.meetings.models import Meeting
 
         meeting = Meeting.objects.get(meeting_id=meeting_id)
 
-        # Get or create meeting summary
-        summary, created = MeetingSummary.objects.get_or_create(
-            meeting=meeting,
-            defaults={'raw_transcript': ''}  # Will be populated below
-        )
-
-        # If already processed, skip
-        if summary.is_ai_processed:
-            print(f"Meeting {meeting_id} already AI processed")
-            return True
-
-        # Compile full transcript from all processed recordings
-        transcript_parts = []
-        for recording in meeting.recordings.filter(is_processed=True):
-            for segment in recording.segments.all().order_by('start_time'):
-                speaker = segment.speaker_name or 'Unknown Speaker'
-                transcript_parts.append(f"{speaker}: {segment.text}")
-
-        if not transcript_parts:
-            print(f"No processed recordings found for meeting {meeting_id}")
+        if not all_recordings_processed(meeting):
+            print(f"Not all recordings processed for meeting {meeting_id}, deferring AI analysis")
             return False
 
-        # Set raw transcript
-        summary.raw_transcript = '\n'.join(transcript_parts)
+        key = stage_key(Stage.ANALYZE, meeting, recordings_key(meeting))
+        outcome = run_stage(meeting, Stage.ANALYZE, key, lambda: _analyze_meeting(meeting))
+        return outcome in (COMPLETED, ALREADY_DONE)
+
+    except Meeting.DoesNotExist:
+        print(f"Meeting {meeting_id} not found")
+        return False
+    except Exception as e:
+        print(f"Unexpected error AI processing meeting {meeting_id}: {e}")
+        return False
+
+
+def _analyze_meeting(meeting):
+    meeting_id = meeting.meeting_id
+
+    # Get or create meeting summary
+    summary, created = MeetingSummary.objects.get_or_create(
+        meeting=meeting,
+        defaults={'raw_transcript': ''}  # Will be populated below
+    )
+
+    # No early return on is_ai_processed: run_stage keys this stage by the set of processed
+    # recordings, so reaching here means a recording landed after the last analysis
+
+    # Full transcript from all processed recordings, materialized once per segment change
+    transcript = get_transcript_document(meeting)
+
+    if not transcript['segment_count']:
+        print(f"No processed recordings found for meeting {meeting_id}")
+        return False
+
+    # Set raw transcript (normally already stored by the merge stage)
+    if summary.raw_transcript != transcript['text']:
+        summary.raw_transcript = transcript['text']
         summary.save()
 
-        # Process with AI
+    # Process with AI
+    if getattr(settings, 'ROLLING_SUMMARY_ENABLED', False):
+        # Minutes were built up during the meeting; only merge the partials
+        ai_processor = RollingSummarizer()
+    elif getattr(settings, 'AI_PROCESSOR_ASYNC', False):
+        ai_processor = AsyncMeetingAIProcessor()
+    else:
         ai_processor = MeetingAIProcessor()
-        success = ai_processor.process_meeting_transcript(summary)
+    success = ai_processor.process_meeting_transcript(summary)
 
-        if success:
-            print(f"Successfully AI processed meeting {meeting_id}")
-            # Auto-complete the meeting if it was active
-            if meeting.is_active:
-                meeting.end_meeting()
-                print(f"Auto-completed meeting {meeting_id}")
-        else:
-            print(f"Failed to AI process meeting {meeting_id}")
+    if success:
+        print(f"Successfully AI processed meeting {meeting_id}")
+        # Index the extracted action items by owner, meeting and due date
+        sync_action_items(summary)
+        index_summary(summary)
+        # Auto-complete the meeting if it was active
+        if meeting.is_active:
+            meeting.end_meeting()
+            print(f"Auto-completed meeting {meeting_id}")
+    else:
+        print(f"Failed to AI process meeting {meeting_id}")
 
-        return success
+    return success
+
+
+@shared_task
+def update_agenda_item_summary(meeting_id, agenda_item_id):
+    """Background task to fold newly transcribed segments into an agenda item's partial summary"""
+    try:
+        from apps.meetings.models import Meeting
+
+        meeting = Meeting.objects.get(meeting_id=meeting_id)
+
+        if not RollingSummarizer().update_partial(meeting, agenda_item_id):
+            # Another update for this agenda item is running - try again once it has finished
+            print(f"Partial summary for {meeting_id}/{agenda_item_id} is locked, rescheduling")
+            update_agenda_item_summary.apply_async((meeting_id, agenda_item_id), countdown=30, priority=PRIORITY_LIVE)
+            return False
+
+        return True
 
     except Meeting.DoesNotExist:
         print(f"Meeting {meeting_id} not found")
         return False
     except Exception as e:
-        print(f"Unexpected error AI processing meeting {meeting_id}: {e}")
-        return False
\ No newline at end of file
+        print(f"Unexpected error updating partial summary for meeting {meeting_id}: {e}")
+        return False
+
+
+@shared_task
+def build_retrieval_index(meeting_id):
+    """Background task to embed a meeting's newly transcribed segments for semantic retrieval"""
+    try:
+        from apps.meetings.models import Meeting
+
+        meeting = Meeting.objects.get(meeting_id=meeting_id)
+        added = build_meeting_index(meeting)
+        if added is None:
+            # Another run is indexing this meeting - pick up anything it missed once it has finished
+            print(f"Retrieval index for {meeting_id} is locked, rescheduling")
+            build_retrieval_index.apply_async((meeting_id,), countdown=30)
+            return 0
+
+        print(f"Embedded {added} transcript chunks for meeting {meeting_id}")
+        return added
+
+    except Meeting.DoesNotExist:
+        print(f"Meeting {meeting_id} not found")
+        return 0
+    except Exception as e:
+        print(f"Unexpected error building retrieval index for meeting {meeting_id}: {e}")
+        return 0
+
+
+@shared_task
+def reap_abandoned_audio_uploads():
+    """Periodic task: abort chunked uploads their client abandoned and delete the stored chunks"""
+    try:
+        reaped = reap_abandoned_uploads()
+        if reaped:
+            print(f"Aborted {reaped} abandoned audio uploads")
+        return reaped
+    except Exception as e:
+        print(f"Failed to reap abandoned audio uploads: {e}")
+        return 0
@@ -0,0 +1,210 @@
+import asyncio
+import json
+import socket
+import threading
+from unittest import mock
+from asgiref.testing import ApplicationCommunicator
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from apps.audio.management.commands.run_fake_stt_server import SCRIPT, Command as FakeSTTServer
+from apps.meetings.models import Meeting, MeetingParticipant
+from .consumers import LiveTranscriptionConsumer
+from .models import AudioRecording, MeetingSummary, PipelineStageRun, TranscriptionSegment
+from .pipeline import ALREADY_DONE, COMPLETED, FAILED, LOCKED, Stage, _lock_key, run_stage
+from .tasks import process_meeting_ai_analysis
+
+FRAMES_PER_SEGMENT = 4
+
+
+def start_fake_stt_server():
+    """Run the run_fake_stt_server command on a free port in a daemon thread; returns its URL"""
+    with socket.socket() as probe:
+        probe.bind(('127.0.0.1', 0))
+        port = probe.getsockname()[1]
+
+    loop = asyncio.new_event_loop()
+    serve = FakeSTTServer().serve('127.0.0.1', port, FRAMES_PER_SEGMENT)
+    threading.Thread(target=loop.run_until_complete, args=(serve,), daemon=True).start()
+
+    for _ in range(50):
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=0.1).close()
+            break
+        except OSError:
+            threading.Event().wait(0.1)
+    return f'http://127.0.0.1:{port}'
+
+
+@mock.patch('apps.audio.consumers.start_meeting_pipeline')
+@mock.patch('apps.audio.consumers.schedule_partial_summaries')
+@mock.patch('apps.audio.consumers.schedule_retrieval_index')
+class LiveTranscriptionConsumerTests(TransactionTestCase):
+    """Live transcription against the fake Deepgram server from run_fake_stt_server"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.live_url = start_fake_stt_server()
+
+    def setUp(self):
+        self.host = User.objects.create_user(username='host', email='host@example.com', password='secret')
+        self.meeting = Meeting.objects.create(title='Standup', host=self.host, scheduled_start=timezone.now())
+
+    def tearDown(self):
+        for recording in AudioRecording.objects.exclude(audio_file=''):
+            recording.audio_file.delete(save=False)
+
+    def communicator(self, user=None):
+        # asgiref's communicator directly; channels.testing pulls in daphne
+        return ApplicationCommunicator(LiveTranscriptionConsumer.as_asgi(), {
+            'type': 'websocket',
+            'path': f'/ws/meeting/{self.meeting.meeting_id}/live/',
+            'url_route': {'kwargs': {'meeting_id': self.meeting.meeting_id}},
+            'user': user or self.host,
+        })
+
+    async def connect(self, communicator):
+        await communicator.send_input({'type': 'websocket.connect'})
+        response = await communicator.receive_output(timeout=5)
+        return response['type'] == 'websocket.accept'
+
+    async def stream_frames(self, frames, close_code=1000):
+        """Stream frames then disconnect; returns the recording id the consumer announced"""
+        communicator = self.communicator()
+        self.assertTrue(await self.connect(communicator))
+        announcement = json.loads((await communicator.receive_output(timeout=5))['text'])
+
+        for _ in range(frames):
+            await communicator.send_input({'type': 'websocket.receive', 'bytes': b'\x00' * 320})
+        await asyncio.sleep(0.5)
+        await communicator.send_input({'type': 'websocket.disconnect', 'code': close_code})
+        await communicator.wait(timeout=5)
+        return announcement['recording_id']
+
+    def test_final_segments_are_persisted(self, *mocks):
+        with override_settings(LIVE_TRANSCRIPTION_ENABLED=True, DEEPGRAM_LIVE_URL=self.live_url):
+            asyncio.run(self.stream_frames(FRAMES_PER_SEGMENT * 2))
+
+        recording = AudioRecording.objects.get(meeting=self.meeting)
+        self.assertTrue(recording.is_processed)
+        self.assertEqual(recording.transcription_service, 'deepgram_live')
+        self.assertEqual(recording.file_size, FRAMES_PER_SEGMENT * 2 * 320)
+
+        texts = list(TranscriptionSegment.objects.filter(recording=recording).values_list('text', flat=True))
+        self.assertEqual(texts, SCRIPT[:2])
+
+    def test_dropped_socket_recording_is_replaced_by_full_upload(self, *mocks):
+        with override_settings(LIVE_TRANSCRIPTION_ENABLED=True, DEEPGRAM_LIVE_URL=self.live_url):
+            live_id = asyncio.run(self.stream_frames(FRAMES_PER_SEGMENT * 2, close_code=1006))
+
+        # The server keeps what it received before the drop
+        live = AudioRecording.objects.get(pk=live_id)
+        self.assertTrue(live.is_processed)
+        self.assertEqual(TranscriptionSegment.objects.filter(recording=live).count(), 2)
+
+        # The client then uploads the whole recording in place of the live one
+        self.client.force_login(self.host)
+        with mock.patch('apps.api.views.start_meeting_pipeline') as start_pipeline:
+            response = self.client.post(reverse('upload_audio'), {
+                'meeting_id': self.meeting.meeting_id,
+                'session_id': str(self.host.id),
+                'replaces_recording': live_id,
+                'audio_file': SimpleUploadedFile('recording.webm', b'\x00' * 4096, content_type='audio/webm'),
+            })
+
+        self.assertEqual(response.status_code, 200)
+        start_pipeline.assert_called_once()
+        recording = AudioRecording.objects.get(meeting=self.meeting)
+        self.assertEqual(recording.id, response.json()['recording_id'])
+        self.assertFalse(recording.is_processed)
+        self.assertFalse(TranscriptionSegment.objects.exists())
+
+    def test_rejected_when_live_transcription_disabled(self, *mocks):
+        with override_settings(LIVE_TRANSCRIPTION_ENABLED=False, DEEPGRAM_LIVE_URL=self.live_url):
+            self.assertFalse(asyncio.run(self.connect(self.communicator())))
+        self.assertFalse(AudioRecording.objects.exists())
+
+    def test_rejected_for_non_host(self, *mocks):
+        guest = User.objects.create_user(username='guest', email='guest@example.com', password='secret')
+
+        with override_settings(LIVE_TRANSCRIPTION_ENABLED=True, DEEPGRAM_LIVE_URL=self.live_url):
+            self.assertFalse(asyncio.run(self.connect(self.communicator(guest))))
+        self.assertFalse(AudioRecording.objects.exists())
+
+
+class RunStageTests(TestCase):
+    """run_stage runs a stage once per idempotency key and never twice at the same time"""
+
+    def setUp(self):
+        cache.clear()
+        host = User.objects.create_user(username='host', email='host@example.com', password='secret')
+        self.meeting = Meeting.objects.create(title='Standup', host=host, scheduled_start=timezone.now())
+        self.participant = MeetingParticipant.objects.create(meeting=self.meeting, user=host, session_id='host')
+
+    def test_completed_stage_is_not_run_again(self):
+        func = mock.Mock(return_value=True)
+
+        self.assertEqual(run_stage(self.meeting, Stage.MERGE, 'merge:key', func), COMPLETED)
+        self.assertEqual(run_stage(self.meeting, Stage.MERGE, 'merge:key', func), ALREADY_DONE)
+        func.assert_called_once()
+
+    def test_failed_stage_is_retried(self):
+        func = mock.Mock(side_effect=[False, True])
+
+        self.assertEqual(run_stage(self.meeting, Stage.MERGE, 'merge:key', func), FAILED)
+        self.assertEqual(run_stage(self.meeting, Stage.MERGE, 'merge:key', func), COMPLETED)
+        run = PipelineStageRun.objects.get(idempotency_key='merge:key')
+        self.assertEqual(run.attempts, 2)
+
+    def test_concurrent_attempt_is_locked_out(self):
+        nested = []
+
+        def func():
+            nested.append(run_stage(self.meeting, Stage.MERGE, 'merge:key', lambda: True))
+            return True
+
+        self.assertEqual(run_stage(self.meeting, Stage.MERGE, 'merge:key', func), COMPLETED)
+        self.assertEqual(nested, [LOCKED])
+        self.assertIsNone(cache.get(_lock_key('merge:key')))
+
+    def test_lock_taken_over_after_expiry_is_left_alone(self):
+        def func():
+            # Our lock expired and another worker acquired it
+            cache.set(_lock_key('merge:key'), 'other-worker')
+            return True
+
+        run_stage(self.meeting, Stage.MERGE, 'merge:key', func)
+        self.assertEqual(cache.get(_lock_key('merge:key')), 'other-worker')
+
+    @override_settings(ROLLING_SUMMARY_ENABLED=False, AI_PROCESSOR_ASYNC=False)
+    @mock.patch('apps.audio.tasks.index_summary')
+    @mock.patch('apps.audio.tasks.MeetingAIProcessor')
+    def test_analysis_reruns_when_a_recording_lands_later(self, processor, index_summary):
+        def analyze(summary):
+            summary.is_ai_processed = True
+            summary.save()
+            return True
+        processor.return_value.process_meeting_transcript.side_effect = analyze
+
+        self.add_processed_recording()
+        self.assertTrue(process_meeting_ai_analysis(self.meeting.meeting_id))
+        self.assertTrue(process_meeting_ai_analysis(self.meeting.meeting_id))
+        self.assertEqual(processor.return_value.process_meeting_transcript.call_count, 1)
+
+        self.add_processed_recording()
+        self.assertTrue(process_meeting_ai_analysis(self.meeting.meeting_id))
+        self.assertEqual(processor.return_value.process_meeting_transcript.call_count, 2)
+        self.assertTrue(MeetingSummary.objects.get(meeting=self.meeting).is_ai_processed)
+
+    def add_processed_recording(self):
+        recording = AudioRecording.objects.create(
+            meeting=self.meeting, participant=self.participant, audio_file='test/recording.webm',
+            format='webm', is_processed=True,
+        )
+        TranscriptionSegment.objects.create(
+            recording=recording, start_time=0.0, end_time=1.0, text='Hello.', confidence=0.9, speaker_name='Speaker 1',
+        )
@@ -0,0 +1,173 @@
+"""
+Shared transcript access for the transcript views, the public views and AI processing.
+
+Each meeting's transcript is materialized once as a TranscriptDocument (speaker-grouped
+segments, plain text and speaker stats, stored as compressed JSON). Writers call
+invalidate_transcript_document() when segments change; readers rebuild on demand.
+"""
+import base64
+import json
+import logging
+import zlib
+from django.db.models import Count, F, Q
+from .models import TranscriptDocument, TranscriptionSegment
+
+logger = logging.getLogger(__name__)
+
+# Bump when the document layout changes so stored documents are rebuilt
+DOCUMENT_FORMAT = 1
+UNKNOWN_SPEAKER = 'Unknown Speaker'
+SEGMENT_FIELDS = ('start_time', 'end_time', 'speaker_name', 'speaker_id', 'text', 'confidence')
+
+
+def _segment_values(queryset, *extra_fields):
+    return queryset.values(
+        *extra_fields,
+        *SEGMENT_FIELDS,
+        recording_service=F('recording__transcription_service'),
+        agenda_item_title=F('agenda_item__title'),
+    )
+
+
+def processed_segments(meeting):
+    """Segments of the meeting's transcribed recordings; shared by the transcript, search and retrieval readers"""
+    return TranscriptionSegment.objects.filter(
+        recording__meeting=meeting,
+        recording__is_processed=True
+    )
+
+
+def pending_segments_q(watermarks):
+    """
+    Q for segments past per-recording watermarks ({recording_id: newest handled segment id}),
+    including every segment of recordings not seen yet. Recordings are transcribed
+    concurrently, so segment ids are only ordered within one recording.
+    """
+    pending = ~Q(recording_id__in=[int(recording_id) for recording_id in watermarks])
+    for recording_id, last_segment_id in watermarks.items():
+        pending |= Q(recording_id=int(recording_id), id__gt=last_segment_id)
+    return pending
+
+
+def transcript_rows(meeting):
+    """Processed segments for a meeting as dicts, ordered by time - one query"""
+    return _segment_values(processed_segments(meeting).order_by('start_time', 'recording_id', 'id'))
+
+
+def encode_cursor(row):
+    """Opaque cursor pointing just past a segment row"""
+    payload = json.dumps([row['start_time'], row['id']]).encode('utf-8')
+    return base64.urlsafe_b64encode(payload).decode('ascii')
+
+
+def decode_cursor(cursor):
+    """Returns (start_time, id); raises ValueError for a malformed cursor"""
+    try:
+        start_time, segment_id = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+        return float(start_time), int(segment_id)
+    except Exception:
+        raise ValueError(f"Invalid cursor: {cursor}")
+
+
+def segments_after(meeting, cursor=None):
+    """
+    Processed segments ordered by (start_time, id), starting after the cursor.
+    Keyset pagination: a page never re-reads the rows before the cursor. The order spans
+    recordings, so it is not a single range scan of the (recording, start_time, id) index;
+    Postgres reads each recording's range past the cursor and sorts, which stays cheap for
+    the handful of recordings a meeting has.
+    """
+    queryset = processed_segments(meeting)
+    if cursor:
+        start_time, segment_id = decode_cursor(cursor)
+        queryset = queryset.filter(
+            Q(start_time__gt=start_time) | Q(start_time=start_time, id__gt=segment_id)
+        )
+    return _segment_values(queryset.order_by('start_time', 'id'), 'id')
+
+
+def build_transcript_document(meeting):
+    """Group segments by speaker, render plain text and compute speaker stats in a single pass"""
+    grouped_segments = []
+    lines = []
+    speakers = {}
+    segment_count = 0
+
+    for row in transcript_rows(meeting):
+        speaker = row['speaker_name'] = row['speaker_name'] or UNKNOWN_SPEAKER
+        segment_count += 1
+        lines.append(f"{speaker}: {row['text']}")
+
+        if grouped_segments and grouped_segments[-1]['speaker'] == speaker:
+            grouped_segments[-1]['segments'].append(row)
+        else:
+            grouped_segments.append({'speaker': speaker, 'segments': [row]})
+
+        stats = speakers.setdefault(speaker, {'segments': 0, 'speaking_seconds': 0.0})
+        stats['segments'] += 1
+        stats['speaking_seconds'] += max(row['end_time'] - row['start_time'], 0)
+
+    total = sum(stats['speaking_seconds'] for stats in speakers.values())
+    for stats in speakers.values():
+        stats['speaking_seconds'] = round(stats['speaking_seconds'], 1)
+        stats['share'] = round(stats['speaking_seconds'] / total, 3) if total else 0.0
+
+    return {
+        'format': DOCUMENT_FORMAT,
+        'segment_count': segment_count,
+        'grouped_segments': grouped_segments,
+        'text': '\n'.join(lines),
+        'speaker_stats': {
+            'total_speakers': len(speakers),
+            'total_speaking_seconds': round(total, 1),
+            'speakers': speakers,
+        },
+    }
+
+
+def get_transcript_document(meeting):
+    """Return the meeting's transcript document, rebuilding it only if segments changed"""
+    document, _ = TranscriptDocument.objects.get_or_create(meeting=meeting)
+
+    if document.is_current and document.data:
+        data = json.loads(zlib.decompress(bytes(document.data)))
+        if data.get('format') == DOCUMENT_FORMAT:
+            return data
+
+    version = document.version
+    data = build_transcript_document(meeting)
+    compressed = zlib.compress(json.dumps(data, separators=(',', ':')).encode('utf-8'))
+
+    # Only mark the document current if no writer invalidated it while we were building
+    TranscriptDocument.objects.filter(pk=document.pk, version=version).update(
+        data=compressed,
+        built_version=version,
+        segment_count=data['segment_count'],
+        size=len(compressed),
+    )
+    logger.info(f"Built transcript document for {meeting.meeting_id} v{version}: "
+                f"{data['segment_count']} segments, {len(compressed)} bytes")
+    return data
+
+
+def invalidate_transcript_document(meeting):
+    """Mark the stored document stale - call whenever a meeting's processed segments change"""
+    TranscriptDocument.objects.filter(meeting=meeting).update(version=F('version') + 1)
+
+
+def load_transcript(meeting):
+    """
+    Returns (segments, grouped_segments) where consecutive segments from the same
+    speaker are grouped as {'speaker': name, 'segments': [...]}.
+    """
+    grouped_segments = get_transcript_document(meeting)['grouped_segments']
+    segments = [segment for group in grouped_segments for segment in group['segments']]
+    return segments, grouped_segments
+
+
+def recording_counts(meeting):
+    """Total and processed recording counts in a single aggregate query"""
+    return meeting.recordings.aggregate(
+        total_recordings=Count('id'),
+        processed_recordings=Count('id', filter=Q(is_processed=True)),
+    )
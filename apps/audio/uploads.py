@@ -0,0 +1,220 @@
+"""
+Chunked/resumable audio uploads.
+Chunks are written to storage as they arrive and stitched into one recording on finalize,
+so no worker ever holds a whole meeting's audio in memory.
+"""
+import logging
+import tempfile
+from datetime import timedelta
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.utils import timezone
+from .models import AudioRecording, AudioUpload
+
+logger = logging.getLogger(__name__)
+
+# Copy buffer used when stitching chunks together
+STITCH_BUFFER_SIZE = 1024 * 1024
+
+# How long a FINALIZING claim is honoured before another finalize may take it over
+FINALIZE_TIMEOUT = timedelta(minutes=15)
+
+# Uploads untouched for this long were abandoned by their client; the reaper aborts them
+ABANDONED_AFTER = timedelta(hours=24)
+
+
+class ChunkOutOfOrder(Exception):
+    """Raised when a chunk arrives ahead of the expected sequence number"""
+
+    def __init__(self, expected):
+        self.expected = expected
+        super().__init__(f"Expected chunk {expected}")
+
+
+def append_chunk(upload, sequence, chunk_file):
+    """
+    Store one chunk of an upload.
+
+    The file is written before the row is locked, under a name fixed by the sequence
+    number: storage writes are not rolled back with the transaction, so a retried chunk
+    must replace its earlier copy rather than be saved next to it. The lock is only held
+    to advance next_sequence.
+
+    Returns:
+        bool: True if the chunk was stored, False if it was a duplicate of an
+        already stored chunk (safe to ignore when a client retries).
+    """
+    upload.refresh_from_db(fields=['status', 'next_sequence'])
+    if not _check_sequence(upload, sequence):
+        return False
+
+    _store_chunk(upload.chunk_path(sequence), chunk_file)
+
+    with transaction.atomic():
+        upload = AudioUpload.objects.select_for_update().get(pk=upload.pk)
+        # A concurrent retry of the same chunk may have advanced it meanwhile
+        if not _check_sequence(upload, sequence):
+            return False
+
+        upload.next_sequence = sequence + 1
+        upload.bytes_received += chunk_file.size
+        upload.save(update_fields=['next_sequence', 'bytes_received', 'updated_at'])
+
+    return True
+
+
+def _check_sequence(upload, sequence):
+    """False for an already stored chunk; raises unless it is the chunk expected next"""
+    if upload.status != AudioUpload.Status.RECEIVING:
+        raise ValueError(f"Upload {upload.upload_id} is {upload.status}")
+    if sequence < upload.next_sequence:
+        return False
+    if sequence > upload.next_sequence:
+        raise ChunkOutOfOrder(upload.next_sequence)
+    return True
+
+
+def _store_chunk(path, chunk_file):
+    """Write a chunk under its fixed name, replacing a copy left by an earlier attempt"""
+    if default_storage.exists(path):
+        default_storage.delete(path)
+    stored = default_storage.save(path, chunk_file)
+    if stored != path:
+        # A concurrent retry wrote the same chunk first; its copy is identical
+        default_storage.delete(stored)
+
+
+def abort_upload(upload):
+    """
+    Give up on an upload and delete its chunks. Finalized uploads and uploads being
+    finalized (within FINALIZE_TIMEOUT) cannot be aborted.
+    Returns True if the upload was aborted by this call.
+    """
+    with transaction.atomic():
+        upload = AudioUpload.objects.select_for_update().get(pk=upload.pk)
+
+        if upload.status == AudioUpload.Status.ABORTED:
+            return False
+        stale = (upload.status == AudioUpload.Status.FINALIZING
+                 and upload.updated_at < timezone.now() - FINALIZE_TIMEOUT)
+        if upload.status != AudioUpload.Status.RECEIVING and not stale:
+            raise ValueError(f"Upload {upload.upload_id} is {upload.status}")
+
+        upload.status = AudioUpload.Status.ABORTED
+        upload.save(update_fields=['status', 'updated_at'])
+
+    _delete_chunks(upload)
+    logger.info(f"Aborted upload {upload.upload_id} after {upload.next_sequence} chunks")
+    return True
+
+
+def reap_abandoned_uploads(now=None):
+    """Abort uploads whose client stopped sending chunks ABANDONED_AFTER ago; returns how many"""
+    cutoff = (now or timezone.now()) - ABANDONED_AFTER
+    abandoned = AudioUpload.objects.filter(
+        status__in=[AudioUpload.Status.RECEIVING, AudioUpload.Status.FINALIZING],
+        updated_at__lt=cutoff
+    )
+
+    reaped = 0
+    for upload in abandoned.iterator():
+        try:
+            reaped += abort_upload(upload)
+        except ValueError:
+            continue  # Finalized or claimed since the query ran
+    return reaped
+
+
+def finalize_upload(upload):
+    """
+    Stitch all stored chunks into a single AudioRecording.
+
+    The row lock is only held to claim the upload (status FINALIZING); stitching and
+    storing happen outside any transaction and the recording is committed in a second,
+    short one. A claim left behind by a crashed worker can be retaken after
+    FINALIZE_TIMEOUT.
+    """
+    upload, recording = _claim_for_finalize(upload)
+    if recording is not None:
+        return recording
+
+    recording = AudioRecording(
+        meeting=upload.meeting,
+        participant=upload.participant,
+        format=upload.format,
+    )
+    try:
+        # Spool chunks to a local temp file one at a time, then hand it to storage
+        with tempfile.TemporaryFile() as stitched:
+            for sequence in range(upload.next_sequence):
+                with default_storage.open(upload.chunk_path(sequence), 'rb') as chunk:
+                    while True:
+                        data = chunk.read(STITCH_BUFFER_SIZE)
+                        if not data:
+                            break
+                        stitched.write(data)
+
+            recording.file_size = stitched.tell()
+            stitched.seek(0)
+            recording.audio_file.save(f"recording_{upload.upload_id}.{upload.format}", File(stitched), save=False)
+    except Exception:
+        _release_claim(upload)
+        raise
+
+    try:
+        with transaction.atomic():
+            recording.save()
+            upload.recording = recording
+            upload.status = AudioUpload.Status.FINALIZED
+            upload.save(update_fields=['recording', 'status', 'updated_at'])
+    except Exception:
+        # Nothing references the stored file once the transaction rolled back
+        recording.audio_file.delete(save=False)
+        _release_claim(upload)
+        raise
+
+    _delete_chunks(upload)
+
+    logger.info(f"Finalized upload {upload.upload_id}: {upload.next_sequence} chunks, "
+                f"{recording.file_size / 1024:.1f} KB")
+    return recording
+
+
+def _claim_for_finalize(upload):
+    """
+    Lock the upload just long enough to mark it FINALIZING.
+    Returns (upload, None) once claimed, or (upload, recording) if it was already finalized.
+    """
+    with transaction.atomic():
+        upload = AudioUpload.objects.select_for_update().get(pk=upload.pk)
+
+        if upload.status == AudioUpload.Status.FINALIZED:
+            return upload, upload.recording
+        stale = (upload.status == AudioUpload.Status.FINALIZING
+                 and upload.updated_at < timezone.now() - FINALIZE_TIMEOUT)
+        if upload.status != AudioUpload.Status.RECEIVING and not stale:
+            raise ValueError(f"Upload {upload.upload_id} is {upload.status}")
+        if upload.next_sequence == 0:
+            raise ValueError(f"Upload {upload.upload_id} has no chunks")
+
+        upload.status = AudioUpload.Status.FINALIZING
+        upload.save(update_fields=['status', 'updated_at'])
+    return upload, None
+
+
+def _release_claim(upload):
+    """Put a failed finalize back to RECEIVING so the client can retry it"""
+    AudioUpload.objects.filter(pk=upload.pk, status=AudioUpload.Status.FINALIZING).update(
+        status=AudioUpload.Status.RECEIVING, updated_at=timezone.now()
+    )
+
+
+def _delete_chunks(upload):
+    """Remove stored chunk files after a successful stitch or an abort"""
+    # One past next_sequence: a chunk may have been stored but never accepted
+    for sequence in range(upload.next_sequence + 1):
+        try:
+            default_storage.delete(upload.chunk_path(sequence))
+        except Exception as e:
+            logger.warning(f"Could not delete chunk {sequence} of upload {upload.upload_id}: {e}")
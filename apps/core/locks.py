@@ -0,0 +1,37 @@
+"""
+Cache-backed locks for work that must not run twice at once across workers.
+Each lock stores a random token, so only its holder can extend or release it: if a lock
+expired mid-run and another worker took it over, the first worker leaves it alone.
+"""
+import secrets
+import time
+from django.core.cache import cache
+
+
+class CacheLock:
+    """Token-owned lock on a cache key; extend() it between steps of long work"""
+
+    def __init__(self, key, timeout):
+        self.key = key
+        self.timeout = timeout
+        self.token = secrets.token_hex(16)
+
+    def acquire(self, wait=0):
+        """True once the lock is held, polling for up to `wait` seconds"""
+        deadline = time.monotonic() + wait
+        while not cache.add(self.key, self.token, timeout=self.timeout):
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(1)
+        return True
+
+    def is_held(self):
+        return cache.get(self.key) == self.token
+
+    def extend(self):
+        """Restart the timeout; False if the lock expired and was lost"""
+        return self.is_held() and cache.touch(self.key, self.timeout)
+
+    def release(self):
+        if self.is_held():
+            cache.delete(self.key)
@@ -0,0 +1,80 @@
+"""
+Benchmark SendGridBackend throughput: one request per message vs. batch mode.
+Run: python manage.py benchmark_sendgrid [--recipients 1000] [--concurrency 4] [--latency-ms 80]
+
+Sends to an in-process fake SendGrid server unless --api-host points at one started with
+run_fake_sendgrid_server; refuses to target the real API.
+"""
+
+import time
+from django.core.mail import EmailMultiAlternatives
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+from apps.core.sendgrid_backend import SendGridBackend
+from .run_fake_sendgrid_server import start_fake_sendgrid_server
+
+
+def build_messages(count, templates=1):
+    """Notification-style messages: a few shared templates, one recipient each"""
+    messages = []
+    for i in range(count):
+        template = i % templates
+        message = EmailMultiAlternatives(
+            subject=f"Your meeting minutes are ready ({template})",
+            body=f"The minutes for meeting {template} are ready to view.",
+            from_email='noreply@huddle.spot',
+            to=[f"attendee{i}@example.com"],
+        )
+        message.attach_alternative(f"<p>The minutes for meeting {template} are ready to view.</p>", 'text/html')
+        messages.append(message)
+    return messages
+
+
+class Command(BaseCommand):
+    help = 'Compare messages/second for per-message sends vs. batched multi-personalization sends'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--recipients', type=int, default=1000)
+        parser.add_argument('--templates', type=int, default=1, help='Distinct message contents to spread recipients over')
+        parser.add_argument('--concurrency', type=int, default=4, help='Parallel requests in batch mode')
+        parser.add_argument('--batch-size', type=int, default=100, help='Personalizations per request')
+        parser.add_argument('--latency-ms', type=float, default=80.0, help='Fake server round-trip time')
+        parser.add_argument('--api-host', default=None, help='Use an already running fake server')
+
+    def handle(self, *args, **options):
+        api_host = options['api_host']
+        server = None
+        if api_host is None:
+            server = start_fake_sendgrid_server(latency=options['latency_ms'] / 1000)
+            api_host = server.url
+        elif 'sendgrid.com' in api_host:
+            raise CommandError('Refusing to benchmark against the real SendGrid API')
+
+        messages = build_messages(options['recipients'], options['templates'])
+        self.stdout.write(
+            f"{len(messages)} messages over {options['templates']} template(s) -> {api_host}"
+        )
+
+        with override_settings(SENDGRID_API_KEY='benchmark', SENDGRID_MAX_PERSONALIZATIONS=options['batch_size']):
+            runs = [
+                ('Per message', SendGridBackend(api_host=api_host, batch=False)),
+                (f"Batched x{options['concurrency']}",
+                 SendGridBackend(api_host=api_host, batch=True, concurrency=options['concurrency'])),
+            ]
+            results = []
+            for label, backend in runs:
+                if server:
+                    server.reset_stats()
+                start = time.perf_counter()
+                sent = backend.send_messages(messages)
+                seconds = time.perf_counter() - start
+                results.append(seconds)
+                requests = f"{server.requests:6d} requests" if server else ''
+                rate = sent / seconds if seconds else float('inf')
+                self.stdout.write(f"  {label:<14} {sent:6d} sent {requests} {seconds:8.2f}s  {rate:10.0f} messages/s")
+
+        if server:
+            server.shutdown()
+            server.server_close()
+        if results[1] > 0:
+            self.stdout.write(self.style.SUCCESS(f"Speedup: {results[0] / results[1]:.1f}x"))
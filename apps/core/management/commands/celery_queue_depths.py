@@ -0,0 +1,17 @@
+"""
+Show pending Celery messages per queue and priority lane.
+Run: python manage.py celery_queue_depths
+"""
+
+from django.core.management.base import BaseCommand
+from apps.core.task_queues import LANES, queue_depths
+
+
+class Command(BaseCommand):
+    help = 'Report broker queue depth for the audio, ai, email and default queues'
+
+    def handle(self, *args, **options):
+        lanes = [lane for lane, _ in LANES]
+        self.stdout.write(f"  {'queue':<10}" + ''.join(f"{lane:>8}" for lane in lanes) + f"{'total':>8}")
+        for queue, depths in queue_depths().items():
+            self.stdout.write(f"  {queue:<10}" + ''.join(f"{depths[lane]:>8}" for lane in lanes) + f"{depths['total']:>8}")
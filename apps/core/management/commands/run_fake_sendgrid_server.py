@@ -0,0 +1,100 @@
+"""
+Local stand-in for SendGrid's v3 mail send API, for development and throughput benchmarks.
+Run: python manage.py run_fake_sendgrid_server [--port 8766] [--latency-ms 80]
+Then set SENDGRID_API_HOST=http://localhost:8766 (any SENDGRID_API_KEY works).
+
+Accepts POST /v3/mail/send with keep-alive, answers 202 after the configured latency and
+counts requests and personalizations; nothing is delivered.
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from django.core.management.base import BaseCommand
+
+
+class FakeSendGridServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, latency=0.0):
+        super().__init__(address, FakeSendGridHandler)
+        self.latency = latency
+        self.requests = 0
+        self.personalizations = 0
+        self.stats_lock = threading.Lock()
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def reset_stats(self):
+        with self.stats_lock:
+            self.requests = 0
+            self.personalizations = 0
+
+
+class FakeSendGridHandler(BaseHTTPRequestHandler):
+    # HTTP/1.1 so clients can reuse the connection
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        if self.path != '/v3/mail/send':
+            return self._respond(404, {'errors': [{'message': 'Not found'}]})
+        if not self.headers.get('Authorization', '').startswith('Bearer '):
+            return self._respond(401, {'errors': [{'message': 'Missing API key'}]})
+
+        try:
+            personalizations = json.loads(body).get('personalizations') or []
+        except ValueError:
+            return self._respond(400, {'errors': [{'message': 'Invalid JSON'}]})
+        if not personalizations or len(personalizations) > 1000:
+            return self._respond(400, {'errors': [{'message': 'Between 1 and 1000 personalizations required'}]})
+
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        with self.server.stats_lock:
+            self.server.requests += 1
+            self.server.personalizations += len(personalizations)
+        self._respond(202)
+
+    def _respond(self, status, payload=None):
+        body = json.dumps(payload).encode() if payload else b''
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_fake_sendgrid_server(host='127.0.0.1', port=0, latency=0.0):
+    """Serve in a background thread; port 0 picks a free port (see server.url)"""
+    server = FakeSendGridServer((host, port), latency=latency)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+class Command(BaseCommand):
+    help = 'Run a local fake SendGrid mail send API that accepts and counts messages'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', default='127.0.0.1')
+        parser.add_argument('--port', type=int, default=8766)
+        parser.add_argument('--latency-ms', type=float, default=80.0,
+                            help='Simulated API round-trip time per request')
+
+    def handle(self, *args, **options):
+        server = FakeSendGridServer((options['host'], options['port']), latency=options['latency_ms'] / 1000)
+        self.stdout.write(self.style.SUCCESS(f"Fake SendGrid server listening on {server.url}"))
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            self.stdout.write(f"Handled {server.requests} requests, {server.personalizations} personalizations")
@@ -1,79 +1,246 @@
 """SendGrid email backend for Django"""
 import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import httpx
+from django.core.exceptions import ValidationError
 from django.core.mail.backends.base import BaseEmailBackend
+from django.core.validators import validate_email
 from django.conf import settings
-from sendgrid import SendGridAPIClient
-from sendgrid.helpers.mail import Mail, From, To, Content
-import os
+from sendgrid.helpers.mail import Mail, From, To, Content, Personalization, Substitution
 
 logger = logging.getLogger(__name__)
 
+MAIL_SEND_PATH = '/v3/mail/send'
+ACCEPTED_STATUSES = (200, 202)
+
 
 class SendGridBackend(BaseEmailBackend):
-    """Email backend using SendGrid API"""
-    
-    def __init__(self, **kwargs):
-        super().__init__(**kwargs)
+    """
+    Email backend using SendGrid API.
+
+    Requests go over a persistent HTTP session shared by every backend instance in the
+    process (Django builds a new backend for each send_mail call). In batch mode
+    (SENDGRID_BATCH_ENABLED) send_messages groups messages that share a sender and
+    content into multi-personalization requests and sends up to SENDGRID_BATCH_CONCURRENCY
+    of them in parallel.
+    """
+
+    _sessions = {}
+    _sessions_lock = threading.Lock()
+
+    def __init__(self, fail_silently=False, api_host=None, batch=None, concurrency=None, **kwargs):
+        super().__init__(fail_silently=fail_silently, **kwargs)
         self.api_key = getattr(settings, 'SENDGRID_API_KEY', None) or os.getenv('SENDGRID_API_KEY')
-        self.client = None
-        if self.api_key:
-            self.client = SendGridAPIClient(api_key=self.api_key)
-        
+        self.api_host = (api_host or getattr(settings, 'SENDGRID_API_HOST', 'https://api.sendgrid.com')).rstrip('/')
+        self.batch = getattr(settings, 'SENDGRID_BATCH_ENABLED', False) if batch is None else batch
+        self.concurrency = concurrency or getattr(settings, 'SENDGRID_BATCH_CONCURRENCY', 4)
+        self.max_personalizations = getattr(settings, 'SENDGRID_MAX_PERSONALIZATIONS', 1000)
+
+    @property
+    def session(self):
+        # One connection pool per process and host; keyed by pid so forked workers never share sockets
+        key = (os.getpid(), self.api_host, self.api_key)
+        session = self._sessions.get(key)
+        if session is None:
+            with self._sessions_lock:
+                session = self._sessions.get(key)
+                if session is None:
+                    session = httpx.Client(
+                        base_url=self.api_host,
+                        headers={'Authorization': f'Bearer {self.api_key}'},
+                        timeout=getattr(settings, 'SENDGRID_TIMEOUT', 30),
+                        limits=httpx.Limits(max_connections=max(self.concurrency, 10)),
+                    )
+                    self._sessions[key] = session
+        return session
+
     def send_messages(self, email_messages):
         """Send multiple email messages"""
-        if not self.client:
+        if not email_messages:
+            return 0
+        if not self.api_key:
             logger.error("SendGrid API key not configured")
             return 0
-        
-        sent_count = 0
+
+        if not self.batch:
+            return sum(1 for message in email_messages if self._send_message(message))
+
+        groups = {}
+        batches = []
         for message in email_messages:
-            if self._send_message(message):
-                sent_count += 1
-        
+            if not all([self._is_valid_address(email, message.subject) for email in message.to]):
+                continue
+            key = self._batch_key(message)
+            if key is None:
+                batches.append([message])
+            else:
+                groups.setdefault(key, []).append(message)
+
+        for messages in groups.values():
+            batches.extend(self._chunk(messages))
+
+        sent_count = sum(self._send_batches(batches, self._build_batch_mail))
+        logger.info(f"SendGrid sent {sent_count}/{len(email_messages)} messages in {len(batches)} requests")
         return sent_count
-    
+
+    def send_personalized(self, from_email, subject, body, html_body, recipients):
+        """
+        Send one message to many recipients, SENDGRID_MAX_PERSONALIZATIONS per API call.
+        recipients is a list of (email, substitutions) pairs; SendGrid replaces each
+        substitution key in the subject and content with that recipient's value.
+        Returns one accepted/rejected flag per recipient, in order.
+        Invalid addresses are dropped up front (see _send_batches for rejected batches).
+        """
+        if not self.api_key:
+            logger.error("SendGrid API key not configured")
+            return [False] * len(recipients)
+
+        def build(batch):
+            mail = Mail(
+                from_email=From(from_email),
+                subject=subject,
+                plain_text_content=body or None,
+                html_content=html_body or None,
+            )
+            for email, substitutions in batch:
+                personalization = Personalization()
+                personalization.add_to(To(email))
+                for key, value in substitutions.items():
+                    personalization.add_substitution(Substitution(key, value))
+                mail.add_personalization(personalization)
+            return mail
+
+        valid = [
+            (index, email, substitutions)
+            for index, (email, substitutions) in enumerate(recipients)
+            if self._is_valid_address(email, subject)
+        ]
+        results = self._send_batches(
+            self._chunk(valid),
+            lambda batch: build([(email, substitutions) for _, email, substitutions in batch])
+        )
+
+        accepted = [False] * len(recipients)
+        for (index, _, _), ok in zip(valid, results):
+            accepted[index] = ok
+        return accepted
+
+    def _send_batches(self, batches, build):
+        """
+        POST one request per batch, build(batch) making it; the accepted flag of every item, in order.
+        SendGrid rejects a whole request for one bad personalization, so the items of a batch
+        rejected with a 4xx are resent one at a time.
+        """
+        statuses = self._post_all([build(batch) for batch in batches], self._request)
+
+        items = [item for batch in batches for item in batch]
+        accepted = []
+        retry = []
+        for batch, status_code in zip(batches, statuses):
+            if status_code and 400 <= status_code < 500 and len(batch) > 1:
+                retry.extend(range(len(accepted), len(accepted) + len(batch)))
+            accepted.extend([status_code in ACCEPTED_STATUSES] * len(batch))
+
+        if retry:
+            logger.info(f"Resending {len(retry)} items of rejected batches one at a time")
+            results = self._post_all([build([items[index]]) for index in retry])
+            for index, ok in zip(retry, results):
+                accepted[index] = ok
+        return accepted
+
+    def _chunk(self, items):
+        return [items[start:start + self.max_personalizations]
+                for start in range(0, len(items), self.max_personalizations)]
+
+    @staticmethod
+    def _is_valid_address(email, subject):
+        try:
+            validate_email(email)
+            return True
+        except ValidationError:
+            logger.warning(f"Not sending '{subject}' to invalid address {email!r}")
+            return False
+
+    @staticmethod
+    def _batch_key(message):
+        """Messages with equal keys differ only in their To recipients; None means send on its own"""
+        if message.cc or message.bcc or message.attachments or message.extra_headers or message.reply_to:
+            return None
+        alternatives = tuple(tuple(alternative) for alternative in getattr(message, 'alternatives', []))
+        return (message.from_email, message.subject, message.body, alternatives)
+
+    def _build_batch_mail(self, messages):
+        """One request for messages sharing a _batch_key, a personalization each; a lone message as is"""
+        if len(messages) == 1:
+            return self._build_mail(messages[0], [To(email) for email in messages[0].to])
+
+        mail = self._build_mail(messages[0])
+        for message in messages:
+            personalization = Personalization()
+            for email in message.to:
+                personalization.add_to(To(email))
+            mail.add_personalization(personalization)
+        return mail
+
+    def _build_mail(self, message, to_emails=None):
+        """SendGrid Mail with the message's sender, subject and content"""
+        mail = Mail(
+            from_email=From(message.from_email),
+            to_emails=to_emails,
+            subject=message.subject,
+        )
+
+        # Add content
+        if hasattr(message, 'body') and message.body:
+            mail.content = Content("text/plain", message.body)
+
+        # Add HTML content if available
+        if hasattr(message, 'alternatives') and message.alternatives:
+            for alternative in message.alternatives:
+                if alternative[1] == 'text/html':
+                    if mail.content:
+                        # Add HTML as alternative
+                        mail.content = [
+                            Content("text/plain", message.body),
+                            Content("text/html", alternative[0])
+                        ]
+                    else:
+                        mail.content = Content("text/html", alternative[0])
+        return mail
+
     def _send_message(self, message):
         """Send a single email message"""
         try:
-            # Create SendGrid mail object
-            mail = Mail(
-                from_email=From(message.from_email),
-                to_emails=[To(email) for email in message.to],
-                subject=message.subject,
-            )
-            
-            # Add content
-            if hasattr(message, 'body') and message.body:
-                mail.content = Content("text/plain", message.body)
-            
-            # Add HTML content if available
-            if hasattr(message, 'alternatives') and message.alternatives:
-                for alternative in message.alternatives:
-                    if alternative[1] == 'text/html':
-                        if mail.content:
-                            # Add HTML as alternative
-                            mail.content = [
-                                Content("text/plain", message.body),
-                                Content("text/html", alternative[0])
-                            ]
-                        else:
-                            mail.content = Content("text/html", alternative[0])
-            
-            # Send email
-            logger.info(f"Sending email via SendGrid to {message.to}")
-            logger.info(f"Subject: {message.subject}")
-            logger.info(f"From: {message.from_email}")
-            
-            response = self.client.send(mail)
-            
-            if response.status_code in [200, 202]:
-                logger.info(f"✅ Email sent successfully via SendGrid. Status: {response.status_code}")
-                return True
-            else:
-                logger.error(f"❌ SendGrid API error. Status: {response.status_code}, Body: {response.body}")
-                return False
-                
+            mail = self._build_mail(message, [To(email) for email in message.to])
+            logger.debug(f"Sending email via SendGrid to {message.to}: {message.subject}")
+            return self._post(mail)
         except Exception as e:
             logger.error(f"❌ Failed to send email via SendGrid: {str(e)}")
             logger.error(f"Exception type: {type(e).__name__}")
-            return False
\ No newline at end of file
+            return False
+
+    def _request(self, mail):
+        """POST one mail/send request; the response status code, or None if the request failed"""
+        try:
+            response = self.session.post(MAIL_SEND_PATH, json=mail.get())
+        except httpx.HTTPError as e:
+            logger.error(f"❌ SendGrid request failed: {e}")
+            return None
+
+        if response.status_code not in ACCEPTED_STATUSES:
+            logger.error(f"❌ SendGrid API error. Status: {response.status_code}, Body: {response.text}")
+        return response.status_code
+
+    def _post(self, mail):
+        """POST one mail/send request; True when SendGrid accepted it"""
+        return self._request(mail) in ACCEPTED_STATUSES
+
+    def _post_all(self, mails, post=None):
+        """Send requests up to `concurrency` at a time; one _post (or `post`) result per mail, in order"""
+        post = post or self._post
+        if len(mails) <= 1 or self.concurrency <= 1:
+            return [post(mail) for mail in mails]
+        with ThreadPoolExecutor(max_workers=min(self.concurrency, len(mails))) as executor:
+            return list(executor.map(post, mails))
@@ -0,0 +1,91 @@
+"""
+Buffered access-token accounting.
+Public page views increment a Redis hash instead of writing the token row; the
+flush_token_access_counts beat task applies the totals with one F() update per token,
+removing each token's buffered count as soon as it is applied.
+"""
+import logging
+import time
+from datetime import datetime, timezone as dt_timezone
+import redis
+from django.conf import settings
+from django.db.models import F
+
+logger = logging.getLogger(__name__)
+
+COUNTS_KEY = 'token_access:counts'
+LAST_SEEN_KEY = 'token_access:last_seen'
+FLUSHING_SUFFIX = ':flushing'
+
+_client = None
+
+
+def get_redis():
+    global _client
+    if _client is None:
+        timeout = getattr(settings, 'ACCESS_TRACKING_REDIS_TIMEOUT', 0.5)
+        _client = redis.Redis.from_url(
+            settings.ACCESS_TRACKING_REDIS_URL,
+            socket_timeout=timeout,
+            socket_connect_timeout=timeout,
+        )
+    return _client
+
+
+def buffer_access(token):
+    """
+    Count one access for a token without touching the database.
+    Returns False if Redis is unavailable so the caller can write directly.
+    """
+    try:
+        pipe = get_redis().pipeline()
+        pipe.hincrby(COUNTS_KEY, token.pk, 1)
+        pipe.hset(LAST_SEEN_KEY, token.pk, time.time())
+        pipe.execute()
+        return True
+    except redis.RedisError as e:
+        logger.warning(f"Access buffer unavailable, recording token {token.pk} directly: {e}")
+        return False
+
+
+def flush_access_counts():
+    """Apply buffered counts to MeetingAccessToken rows; returns the number of tokens updated"""
+    from .models import MeetingAccessToken
+
+    client = get_redis()
+    counts_snapshot = COUNTS_KEY + FLUSHING_SUFFIX
+    last_seen_snapshot = LAST_SEEN_KEY + FLUSHING_SUFFIX
+
+    # A previous flush may have died after renaming; finish that snapshot first
+    if not client.exists(counts_snapshot):
+        if not client.exists(COUNTS_KEY):
+            return 0
+        # RENAME is atomic: new accesses land in a fresh hash while we drain the snapshot
+        pipe = client.pipeline()
+        pipe.rename(COUNTS_KEY, counts_snapshot)
+        pipe.rename(LAST_SEEN_KEY, last_seen_snapshot)
+        try:
+            pipe.execute()
+        except redis.ResponseError:
+            # Nothing was buffered between the EXISTS check and the rename
+            return 0
+
+    counts = client.hgetall(counts_snapshot)
+    last_seen = client.hgetall(last_seen_snapshot)
+
+    # Drop each token from the snapshot right after its update: if the flush dies midway,
+    # the next run resumes with the remaining tokens instead of re-applying every count
+    for token_id, count in counts.items():
+        seen = last_seen.get(token_id)
+        update = {'access_count': F('access_count') + int(count)}
+        if seen:
+            update['last_accessed'] = datetime.fromtimestamp(float(seen), tz=dt_timezone.utc)
+        MeetingAccessToken.objects.filter(pk=int(token_id)).update(**update)
+        client.hdel(counts_snapshot, token_id)
+
+    client.delete(counts_snapshot, last_seen_snapshot)
+
+    if counts:
+        logger.info(f"Flushed buffered access counts for {len(counts)} tokens "
+                    f"({sum(int(c) for c in counts.values())} accesses)")
+    return len(counts)
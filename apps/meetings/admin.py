@@ -3,8 +3,8 @@ from django.http import HttpResponseRedirect
 from django.contrib import messages
 from django.urls import path
 from django.shortcuts import render, get_object_or_404
-from .models import Meeting, MeetingParticipant
-from .email_utils import send_voice_setup_invitation, send_meeting_invitation
+from .models import Meeting, MeetingParticipant, InvitationBatch
+from .invitations import queue_invitations
 
 @admin.register(Meeting)
 class MeetingAdmin(admin.ModelAdmin):
@@ -41,44 +41,46 @@ class MeetingAdmin(admin.ModelAdmin):
         return obj.known_speakers.count()
     known_count.short_description = 'Known'
     
-    def send_voice_invitations(self, request, queryset):
-        """Send voice setup invitations to expected speakers"""
-        total_sent = 0
+    def _queue_invitations(self, request, meetings_and_emails):
+        """One batch job per meeting; tokens are provisioned in bulk by the email worker"""
+        total_queued = 0
         total_failed = 0
         
-        for meeting in queryset:
-            new_speakers = meeting.get_new_speakers()
-            for speaker in new_speakers:
-                success, message = send_voice_setup_invitation(meeting, speaker['email'])
-                if success:
-                    total_sent += 1
-                else:
-                    total_failed += 1
+        for meeting, emails in meetings_and_emails:
+            batch = queue_invitations(meeting, emails, requested_by=request.user)
+            if batch is None:
+                continue
+            if batch.status == InvitationBatch.Status.FAILED:
+                total_failed += len(batch.emails)
+            else:
+                total_queued += len(batch.emails)
+        
+        return total_queued, total_failed
+    
+    def send_voice_invitations(self, request, queryset):
+        """Send voice setup invitations to expected speakers"""
+        total_queued, total_failed = self._queue_invitations(request, (
+            (meeting, [speaker['email'] for speaker in meeting.get_new_speakers()])
+            for meeting in queryset
+        ))
         
-        if total_sent > 0:
-            messages.success(request, f"Voice setup invitations sent to {total_sent} speakers")
+        if total_queued > 0:
+            messages.success(request, f"Sending voice setup invitations to {total_queued} speakers")
         if total_failed > 0:
-            messages.warning(request, f"Failed to send {total_failed} invitations")
+            messages.warning(request, f"Failed to queue {total_failed} invitations")
     
     send_voice_invitations.short_description = "Send voice setup invitations"
     
     def send_meeting_invitations(self, request, queryset):
         """Send meeting invitations to expected speakers"""
-        total_sent = 0
-        total_failed = 0
-        
-        for meeting in queryset:
-            for email in meeting.expected_speakers:
-                success, message = send_voice_setup_invitation(meeting, email)
-                if success:
-                    total_sent += 1
-                else:
-                    total_failed += 1
+        total_queued, total_failed = self._queue_invitations(request, (
+            (meeting, meeting.expected_speakers) for meeting in queryset
+        ))
         
-        if total_sent > 0:
-            messages.success(request, f"Meeting invitations sent to {total_sent} attendees")
+        if total_queued > 0:
+            messages.success(request, f"Sending meeting invitations to {total_queued} attendees")
         if total_failed > 0:
-            messages.warning(request, f"Failed to send {total_failed} invitations")
+            messages.warning(request, f"Failed to queue {total_failed} invitations")
     
     send_meeting_invitations.short_description = "Send meeting invitations with voice setup"
 
@@ -88,3 +90,10 @@ class MeetingParticipantAdmin(admin.ModelAdmin):
     list_filter = ['is_recording', 'created_at']
     search_fields = ['meeting__meeting_id', 'user__username', 'session_id']
 
+
+@admin.register(InvitationBatch)
+class InvitationBatchAdmin(admin.ModelAdmin):
+    list_display = ['meeting', 'status', 'sent_count', 'failed_count', 'requested_by', 'created_at', 'completed_at']
+    list_filter = ['status', 'created_at']
+    search_fields = ['meeting__meeting_id', 'meeting__title']
+    readonly_fields = ['created_at', 'updated_at', 'completed_at']
@@ -8,6 +8,7 @@ from django.utils import timezone
 from datetime import timedelta
 from .models import Meeting
 from apps.core.models import SpeakerProfile
+from apps.audio.search import is_search_available, matching_meetings_q
 
 def login_view(request):
     """Modern login page for admins"""
@@ -78,10 +79,12 @@ def meetings_list_view(request):
     # Search
     search = request.GET.get('search', '')
     if search:
-        meetings = meetings.filter(
-            Q(title__icontains=search) |
-            Q(meeting_id__icontains=search)
-        )
+        title_or_id = Q(title__icontains=search) | Q(meeting_id__icontains=search)
+        if is_search_available():
+            # Also match meetings whose transcript or summary mentions the terms
+            meetings = meetings.filter(title_or_id | matching_meetings_q(search, request.user))
+        else:
+            meetings = meetings.filter(title_or_id)
     
     # Filter by status
     status = request.GET.get('status', '')
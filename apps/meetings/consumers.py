@@ -153,6 +153,14 @@ class MeetingConsumer(AsyncWebsocketConsumer):
     async def mic_status_message(self, event):
         await self.send(text_data=json.dumps(event))
 
+    async def transcript_update(self, event):
+        """Final live transcription segment"""
+        await self.send(text_data=json.dumps(event))
+
+    async def transcript_partial(self, event):
+        """Interim live transcription result - replaced by the next partial or final"""
+        await self.send(text_data=json.dumps(event))
+
     @database_sync_to_async
     def get_or_create_participant(self, meeting_id, role, device_type):
         """Get or create MeetingParticipant record for current user"""
@@ -0,0 +1,115 @@
+"""
+Email rendering for many recipients of the same meeting.
+A templates/emails/* template is compiled once per process. MeetingEmail renders it once
+per meeting with placeholder tokens for the recipient fields (name, setup URL, magic links)
+and splits the output at those tokens, so each recipient's copy is a string join. With
+the SendGrid backend the placeholder version is sent as-is and SendGrid substitutes.
+
+Recipient fields must be output unfiltered in the templates ({{ recipient_name }}, not
+{{ recipient_name|upper }}) so their placeholders survive rendering.
+"""
+import logging
+import re
+from functools import lru_cache
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.template import Context, TemplateDoesNotExist
+from django.template.loader import get_template
+from django.utils.html import escape
+
+logger = logging.getLogger(__name__)
+
+
+def placeholder(field, html=False):
+    # Separate tokens for the HTML part, whose values must be escaped
+    return f"-{field}{'_html' if html else ''}-"
+
+
+@lru_cache(maxsize=None)
+def get_email_template(filename):
+    """Compiled templates/emails/<filename>, or None if the email has no such part"""
+    try:
+        return get_template(f'emails/{filename}').template
+    except TemplateDoesNotExist:
+        return None
+
+
+class MeetingEmail:
+    """One email type rendered once for a meeting, ready to personalize per recipient"""
+
+    def __init__(self, name, context, recipient_fields, subject):
+        self.subject = subject
+        self.fields = tuple(recipient_fields)
+        self.text_template = self._render(f'{name}.txt', context, html=False)
+        self.html_template = self._render(f'{name}.html', context, html=True)
+        self._text_parts = self._split(self.text_template, html=False)
+        self._html_parts = self._split(self.html_template, html=True)
+
+    def _render(self, filename, context, html):
+        template = get_email_template(filename)
+        if template is None:
+            return ''
+        context = {**context, **{field: placeholder(field, html) for field in self.fields}}
+        # Plain-text parts are not HTML-escaped
+        return template.render(Context(context, autoescape=html))
+
+    def _split(self, content, html):
+        # Alternating literal text and field names: [text, field, text, field, ..., text]
+        if not content or not self.fields:
+            return [content]
+        tokens = '|'.join(re.escape(placeholder(field, html)) for field in self.fields)
+        parts = re.split(f'({tokens})', content)
+        lookup = {placeholder(field, html): field for field in self.fields}
+        return [lookup[part] if i % 2 else part for i, part in enumerate(parts)]
+
+    @staticmethod
+    def _join(parts, values):
+        return ''.join(values[part] if i % 2 else part for i, part in enumerate(parts))
+
+    def render(self, values):
+        """(subject, text, html) for one recipient; values maps each recipient field to its value"""
+        html_values = {field: escape(value) for field, value in values.items()}
+        return self.subject, self._join(self._text_parts, values), self._join(self._html_parts, html_values)
+
+    def substitutions(self, values):
+        """SendGrid substitutions for one recipient of text_template/html_template"""
+        substitutions = {}
+        for field, value in values.items():
+            substitutions[placeholder(field)] = value
+            substitutions[placeholder(field, html=True)] = escape(value)
+        return substitutions
+
+    def send(self, recipients, from_email=None, connection=None):
+        """
+        Send to (email, values) pairs. The SendGrid backend gets the whole list as
+        multi-personalization requests; other backends get one message per recipient
+        over a single connection. Returns one sent flag per recipient, in order.
+        """
+        from_email = from_email or settings.DEFAULT_FROM_EMAIL
+        connection = connection or get_connection()
+
+        if hasattr(connection, 'send_personalized'):
+            return connection.send_personalized(
+                from_email, self.subject, self.text_template, self.html_template,
+                [(email, self.substitutions(values)) for email, values in recipients]
+            )
+
+        sent = []
+        with connection:
+            for email, values in recipients:
+                subject, text_message, html_message = self.render(values)
+                message = EmailMultiAlternatives(
+                    subject=subject,
+                    body=text_message,
+                    from_email=from_email,
+                    to=[email],
+                    connection=connection,
+                )
+                if html_message:
+                    message.attach_alternative(html_message, 'text/html')
+                try:
+                    sent.append(bool(message.send()))
+                except Exception as e:
+                    logger.error(f"Failed to send '{subject}' to {email}: {e}")
+                    sent.append(False)
+        return sent
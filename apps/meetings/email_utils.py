@@ -1,9 +1,10 @@
 """Email utilities for meeting invitations and voice setup"""
 from django.core.mail import send_mail
-from django.template.loader import render_to_string
 from django.conf import settings
 from django.utils import timezone
-from apps.meetings.voice_views import generate_setup_token
+from .email_rendering import MeetingEmail
+from .invitations import recipient_values, voice_setup_email
+from .tokens import ensure_access_tokens, issue_setup_tokens
 from .models import Meeting
 import ssl
 import logging
@@ -50,41 +51,15 @@ def send_voice_setup_invitation(meeting, email, host_name=None):
     
     try:
         # Generate secure token
-        token = generate_setup_token(meeting.meeting_id, email)
-        
-        # Generate voice setup URL
-        setup_url = f"{settings.SITE_URL}/meet/{meeting.meeting_id}/voice-setup/?email={email}&token={token}"
+        token = issue_setup_tokens(meeting.meeting_id, [email])[email]
         
         # Get or create meeting access token for magic links
-        from .models import MeetingAccessToken
-        access_token, created = MeetingAccessToken.objects.get_or_create(
-            meeting=meeting,
-            email=email,
-            defaults={
-                'can_view_transcript': True,
-                'can_view_minutes': True,
-                'can_view_action_items': True
-            }
-        )
+        ensure_access_tokens(meeting, [email])
 
-        # Prepare context for email template
-        context = {
-            'meeting': meeting,
-            'recipient_email': email,
-            'recipient_name': Meeting.extract_name_from_email(email),
-            'host_name': host_name or (meeting.host.get_full_name() if meeting.host else 'Meeting Host'),
-            'setup_url': setup_url,
-            'minutes_link': access_token.get_magic_link('minutes'),
-            'transcript_link': access_token.get_magic_link('transcript'),
-            'actions_link': access_token.get_magic_link('actions'),
-            'expires_days': 7,
-            'site_name': 'Huddle',
-        }
-        
         # Render email content
-        subject = f"Voice Setup Required - {meeting.title or 'Meeting'} ({meeting.meeting_id})"
-        html_message = render_to_string('emails/voice_setup_invitation.html', context)
-        text_message = render_to_string('emails/voice_setup_invitation.txt', context)
+        values = recipient_values(meeting, email, token)
+        setup_url = values['setup_url']
+        subject, text_message, html_message = voice_setup_email(meeting, host_name).render(values)
         
         # Log email details before sending
         logger.info(f"Email subject: {subject}")
@@ -154,18 +129,20 @@ def send_basic_meeting_invitation(meeting, email):
         # Generate meeting join URL
         meeting_url = f"{settings.SITE_URL}/meet/{meeting.meeting_id}/"
         
-        context = {
-            'meeting': meeting,
-            'recipient_email': email,
+        invitation = MeetingEmail(
+            'meeting_invitation',
+            {
+                'meeting': meeting,
+                'host_name': meeting.host.get_full_name() if meeting.host else 'Meeting Host',
+                'meeting_url': meeting_url,
+                'site_name': 'Huddle',
+            },
+            ('recipient_name',),
+            subject=f"Meeting Invitation - {meeting.title or 'Meeting'} ({meeting.meeting_id})",
+        )
+        subject, text_message, html_message = invitation.render({
             'recipient_name': Meeting.extract_name_from_email(email),
-            'host_name': meeting.host.get_full_name() if meeting.host else 'Meeting Host',
-            'meeting_url': meeting_url,
-            'site_name': 'Huddle',
-        }
-        
-        subject = f"Meeting Invitation - {meeting.title or 'Meeting'} ({meeting.meeting_id})"
-        html_message = render_to_string('emails/meeting_invitation.html', context)
-        text_message = render_to_string('emails/meeting_invitation.txt', context)
+        })
         
         send_mail(
             subject=subject,
@@ -183,105 +160,66 @@ def send_basic_meeting_invitation(meeting, email):
 
 def send_meeting_reminder(meeting, email_list, hours_before=2):
     """Send meeting reminder emails"""
-    results = []
-    
-    for email in email_list:
-        try:
-            context = {
-                'meeting': meeting,
-                'recipient_email': email,
-                'recipient_name': Meeting.extract_name_from_email(email),
-                'host_name': meeting.host.get_full_name() if meeting.host else 'Meeting Host',
-                'meeting_url': f"{settings.SITE_URL}/meet/{meeting.meeting_id}/",
-                'hours_before': hours_before,
-                'site_name': 'Huddle',
-            }
-            
-            subject = f"Meeting Reminder - {meeting.title or 'Meeting'} in {hours_before} hours"
-            html_message = render_to_string('emails/meeting_reminder.html', context)
-            text_message = render_to_string('emails/meeting_reminder.txt', context)
-            
-            send_mail(
-                subject=subject,
-                message=text_message,
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                recipient_list=[email],
-                html_message=html_message,
-                fail_silently=False
-            )
-            
-            results.append({
-                'email': email,
-                'success': True,
-                'message': f"Reminder sent to {email}"
-            })
-            
-        except Exception as e:
-            results.append({
-                'email': email,
-                'success': False,
-                'message': f"Failed to send reminder to {email}: {str(e)}"
-            })
-
-    return results
-
-
-def send_meeting_complete_notification(meeting, email):
-    """Send magic links to participant after meeting is complete"""
-    debug_email_config()
-
-    logger.info(f"=== SENDING MEETING COMPLETE NOTIFICATION ===")
-    logger.info(f"Meeting: {meeting.meeting_id} - {meeting.title}")
-    logger.info(f"Recipient: {email}")
-
-    try:
-        # Get access token for this participant
-        from .models import MeetingAccessToken
-        try:
-            access_token = MeetingAccessToken.objects.get(
-                meeting=meeting,
-                email=email
-            )
-        except MeetingAccessToken.DoesNotExist:
-            logger.error(f"No access token found for {email} in meeting {meeting.meeting_id}")
-            return False, "Access token not found"
-
-        if not access_token.is_valid():
-            logger.error(f"Access token for {email} is not valid")
-            return False, "Access token invalid"
-
-        # Prepare context for email template
-        context = {
+    reminder = MeetingEmail(
+        'meeting_reminder',
+        {
             'meeting': meeting,
-            'recipient_email': email,
-            'recipient_name': Meeting.extract_name_from_email(email),
             'host_name': meeting.host.get_full_name() if meeting.host else 'Meeting Host',
-            'minutes_link': access_token.get_magic_link('minutes'),
-            'transcript_link': access_token.get_magic_link('transcript'),
-            'actions_link': access_token.get_magic_link('actions'),
+            'meeting_url': f"{settings.SITE_URL}/meet/{meeting.meeting_id}/",
+            'hours_before': hours_before,
             'site_name': 'Huddle',
-        }
-
-        # Render email templates
-        subject = f"Meeting Complete: {meeting.title or 'Team Meeting'}"
-        html_message = render_to_string('emails/meeting_complete_notification.html', context)
+        },
+        ('recipient_name',),
+        subject=f"Meeting Reminder - {meeting.title or 'Meeting'} in {hours_before} hours",
+    )
 
-        # Send email
-        send_mail(
-            subject=subject,
-            message="",  # Text version not needed for this simple notification
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=[email],
-            html_message=html_message,
-            fail_silently=False
-        )
+    try:
+        sent = reminder.send([
+            (email, {'recipient_name': Meeting.extract_name_from_email(email)}) for email in email_list
+        ])
+    except Exception as e:
+        return [
+            {'email': email, 'success': False, 'message': f"Failed to send reminder to {email}: {str(e)}"}
+            for email in email_list
+        ]
 
-        logger.info(f"✅ Meeting completion notification sent to {email}")
-        print(f"✅ NOTIFICATION SENT: {email}")
+    return [
+        {
+            'email': email,
+            'success': success,
+            'message': f"Reminder sent to {email}" if success else f"Failed to send reminder to {email}",
+        }
+        for email, success in zip(email_list, sent)
+    ]
 
-        return True, "Notification sent successfully"
 
-    except Exception as e:
-        logger.error(f"Failed to send meeting completion notification to {email}: {str(e)}")
-        print(f"❌ NOTIFICATION FAILED: {email} - {str(e)}")
-        return False, f"Error sending notification: {str(e)}"
\ No newline at end of file
+def meeting_complete_email(meeting):
+    """Completion notification for the meeting, rendered once; recipients differ only in name and magic links"""
+    return MeetingEmail(
+        'meeting_complete_notification',
+        {
+            'meeting': meeting,
+            'host_name': meeting.host.get_full_name() if meeting.host else 'Meeting Host',
+            'site_name': 'Huddle',
+        },
+        ('recipient_name', 'minutes_link', 'transcript_link', 'actions_link'),
+        subject=f"Meeting Complete: {meeting.title or 'Team Meeting'}",
+    )
+
+def meeting_complete_values(access_token):
+    return {
+        'recipient_name': Meeting.extract_name_from_email(access_token.email),
+        'minutes_link': access_token.get_magic_link('minutes'),
+        'transcript_link': access_token.get_magic_link('transcript'),
+        'actions_link': access_token.get_magic_link('actions'),
+    }
+
+def notify_meeting_complete(meeting, access_tokens):
+    """Send the completion notification to every valid token holder at once; returns the number sent"""
+    access_tokens = [token for token in access_tokens if token.is_valid()]
+    if not access_tokens:
+        return 0
+    sent = meeting_complete_email(meeting).send([
+        (token.email, meeting_complete_values(token)) for token in access_tokens
+    ])
+    return sum(1 for success in sent if success)
@@ -0,0 +1,80 @@
+"""
+Cache of rendered public-page fragments.
+Keys include the summary version (its updated_at), so saving a MeetingSummary
+invalidates every fragment built from it; stale keys simply expire. Fragments built
+from other rows as well pass a revision identifying those rows' state.
+"""
+import hashlib
+import logging
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = 'public_fragment'
+STATS_HITS_KEY = f'{KEY_PREFIX}:stats:hits'
+STATS_MISSES_KEY = f'{KEY_PREFIX}:stats:misses'
+
+
+def fragment_key(kind, meeting, summary, viewer_email=None, revision=None):
+    version = summary.version if summary else 0
+    if revision:
+        version = f'{version}.{hashlib.sha256(revision.encode("utf-8")).hexdigest()[:16]}'
+    viewer = hashlib.sha256(viewer_email.lower().encode('utf-8')).hexdigest()[:16] if viewer_email else 'all'
+    return f'{KEY_PREFIX}:{kind}:{meeting.meeting_id}:{version}:{viewer}'
+
+
+def get_or_build_fragment(kind, meeting, summary, build, viewer_email=None, revision=None):
+    """
+    Return the cached fragment, or build() it and cache it.
+    Pass viewer_email only for fragments that differ per viewer, and revision for
+    fragments that also depend on rows other than the summary.
+    """
+    key = fragment_key(kind, meeting, summary, viewer_email, revision)
+
+    try:
+        fragment = cache.get(key)
+    except Exception as e:
+        logger.warning(f"Fragment cache lookup failed for {key}: {e}")
+        return build()
+
+    _record(hit=fragment is not None)
+    if fragment is not None:
+        return fragment
+
+    fragment = build()
+    try:
+        cache.set(key, fragment, timeout=getattr(settings, 'PUBLIC_FRAGMENT_CACHE_TIMEOUT', 24 * 3600))
+    except Exception as e:
+        logger.warning(f"Fragment cache write failed for {key}: {e}")
+    return fragment
+
+
+def stats():
+    """Hit/miss counters for tuning"""
+    hits = misses = 0
+    try:
+        hits = cache.get(STATS_HITS_KEY, 0)
+        misses = cache.get(STATS_MISSES_KEY, 0)
+    except Exception as e:
+        logger.warning(f"Fragment cache: could not read stats: {e}")
+
+    total = hits + misses
+    return {
+        'hits': hits,
+        'misses': misses,
+        'hit_rate': hits / total if total else 0.0,
+    }
+
+
+def reset_stats():
+    cache.delete_many([STATS_HITS_KEY, STATS_MISSES_KEY])
+
+
+def _record(hit):
+    counter = STATS_HITS_KEY if hit else STATS_MISSES_KEY
+    try:
+        cache.add(counter, 0, timeout=None)
+        cache.incr(counter)
+    except Exception:
+        pass
@@ -0,0 +1,126 @@
+"""
+Batched voice setup invitations.
+The invitation is rendered once per meeting (see email_rendering) and each recipient only
+contributes a name and setup link. With the SendGrid backend a whole batch goes out as
+multi-personalization API calls; other backends get one message per recipient over a
+single connection.
+"""
+import logging
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from .email_rendering import MeetingEmail
+from .models import InvitationBatch, Meeting
+from .tokens import ensure_access_tokens, issue_setup_tokens
+
+logger = logging.getLogger(__name__)
+
+# Context fields that differ between recipients of the same meeting's invitation
+RECIPIENT_FIELDS = ('recipient_name', 'setup_url')
+
+
+def voice_setup_email(meeting, host_name=None):
+    """The meeting's voice setup invitation, rendered once for all recipients"""
+    return MeetingEmail(
+        'voice_setup_invitation',
+        {
+            'meeting': meeting,
+            'host_name': host_name or (meeting.host.get_full_name() if meeting.host else 'Meeting Host'),
+            'expires_days': 7,
+            'site_name': 'Huddle',
+        },
+        RECIPIENT_FIELDS,
+        subject=f"Voice Setup Required - {meeting.title or 'Meeting'} ({meeting.meeting_id})",
+    )
+
+
+def recipient_values(meeting, email, token):
+    """Recipient field values for one invitee, given their voice setup token"""
+    return {
+        'recipient_name': Meeting.extract_name_from_email(email),
+        'setup_url': f"{settings.SITE_URL}/meet/{meeting.meeting_id}/voice-setup/?email={email}&token={token}",
+    }
+
+
+def send_voice_setup_batch(meeting, emails, host_name=None):
+    """
+    Send voice setup invitations to many recipients at once.
+    Returns a {email, success, message} result per recipient, in order.
+    """
+    email = voice_setup_email(meeting, host_name)
+    ensure_access_tokens(meeting, emails)
+    setup_tokens = issue_setup_tokens(meeting.meeting_id, emails)
+    recipients = [
+        (address, recipient_values(meeting, address, setup_tokens[address]))
+        for address in emails if address in setup_tokens
+    ]
+
+    accepted = dict(zip((address for address, _ in recipients), email.send(recipients)))
+    return [
+        {
+            'email': address,
+            'success': accepted.get(address, False),
+            'message': (f"Voice setup invitation sent to {address}" if accepted.get(address)
+                        else f"Failed to send invitation to {address}"),
+        }
+        for address in emails
+    ]
+
+
+def queue_invitations(meeting, emails, requested_by=None):
+    """
+    Record an InvitationBatch and hand it to the email worker once the surrounding
+    transaction commits. Returns the batch (None when there is nobody to invite); its
+    results fill in asynchronously.
+    """
+    emails = list(dict.fromkeys(emails))
+    if not emails:
+        return None
+
+    batch = InvitationBatch.objects.create(meeting=meeting, requested_by=requested_by, emails=emails)
+
+    def enqueue():
+        try:
+            from .tasks import send_invitation_batch
+            send_invitation_batch.delay(batch.pk)
+        except Exception as e:
+            logger.error(f"Could not queue invitations for meeting {meeting.meeting_id}: {e}")
+            batch.status = InvitationBatch.Status.FAILED
+            batch.error = f"Could not queue invitations: {e}"
+            batch.save(update_fields=['status', 'error', 'updated_at'])
+
+    # The worker must be able to read the batch; outside a transaction this runs immediately
+    transaction.on_commit(enqueue)
+    return batch
+
+
+def deliver_invitation_batch(batch):
+    """Send a queued batch and store each recipient's result on it"""
+    batch.status = InvitationBatch.Status.SENDING
+    batch.save(update_fields=['status', 'updated_at'])
+
+    try:
+        results = send_voice_setup_batch(batch.meeting, batch.emails)
+    except Exception as e:
+        batch.status = InvitationBatch.Status.FAILED
+        batch.error = str(e)
+        batch.completed_at = timezone.now()
+        batch.save(update_fields=['status', 'error', 'completed_at', 'updated_at'])
+        raise
+
+    batch.results = results
+    batch.sent_count = sum(1 for result in results if result['success'])
+    batch.failed_count = len(results) - batch.sent_count
+    batch.status = InvitationBatch.Status.COMPLETED
+    batch.completed_at = timezone.now()
+    batch.save(update_fields=['results', 'sent_count', 'failed_count', 'status', 'completed_at', 'updated_at'])
+    return batch
+
+
+def latest_invitation_results(meeting, limit=20):
+    """Most recent invitation result per email across the meeting's recent batches"""
+    latest = {}
+    for batch in meeting.invitation_batches.all()[:limit]:
+        for result in batch.results:
+            latest.setdefault(result['email'], {**result, 'sent_at': batch.completed_at})
+    return latest
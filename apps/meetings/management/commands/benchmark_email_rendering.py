@@ -0,0 +1,66 @@
+"""
+Benchmark per-recipient render_to_string against MeetingEmail for one meeting's invitations.
+Run: python manage.py benchmark_email_rendering [--recipients 500]
+
+Renders the voice setup invitation (HTML and text) for synthetic recipients of an unsaved
+meeting; nothing is written or sent.
+"""
+
+import time
+from django.core.management.base import BaseCommand
+from django.template.loader import render_to_string
+from django.utils import timezone
+from apps.meetings.invitations import RECIPIENT_FIELDS, recipient_values, voice_setup_email
+from apps.meetings.models import Meeting
+
+
+class Command(BaseCommand):
+    help = 'Compare recipients/second for render_to_string per recipient vs. rendering once per meeting'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--recipients', type=int, default=500)
+
+    def handle(self, *args, **options):
+        meeting = Meeting(
+            meeting_id='bench001',
+            title='Quarterly planning & review',
+            scheduled_start=timezone.now(),
+            location='Room 4',
+        )
+        recipients = [
+            (f"attendee.{i}@example.com", f"token{i:04d}") for i in range(options['recipients'])
+        ]
+        self.stdout.write(f"Voice setup invitation for {len(recipients)} recipients")
+
+        # Current approach: full context and two template renders per recipient
+        start = time.perf_counter()
+        legacy = []
+        for email, token in recipients:
+            context = {
+                'meeting': meeting,
+                'host_name': 'Meeting Host',
+                'expires_days': 7,
+                'site_name': 'Huddle',
+                **recipient_values(meeting, email, token),
+            }
+            legacy.append(render_to_string('emails/voice_setup_invitation.html', context))
+            render_to_string('emails/voice_setup_invitation.txt', context)
+        legacy_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        email_content = voice_setup_email(meeting, 'Meeting Host')
+        rendered = [email_content.render(recipient_values(meeting, email, token)) for email, token in recipients]
+        layered_seconds = time.perf_counter() - start
+
+        self._report('render_to_string', len(recipients), legacy_seconds)
+        self._report('MeetingEmail', len(recipients), layered_seconds)
+
+        identical = all(html == copy[2] for html, copy in zip(legacy, rendered))
+        self.stdout.write(f"  HTML output identical: {'yes' if identical else 'NO'} "
+                          f"(recipient fields: {', '.join(RECIPIENT_FIELDS)})")
+        if layered_seconds > 0:
+            self.stdout.write(self.style.SUCCESS(f"Speedup: {legacy_seconds / layered_seconds:.1f}x"))
+
+    def _report(self, label, count, seconds):
+        rate = count / seconds if seconds else float('inf')
+        self.stdout.write(f"  {label:<18} {seconds:8.3f}s  {rate:10.0f} recipients/s")
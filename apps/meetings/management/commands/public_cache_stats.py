@@ -0,0 +1,25 @@
+"""
+Show hit rate of the rendered public-page fragment cache.
+Run: python manage.py public_cache_stats [--reset]
+"""
+
+from django.core.management.base import BaseCommand
+from apps.meetings import fragment_cache
+
+
+class Command(BaseCommand):
+    help = 'Report public minutes/actions fragment cache hit-rate metrics'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reset', action='store_true', help='Reset hit/miss counters after reporting')
+
+    def handle(self, *args, **options):
+        stats = fragment_cache.stats()
+
+        self.stdout.write(f"Hits:     {stats['hits']}")
+        self.stdout.write(f"Misses:   {stats['misses']}")
+        self.stdout.write(f"Hit rate: {stats['hit_rate']:.1%}")
+
+        if options['reset']:
+            fragment_cache.reset_stats()
+            self.stdout.write(self.style.SUCCESS("Counters reset"))
@@ -5,9 +5,12 @@ from django.contrib import messages
 from django.http import JsonResponse
 from django.views.decorators.http import require_http_methods
 from django.db import transaction
+from django.urls import reverse
 import json
-from .models import Meeting, MeetingAccessToken
+from .models import Meeting, InvitationBatch
 from .email_utils import send_voice_setup_invitation, send_meeting_invitation
+from .invitations import latest_invitation_results, queue_invitations
+from .tokens import ensure_access_tokens
 from apps.core.models import SpeakerProfile
 
 @login_required
@@ -82,34 +85,15 @@ def create_meeting_view(request):
         messages.success(request, f'Meeting "{meeting.title}" created successfully! Meeting ID: {meeting.meeting_id}')
         
         # Create access tokens for all attendees
-        if attendee_list:
-            for email in attendee_list:
-                MeetingAccessToken.objects.get_or_create(
-                    meeting=meeting,
-                    email=email,
-                    defaults={
-                        'can_view_transcript': True,
-                        'can_view_minutes': True,
-                        'can_view_action_items': True
-                    }
-                )
+        ensure_access_tokens(meeting, attendee_list)
 
-        # Send invitations if requested
+        # Send invitations if requested (in the background; results show on the meeting page)
         if send_invites and attendee_list:
-            sent_count = 0
-            failed_count = 0
-
-            for email in attendee_list:
-                success, message = send_voice_setup_invitation(meeting, email)
-                if success:
-                    sent_count += 1
-                else:
-                    failed_count += 1
-            
-            if sent_count > 0:
-                messages.success(request, f'Voice setup invitations sent to {sent_count} attendees')
-            if failed_count > 0:
-                messages.warning(request, f'Failed to send {failed_count} invitations')
+            batch = queue_invitations(meeting, attendee_list, requested_by=request.user)
+            if batch.status == InvitationBatch.Status.FAILED:
+                messages.warning(request, 'Could not queue voice setup invitations, please try again')
+            else:
+                messages.success(request, f'Sending voice setup invitations to {len(batch.emails)} attendees')
         
         return redirect('meeting_detail', meeting_id=meeting.meeting_id)
     
@@ -132,6 +116,13 @@ def meeting_detail_view(request, meeting_id):
     known_speakers = meeting.known_speakers.all()
     known_emails = set(known_speakers.values_list('email', flat=True))
     
+    invitation_results = latest_invitation_results(meeting)
+    pending_batch = meeting.invitation_batches.filter(
+        status__in=[InvitationBatch.Status.QUEUED, InvitationBatch.Status.SENDING]
+    ).first()
+    if pending_batch:
+        invitation_results.update({email: {'pending': True} for email in pending_batch.emails})
+
     attendee_status = []
     for email in meeting.expected_speakers:
         speaker = known_speakers.filter(email=email).first()
@@ -141,11 +132,13 @@ def meeting_detail_view(request, meeting_id):
             'has_profile': email in known_emails,
             'has_voice': speaker.sample_audio.name if speaker else None,
             'job_title': speaker.job_title if speaker else '',
+            'invitation': invitation_results.get(email),
         })
     
     context = {
         'meeting': meeting,
         'attendee_status': attendee_status,
+        'pending_invitation_batch': pending_batch,
         'meeting_url': request.build_absolute_uri(f'/meet/{meeting.meeting_id}/'),
     }
     
@@ -185,25 +178,17 @@ def add_attendees_view(request, meeting_id):
                 meeting.known_speakers.add(profile)
 
             # Create access tokens for new attendees
-            for email in added_emails:
-                MeetingAccessToken.objects.get_or_create(
-                    meeting=meeting,
-                    email=email,
-                    defaults={
-                        'can_view_transcript': True,
-                        'can_view_minutes': True,
-                        'can_view_action_items': True
-                    }
-                )
+            ensure_access_tokens(meeting, added_emails)
 
             # Send invitations if requested
+            batch = None
             if send_invites:
-                for email in added_emails:
-                    send_voice_setup_invitation(meeting, email)
+                batch = queue_invitations(meeting, added_emails, requested_by=request.user)
             
             return JsonResponse({
                 'success': True,
                 'added': added_emails,
+                'batch_id': batch.pk if batch else None,
                 'message': f'Added {len(added_emails)} attendees'
             })
         else:
@@ -268,24 +253,17 @@ def send_invitations_view(request, meeting_id):
             new_speakers = meeting.get_new_speakers()
             emails = [s['email'] for s in new_speakers]
         
-        results = []
-        for email in emails:
-            if email in meeting.expected_speakers:
-                success, message = send_voice_setup_invitation(meeting, email)
-                results.append({
-                    'email': email,
-                    'success': success,
-                    'message': message
-                })
-        
-        sent_count = sum(1 for r in results if r['success'])
+        emails = [email for email in emails if email in meeting.expected_speakers]
+        batch = queue_invitations(meeting, emails, requested_by=request.user)
+        if batch is None:
+            return JsonResponse({'success': True, 'batch_id': None, 'total': 0, 'results': []})
         
+        # Delivery happens on the email worker; poll status_url for per-recipient results
         return JsonResponse({
-            'success': True,
-            'sent': sent_count,
-            'total': len(results),
-            'results': results
-        })
+            'success': batch.status != InvitationBatch.Status.FAILED,
+            **batch.status_payload(),
+            'status_url': reverse('invitation_batch_status', args=[meeting.meeting_id, batch.pk]),
+        }, status=202)
         
     except Exception as e:
         return JsonResponse({
@@ -293,6 +271,14 @@ def send_invitations_view(request, meeting_id):
             'error': str(e)
         }, status=400)
 
+@login_required
+def invitation_batch_status_view(request, meeting_id, batch_id):
+    """Progress and per-recipient results of an invitation batch"""
+    batch = get_object_or_404(
+        InvitationBatch, pk=batch_id, meeting__meeting_id=meeting_id, meeting__host=request.user
+    )
+    return JsonResponse({'success': True, **batch.status_payload()})
+
 @login_required
 def delete_meeting_view(request, meeting_id):
     """Delete a meeting"""
@@ -209,12 +209,22 @@ class MeetingAccessToken(TimeStampedModel):
         return True
 
     def record_access(self):
-        """Record that this token was used"""
+        """
+        Record that this token was used.
+        Accesses are buffered in Redis and flushed in batches by flush_token_access_counts,
+        so access_count and last_accessed are eventually consistent.
+        """
+        from django.db.models import F
         from django.utils import timezone
+        from .access_tracking import buffer_access
 
-        self.last_accessed = timezone.now()
-        self.access_count += 1
-        self.save(update_fields=['last_accessed', 'access_count'])
+        if buffer_access(self):
+            return
+
+        MeetingAccessToken.objects.filter(pk=self.pk).update(
+            last_accessed=timezone.now(),
+            access_count=F('access_count') + 1
+        )
 
     def get_magic_link(self, view_type='minutes'):
         """Generate the magic link URL for this token"""
@@ -230,4 +240,50 @@ class MeetingAccessToken(TimeStampedModel):
         else:
             path = f"/meeting/{self.meeting.meeting_id}/summary/"
 
-        return f"{base_url}{path}?token={self.token}"
\ No newline at end of file
+        return f"{base_url}{path}?token={self.token}"
+
+
+class InvitationBatch(TimeStampedModel):
+    """
+    One asynchronous send of voice setup invitations for a meeting.
+    The email worker fills in per-recipient results as it goes; the dashboard polls them.
+    """
+
+    class Status(models.TextChoices):
+        QUEUED = 'queued', 'Queued'
+        SENDING = 'sending', 'Sending'
+        COMPLETED = 'completed', 'Completed'
+        FAILED = 'failed', 'Failed'
+
+    meeting = models.ForeignKey(Meeting, on_delete=models.CASCADE, related_name='invitation_batches')
+    requested_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True)
+    emails = models.JSONField(default=list, help_text="Recipients, in request order")
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.QUEUED)
+    sent_count = models.PositiveIntegerField(default=0)
+    failed_count = models.PositiveIntegerField(default=0)
+    results = models.JSONField(default=list, help_text="Per-recipient {email, success, message}")
+    error = models.TextField(blank=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'huddle_invitation_batch'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['meeting', 'created_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.meeting.meeting_id} invitations ({self.status})"
+
+    def status_payload(self):
+        return {
+            'batch_id': self.pk,
+            'status': self.status,
+            'emails': self.emails,
+            'total': len(self.emails),
+            'sent': self.sent_count,
+            'failed': self.failed_count,
+            'results': self.results,
+            'error': self.error,
+            'completed_at': self.completed_at.isoformat() if self.completed_at else None,
+        }
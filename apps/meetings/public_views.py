@@ -1,8 +1,18 @@
 """Public views for viewing meeting content with access tokens (no login required)"""
+import hashlib
+from django.conf import settings
+from django.db.models import Count, Max
 from django.shortcuts import render, get_object_or_404
 from django.http import JsonResponse, HttpResponseForbidden
-from .models import Meeting, MeetingAccessToken
-from apps.audio.models import MeetingSummary
+from django.template.loader import render_to_string
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.safestring import mark_safe
+from django.utils.http import http_date, quote_etag
+from .fragment_cache import get_or_build_fragment
+from .models import AgendaItem, Meeting, MeetingAccessToken
+from apps.audio.action_items import action_items_state
+from apps.audio.models import ActionItem, MeetingSummary, TranscriptionSegment
+from apps.audio.transcripts import load_transcript, recording_counts
 
 
 def verify_token_access(request, meeting_id):
@@ -34,6 +44,62 @@ def verify_token_access(request, meeting_id):
         return None, None
 
 
+def get_cache_validators(view_name, meeting, token):
+    """
+    ETag and Last-Modified for a public page.
+    Content changes when the meeting, its agenda or summary are saved, segments are
+    written or action items are synced; the page also shows the viewer's email, so the
+    token's email is part of the ETag.
+    """
+    summary_updated = MeetingSummary.objects.filter(meeting=meeting).values_list('updated_at', flat=True).first()
+    actions_updated, action_count = action_items_state(meeting)
+    segments_updated = TranscriptionSegment.objects.filter(
+        recording__meeting=meeting
+    ).aggregate(latest=Max('updated_at'))['latest']
+    # The count catches deleted agenda items, which leave no newer timestamp behind
+    agenda = AgendaItem.objects.filter(meeting=meeting).aggregate(latest=Max('updated_at'), count=Count('id'))
+
+    timestamps = [ts for ts in (meeting.updated_at, summary_updated, segments_updated, agenda['latest'], actions_updated) if ts]
+    last_modified = int(max(timestamps).timestamp()) if timestamps else None
+
+    fingerprint = '|'.join([
+        view_name,
+        meeting.meeting_id,
+        meeting.status,
+        token.email.lower(),
+        meeting.updated_at.isoformat(),
+        agenda['latest'].isoformat() if agenda['latest'] else '',
+        str(agenda['count']),
+        summary_updated.isoformat() if summary_updated else '',
+        segments_updated.isoformat() if segments_updated else '',
+        actions_updated.isoformat() if actions_updated else '',
+        str(action_count),
+    ])
+    etag = quote_etag(hashlib.sha256(fingerprint.encode('utf-8')).hexdigest()[:32])
+    return etag, last_modified
+
+
+def apply_cache_headers(response, etag, last_modified):
+    """Attach validators and the PUBLIC_VIEW_CACHE_CONTROL policy"""
+    response['ETag'] = etag
+    if last_modified:
+        response['Last-Modified'] = http_date(last_modified)
+    patch_cache_control(response, **settings.PUBLIC_VIEW_CACHE_CONTROL)
+    return response
+
+
+def conditional_response(request, view_name, meeting, token):
+    """
+    Returns (not_modified_response or None, etag, last_modified).
+    Called after verify_token_access, so revalidated hits are still recorded.
+    """
+    etag, last_modified = get_cache_validators(view_name, meeting, token)
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is not None:
+        response = apply_cache_headers(response, etag, last_modified)
+    return response, etag, last_modified
+
+
 def public_meeting_minutes_view(request, meeting_id):
     """Public view for meeting minutes with token authentication"""
     meeting, token = verify_token_access(request, meeting_id)
@@ -44,6 +110,10 @@ def public_meeting_minutes_view(request, meeting_id):
     if not token.can_view_minutes:
         return HttpResponseForbidden("You don't have permission to view minutes")
 
+    not_modified, etag, last_modified = conditional_response(request, 'minutes', meeting, token)
+    if not_modified:
+        return not_modified
+
     # Get meeting summary if available
     try:
         summary = meeting.summary
@@ -54,16 +124,26 @@ def public_meeting_minutes_view(request, meeting_id):
         has_summary = False
         has_ai_processed = False
 
+    # The minutes sections are the same for every viewer - render them once per summary version
+    minutes_html = ''
+    if has_ai_processed:
+        minutes_html = get_or_build_fragment(
+            'minutes', meeting, summary,
+            lambda: render_to_string('meetings/_public_minutes_body.html', {'summary': summary})
+        )
+
     context = {
         'meeting': meeting,
         'summary': summary,
         'has_summary': has_summary,
         'has_ai_processed': has_ai_processed,
+        'minutes_html': mark_safe(minutes_html),
         'participant_email': token.email,
         'is_public_view': True,  # Flag for template to hide admin controls
     }
 
-    return render(request, 'meetings/public_minutes.html', context)
+    response = render(request, 'meetings/public_minutes.html', context)
+    return apply_cache_headers(response, etag, last_modified)
 
 
 def public_meeting_transcript_view(request, meeting_id):
@@ -76,45 +156,12 @@ def public_meeting_transcript_view(request, meeting_id):
     if not token.can_view_transcript:
         return HttpResponseForbidden("You don't have permission to view transcript")
 
-    # Get all transcript segments from all recordings
-    all_segments = []
-    for recording in meeting.recordings.filter(is_processed=True):
-        segments = recording.segments.all().order_by('start_time')
-        for segment in segments:
-            all_segments.append({
-                'start_time': segment.start_time,
-                'end_time': segment.end_time,
-                'speaker_name': segment.speaker_name or 'Unknown Speaker',
-                'speaker_id': segment.speaker_id,
-                'text': segment.text,
-                'agenda_item': segment.agenda_item.title if segment.agenda_item else None
-            })
-
-    # Sort all segments by start time
-    all_segments.sort(key=lambda x: x['start_time'])
-
-    # Group segments by speaker
-    grouped_segments = []
-    current_speaker = None
-    current_group = []
-
-    for segment in all_segments:
-        if segment['speaker_name'] != current_speaker:
-            if current_group:
-                grouped_segments.append({
-                    'speaker': current_speaker,
-                    'segments': current_group
-                })
-            current_speaker = segment['speaker_name']
-            current_group = [segment]
-        else:
-            current_group.append(segment)
-
-    if current_group:
-        grouped_segments.append({
-            'speaker': current_speaker,
-            'segments': current_group
-        })
+    not_modified, etag, last_modified = conditional_response(request, 'transcript', meeting, token)
+    if not_modified:
+        return not_modified
+
+    # Get all transcript segments from all recordings, grouped by speaker
+    all_segments, grouped_segments = load_transcript(meeting)
 
     context = {
         'meeting': meeting,
@@ -123,13 +170,11 @@ def public_meeting_transcript_view(request, meeting_id):
         'total_segments': len(all_segments),
         'participant_email': token.email,
         'is_public_view': True,
-        'processing_status': {
-            'total_recordings': meeting.recordings.count(),
-            'processed_recordings': meeting.recordings.filter(is_processed=True).count(),
-        }
+        'processing_status': recording_counts(meeting),
     }
 
-    return render(request, 'meetings/public_transcript.html', context)
+    response = render(request, 'meetings/public_transcript.html', context)
+    return apply_cache_headers(response, etag, last_modified)
 
 
 def public_meeting_actions_view(request, meeting_id):
@@ -142,24 +187,30 @@ def public_meeting_actions_view(request, meeting_id):
     if not token.can_view_action_items:
         return HttpResponseForbidden("You don't have permission to view action items")
 
+    not_modified, etag, last_modified = conditional_response(request, 'actions', meeting, token)
+    if not_modified:
+        return not_modified
+
     # Get meeting summary for action items
     try:
         summary = meeting.summary
-        action_items = summary.action_items if summary.is_ai_processed else []
-
-        # Filter action items for this participant
-        participant_actions = []
-        all_actions = []
-
-        for item in action_items:
-            all_actions.append(item)
-            # Check if this action is assigned to the viewer
-            if item.get('owner', '').lower() == token.email.lower():
-                participant_actions.append(item)
-
     except MeetingSummary.DoesNotExist:
-        participant_actions = []
-        all_actions = []
+        summary = None
+
+    def load_actions(**filters):
+        if not summary or not summary.is_ai_processed:
+            return []
+        # Indexed rows rather than a scan of the summary's JSON
+        return [row.as_dict() for row in ActionItem.objects.filter(meeting=meeting, **filters)]
+
+    # Cached per summary version and action item state; the viewer's own items also per viewer email
+    latest, count = action_items_state(meeting)
+    revision = f"{latest.isoformat() if latest else ''}:{count}"
+    all_actions = get_or_build_fragment('actions', meeting, summary, load_actions, revision=revision)
+    participant_actions = get_or_build_fragment(
+        'participant_actions', meeting, summary, lambda: load_actions(owner_email=token.email.lower()),
+        viewer_email=token.email, revision=revision,
+    )
 
     context = {
         'meeting': meeting,
@@ -169,15 +220,11 @@ def public_meeting_actions_view(request, meeting_id):
         'is_public_view': True,
     }
 
-    return render(request, 'meetings/public_actions.html', context)
+    response = render(request, 'meetings/public_actions.html', context)
+    return apply_cache_headers(response, etag, last_modified)
 
 
 def public_meeting_summary_view(request, meeting_id):
     """Combined summary view with minutes and actions"""
-    meeting, token = verify_token_access(request, meeting_id)
-
-    if not meeting or not token:
-        return HttpResponseForbidden("Invalid or expired access token")
-
-    # Redirect to minutes view as the main summary
+    # Redirect to minutes view as the main summary - it verifies (and records) the token once
     return public_meeting_minutes_view(request, meeting_id)
\ No newline at end of file
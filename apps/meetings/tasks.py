@@ -0,0 +1,75 @@
+from celery import shared_task
+from django.conf import settings
+from .access_tracking import flush_access_counts
+
+
+@shared_task
+def flush_token_access_counts():
+    """Periodic task: apply buffered public-link access counts to MeetingAccessToken rows"""
+    try:
+        flushed = flush_access_counts()
+        if flushed:
+            print(f"Flushed access counts for {flushed} tokens")
+        return flushed
+    except Exception as e:
+        print(f"Failed to flush token access counts: {e}")
+        return 0
+
+
+@shared_task
+def send_meeting_complete_notifications(meeting_id):
+    """Pipeline stage: email every attendee with a valid access token their links to the minutes"""
+    try:
+        from apps.audio.models import MeetingSummary
+        from apps.audio.pipeline import Stage, run_stage, stage_key
+        from .email_utils import notify_meeting_complete
+        from .models import Meeting
+
+        meeting = Meeting.objects.get(meeting_id=meeting_id)
+
+        if not getattr(settings, 'PIPELINE_NOTIFY_PARTICIPANTS', False):
+            return False
+        if not MeetingSummary.objects.filter(meeting=meeting, is_ai_processed=True).exists():
+            print(f"Minutes for meeting {meeting_id} are not ready, skipping notifications")
+            return False
+
+        def notify():
+            tokens = [token for token in meeting.access_tokens.all() if token.is_valid()]
+            sent = notify_meeting_complete(meeting, tokens)
+            print(f"Sent {sent}/{len(tokens)} completion notifications for meeting {meeting_id}")
+            return True
+
+        # Attendees are notified once per meeting, even if later recordings trigger a re-run
+        run_stage(meeting, Stage.NOTIFY, stage_key(Stage.NOTIFY, meeting), notify)
+        return True
+
+    except Meeting.DoesNotExist:
+        print(f"Meeting {meeting_id} not found")
+        return False
+    except Exception as e:
+        print(f"Failed to send completion notifications for meeting {meeting_id}: {e}")
+        return False
+
+
+@shared_task
+def send_invitation_batch(batch_id):
+    """Send a dashboard-requested InvitationBatch; the dashboard polls its per-recipient results"""
+    from .invitations import deliver_invitation_batch
+    from .models import InvitationBatch
+
+    try:
+        batch = InvitationBatch.objects.select_related('meeting__host').get(pk=batch_id)
+        if batch.status == InvitationBatch.Status.COMPLETED:
+            print(f"Invitation batch {batch_id} already sent, skipping")
+            return batch.sent_count
+
+        deliver_invitation_batch(batch)
+        print(f"Sent {batch.sent_count}/{len(batch.emails)} invitations for meeting {batch.meeting.meeting_id}")
+        return batch.sent_count
+
+    except InvitationBatch.DoesNotExist:
+        print(f"Invitation batch {batch_id} not found")
+        return 0
+    except Exception as e:
+        print(f"Failed to send invitation batch {batch_id}: {e}")
+        return 0
@@ -0,0 +1,80 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from apps.audio.models import AudioRecording, TranscriptionSegment
+from .models import AgendaItem, Meeting, MeetingAccessToken, MeetingParticipant
+
+
+class TranscriptQueryCountTests(TestCase):
+    """Transcript pages cost the same number of queries whatever the segment count"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.host = User.objects.create_user(username='host', email='host@example.com', password='secret')
+        cls.small = cls.create_meeting(segments=5)
+        cls.large = cls.create_meeting(segments=500)
+
+    @classmethod
+    def create_meeting(cls, segments):
+        meeting = Meeting.objects.create(title=f"{segments} segments", host=cls.host, scheduled_start=timezone.now())
+        agenda_item = AgendaItem.objects.create(meeting=meeting, title='Budget', order=1)
+        participant = MeetingParticipant.objects.create(meeting=meeting, user=cls.host, session_id=meeting.meeting_id)
+
+        # Two recordings so grouping and per-recording joins are exercised
+        recordings = [
+            AudioRecording.objects.create(
+                meeting=meeting, participant=participant, audio_file=f'test/{meeting.meeting_id}_{i}.webm',
+                format='webm', is_processed=True,
+            )
+            for i in range(2)
+        ]
+        TranscriptionSegment.objects.bulk_create([
+            TranscriptionSegment(
+                recording=recordings[i % 2],
+                start_time=i * 2.0,
+                end_time=i * 2.0 + 1.5,
+                text=f"Segment {i} of the discussion.",
+                confidence=0.9,
+                speaker_id=str(i % 3),
+                speaker_name=f"Speaker {i % 3}",
+                agenda_item=agenda_item if i % 2 else None,
+            )
+            for i in range(segments)
+        ])
+        token = MeetingAccessToken.objects.create(meeting=meeting, email='viewer@example.com')
+        return meeting, token
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.host)
+
+    def assertSameQueryCount(self, url_for):
+        small_url, large_url = url_for(*self.small), url_for(*self.large)
+
+        with CaptureQueriesContext(connection) as small_queries:
+            response = self.client.get(small_url)
+        self.assertEqual(response.status_code, 200)
+
+        with self.assertNumQueries(len(small_queries)):
+            response = self.client.get(large_url)
+        self.assertEqual(response.status_code, 200)
+
+    def test_transcript_view(self):
+        self.assertSameQueryCount(
+            lambda meeting, token: reverse('meeting_transcript', args=[meeting.meeting_id])
+        )
+
+    def test_transcript_api(self):
+        self.assertSameQueryCount(
+            lambda meeting, token: reverse('meeting_transcript_api', args=[meeting.meeting_id])
+        )
+
+    def test_public_transcript_view(self):
+        self.client.logout()
+        self.assertSameQueryCount(
+            lambda meeting, token: f"{reverse('public_meeting_transcript', args=[meeting.meeting_id])}?token={token.token}"
+        )
@@ -0,0 +1,77 @@
+"""
+Bulk provisioning of per-attendee tokens.
+Inviting N attendees costs one INSERT and one SELECT per token type instead of a
+get_or_create (or create) per email.
+"""
+import logging
+import secrets
+from datetime import timedelta
+from django.utils import timezone
+from apps.core.models import VoiceSetupToken
+from .models import MeetingAccessToken
+
+logger = logging.getLogger(__name__)
+
+SETUP_TOKEN_EXPIRY_DAYS = 7
+
+
+def ensure_access_tokens(meeting, emails):
+    """
+    Make sure every email has a MeetingAccessToken for the meeting.
+    Existing tokens are kept (the insert skips them via the meeting/email unique
+    constraint). Returns {email: MeetingAccessToken}.
+    """
+    emails = list(dict.fromkeys(emails))
+    if not emails:
+        return {}
+
+    MeetingAccessToken.objects.bulk_create(
+        [
+            MeetingAccessToken(
+                meeting=meeting,
+                email=email,
+                can_view_transcript=True,
+                can_view_minutes=True,
+                can_view_action_items=True,
+            )
+            for email in emails
+        ],
+        ignore_conflicts=True,
+    )
+
+    tokens = {}
+    for token in MeetingAccessToken.objects.filter(meeting=meeting, email__in=emails):
+        token.meeting = meeting  # get_magic_link() reads it
+        tokens[token.email] = token
+    return tokens
+
+
+def issue_setup_tokens(meeting_id, emails, attempts=3):
+    """
+    Create a fresh voice setup token for each email.
+    Returns {email: token}; the read-back confirms every token was stored.
+    """
+    pending = list(dict.fromkeys(emails))
+    issued = {}
+    expires_at = timezone.now() + timedelta(days=SETUP_TOKEN_EXPIRY_DAYS)
+
+    for _ in range(attempts):
+        if not pending:
+            break
+        candidates = {secrets.token_urlsafe(48): email for email in pending}
+        VoiceSetupToken.objects.bulk_create(
+            [
+                VoiceSetupToken(meeting_id=meeting_id, email=email, token=token, expires_at=expires_at)
+                for token, email in candidates.items()
+            ],
+            ignore_conflicts=True,
+        )
+        stored = VoiceSetupToken.objects.filter(
+            meeting_id=meeting_id, token__in=list(candidates)
+        ).values_list('email', 'token')
+        issued.update(stored)
+        pending = [email for email in pending if email not in issued]
+
+    if pending:
+        logger.error(f"Could not issue voice setup tokens for {len(pending)} emails in meeting {meeting_id}")
+    return issued
@@ -1,9 +1,40 @@
 """Views for displaying meeting transcripts with speaker identification"""
+import json
+from asgiref.sync import sync_to_async
+from django.conf import settings
 from django.shortcuts import render, get_object_or_404
 from django.contrib.auth.decorators import login_required
-from django.http import JsonResponse
+from django.http import JsonResponse, StreamingHttpResponse
 from .models import Meeting
-from apps.audio.models import MeetingSummary, TranscriptionSegment
+from apps.audio.models import MeetingSummary
+from apps.audio.transcripts import (
+    UNKNOWN_SPEAKER, encode_cursor, load_transcript, recording_counts, segments_after
+)
+
+TRANSCRIPT_STREAM_CHUNK_SIZE = 500  # Rows fetched per round trip when streaming NDJSON
+
+
+async def stream_segments_ndjson(meeting, cursor=None):
+    """
+    Every segment after the cursor as NDJSON, one keyset page per query.
+    An async iterator so the ASGI server streams it; a sync one is collected into a list first.
+    """
+    fetch_page = sync_to_async(
+        lambda cursor: list(segments_after(meeting, cursor)[:TRANSCRIPT_STREAM_CHUNK_SIZE]),
+        thread_sensitive=True
+    )
+
+    while True:
+        page = await fetch_page(cursor)
+        lines = []
+        for segment in page:
+            segment['speaker_name'] = segment['speaker_name'] or UNKNOWN_SPEAKER
+            cursor = segment['cursor'] = encode_cursor(segment)
+            lines.append(json.dumps(segment) + '\n')
+        if lines:
+            yield ''.join(lines)
+        if len(page) < TRANSCRIPT_STREAM_CHUNK_SIZE:
+            return
 
 
 @login_required
@@ -21,47 +52,10 @@ def meeting_transcript_view(request, meeting_id):
         has_summary = False
         has_ai_processed = False
     
-    # Get all transcript segments from all recordings
-    all_segments = []
-    for recording in meeting.recordings.filter(is_processed=True):
-        segments = recording.segments.all().order_by('start_time')
-        for segment in segments:
-            all_segments.append({
-                'start_time': segment.start_time,
-                'end_time': segment.end_time,
-                'speaker_name': segment.speaker_name or 'Unknown Speaker',
-                'speaker_id': segment.speaker_id,
-                'text': segment.text,
-                'confidence': segment.confidence,
-                'recording_service': recording.transcription_service,
-            })
-    
-    # Sort all segments by start time
-    all_segments.sort(key=lambda x: x['start_time'])
-    
-    # Group segments by speaker for better display
-    grouped_segments = []
-    current_speaker = None
-    current_group = []
-    
-    for segment in all_segments:
-        if segment['speaker_name'] != current_speaker:
-            if current_group:
-                grouped_segments.append({
-                    'speaker': current_speaker,
-                    'segments': current_group
-                })
-            current_speaker = segment['speaker_name']
-            current_group = [segment]
-        else:
-            current_group.append(segment)
-    
-    if current_group:
-        grouped_segments.append({
-            'speaker': current_speaker,
-            'segments': current_group
-        })
-    
+    # Get all transcript segments from all recordings, grouped by speaker
+    all_segments, grouped_segments = load_transcript(meeting)
+    counts = recording_counts(meeting)
+
     context = {
         'meeting': meeting,
         'summary': summary,
@@ -71,8 +65,7 @@ def meeting_transcript_view(request, meeting_id):
         'grouped_segments': grouped_segments,
         'total_segments': len(all_segments),
         'processing_status': {
-            'total_recordings': meeting.recordings.count(),
-            'processed_recordings': meeting.recordings.filter(is_processed=True).count(),
+            **counts,
             'ai_processing_complete': has_ai_processed,
         }
     }
@@ -86,29 +79,17 @@ def meeting_transcript_api(request, meeting_id):
     meeting = get_object_or_404(Meeting, meeting_id=meeting_id, host=request.user)
     
     # Get all transcript segments
-    all_segments = []
-    for recording in meeting.recordings.filter(is_processed=True):
-        segments = recording.segments.all().order_by('start_time')
-        for segment in segments:
-            all_segments.append({
-                'start_time': segment.start_time,
-                'end_time': segment.end_time,
-                'speaker_name': segment.speaker_name,
-                'speaker_id': segment.speaker_id,
-                'text': segment.text,
-                'confidence': segment.confidence,
-                'service': recording.transcription_service,
-            })
-    
-    # Sort by start time
-    all_segments.sort(key=lambda x: x['start_time'])
-    
+    all_segments, _ = load_transcript(meeting)
+    for segment in all_segments:
+        segment['service'] = segment.pop('recording_service')
+    counts = recording_counts(meeting)
+
     # Get summary if available
     summary_data = None
     if hasattr(meeting, 'summary'):
         summary_data = {
             'full_transcript': meeting.summary.full_transcript,
-            'summary': meeting.summary.summary,
+            'summary': meeting.summary.executive_summary,
             'key_points': meeting.summary.key_points,
             'action_items': meeting.summary.action_items,
         }
@@ -119,13 +100,52 @@ def meeting_transcript_api(request, meeting_id):
         'segments': all_segments,
         'summary': summary_data,
         'processing_status': {
-            'total_recordings': meeting.recordings.count(),
-            'processed_recordings': meeting.recordings.filter(is_processed=True).count(),
-            'is_complete': meeting.recordings.filter(is_processed=True).count() == meeting.recordings.count()
+            **counts,
+            'is_complete': counts['processed_recordings'] == counts['total_recordings']
         }
     })
 
 
+@login_required
+def meeting_transcript_segments_api(request, meeting_id):
+    """
+    Cursor-paginated transcript segments ordered by (start_time, id).
+
+    ?cursor=<next_cursor from the previous page>&limit=N returns one JSON page.
+    ?format=ndjson streams every segment after the cursor, one JSON object per line.
+    """
+    meeting = get_object_or_404(Meeting, meeting_id=meeting_id, host=request.user)
+
+    cursor = request.GET.get('cursor')
+    try:
+        segments = segments_after(meeting, cursor)
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+
+    if request.GET.get('format') == 'ndjson':
+        return StreamingHttpResponse(stream_segments_ndjson(meeting, cursor), content_type='application/x-ndjson')
+
+    try:
+        limit = int(request.GET.get('limit', settings.TRANSCRIPT_PAGE_SIZE))
+    except ValueError:
+        return JsonResponse({'error': 'limit must be an integer'}, status=400)
+
+    limit = max(1, min(limit, settings.TRANSCRIPT_MAX_PAGE_SIZE))
+    page = list(segments[:limit + 1])
+    has_more = len(page) > limit
+    page = page[:limit]
+
+    for segment in page:
+        segment['speaker_name'] = segment['speaker_name'] or UNKNOWN_SPEAKER
+
+    return JsonResponse({
+        'meeting_id': meeting.meeting_id,
+        'segments': page,
+        'next_cursor': encode_cursor(page[-1]) if has_more else None,
+        'has_more': has_more,
+    })
+
+
 def format_timestamp(seconds):
     """Format timestamp for display"""
     minutes = int(seconds // 60)
@@ -1,5 +1,6 @@
 from django.shortcuts import render, get_object_or_404, redirect
 from django.http import JsonResponse
+from django.conf import settings
 from .models import Meeting
 
 def join_meeting(request, meeting_id):
@@ -30,4 +31,7 @@ def meeting_room(request, meeting_id):
     if meeting.status == Meeting.Status.SCHEDULED:
         meeting.start_meeting()
 
-    return render(request, 'meeting/room.html', {'meeting': meeting})
\ No newline at end of file
+    return render(request, 'meeting/room.html', {
+        'meeting': meeting,
+        'live_transcription_enabled': settings.LIVE_TRANSCRIPTION_ENABLED,
+    })
\ No newline at end of file
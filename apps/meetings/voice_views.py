@@ -1,7 +1,6 @@
 """Voice setup and speaker identification views"""
-import secrets
 import hashlib
-from datetime import datetime, timedelta
+from datetime import datetime
 from django.shortcuts import render, get_object_or_404
 from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
@@ -13,18 +12,9 @@ from .models import Meeting
 import json
 
 def generate_setup_token(meeting_id, email):
-    """Generate secure token for voice setup"""
-    token = secrets.token_urlsafe(48)
-    expires_at = timezone.now() + timedelta(days=7)  # 7-day expiry
-    
-    VoiceSetupToken.objects.create(
-        meeting_id=meeting_id,
-        email=email,
-        token=token,
-        expires_at=expires_at
-    )
-    
-    return token
+    """Generate secure token for voice setup (7-day expiry)"""
+    from .tokens import issue_setup_tokens
+    return issue_setup_tokens(meeting_id, [email])[email]
 
 def verify_setup_token(meeting_id, email, token):
     """Verify voice setup token"""
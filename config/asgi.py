@@ -19,6 +19,7 @@ django_asgi_app = get_asgi_application()
 
 from apps.meetings.routing import websocket_urlpatterns as meeting_websocket_urlpatterns
 from apps.coordination.routing import websocket_urlpatterns as coordination_websocket_urlpatterns
+from apps.audio.routing import websocket_urlpatterns as audio_websocket_urlpatterns
 
 application = ProtocolTypeRouter({
     'http': django_asgi_app,
@@ -27,6 +28,7 @@ application = ProtocolTypeRouter({
             URLRouter([
                 *meeting_websocket_urlpatterns,
                 *coordination_websocket_urlpatterns,
+                *audio_websocket_urlpatterns,
             ])
         )
     ),
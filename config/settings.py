@@ -35,6 +35,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     
     # Third party apps
     'rest_framework',
@@ -230,15 +231,104 @@ CELERY_ACCEPT_CONTENT = ['json']
 CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = 'UTC'
+# Separate queues per workload (see Procfile for the worker serving each); apps.core.task_queues
+CELERY_TASK_DEFAULT_QUEUE = 'default'
+CELERY_TASK_ROUTES = {
+    'apps.audio.tasks.process_audio_recording': {'queue': 'audio'},
+    'apps.audio.tasks.merge_meeting_transcript': {'queue': 'audio'},
+    'apps.audio.tasks.process_meeting_ai_analysis': {'queue': 'ai'},
+    'apps.audio.tasks.update_agenda_item_summary': {'queue': 'ai'},
+    'apps.audio.tasks.build_retrieval_index': {'queue': 'ai'},
+    'apps.meetings.tasks.send_*': {'queue': 'email'},
+}
+# Priority lanes within each queue: 0 (live meetings) runs before 5 (default) before 8 (bulk)
+CELERY_BROKER_TRANSPORT_OPTIONS = {
+    'priority_steps': list(range(10)),
+    'sep': ':',
+    'queue_order_strategy': 'priority',
+}
+CELERY_TASK_DEFAULT_PRIORITY = 5
+CELERY_WORKER_PREFETCH_MULTIPLIER = 1  # Prefetched messages would bypass the priority lanes
+# Meeting pipeline: chord(transcribe recordings) -> merge -> analyze -> notify, each stage run once per input
+PIPELINE_LOCK_TIMEOUT = 30 * 60  # seconds; must exceed the longest stage (AI analysis)
+# Emailing attendees when minutes are ready is opt-in; hosts otherwise share the links themselves
+PIPELINE_NOTIFY_PARTICIPANTS = os.environ.get('PIPELINE_NOTIFY_PARTICIPANTS', 'False').lower() == 'true'
+# Transcription retries: exponential backoff with jitter, then the recording is dead-lettered
+TRANSCRIPTION_MAX_RETRIES = 5
+TRANSCRIPTION_RETRY_BACKOFF = 30  # seconds before the first retry, doubled each attempt
+TRANSCRIPTION_RETRY_BACKOFF_MAX = 900  # seconds
+CELERY_BEAT_SCHEDULE = {
+    'flush-token-access-counts': {
+        'task': 'apps.meetings.tasks.flush_token_access_counts',
+        'schedule': 60.0,  # seconds; public-link access counts lag by at most this much
+    },
+    'reap-abandoned-audio-uploads': {
+        'task': 'apps.audio.tasks.reap_abandoned_audio_uploads',
+        'schedule': 3600.0,  # seconds; uploads are reaped after apps.audio.uploads.ABANDONED_AFTER
+    },
+}
 
 # Audio processing settings
 MAX_UPLOAD_SIZE = 100 * 1024 * 1024  # 100MB
 AUDIO_FORMATS = ['wav', 'mp3', 'm4a', 'webm']
+TRANSCRIPT_SEGMENT_BATCH_SIZE = int(os.environ.get('TRANSCRIPT_SEGMENT_BATCH_SIZE', 500))  # Rows per bulk INSERT
+TRANSCRIPT_PAGE_SIZE = 200  # Segments per page of the transcript segments API
+TRANSCRIPT_MAX_PAGE_SIZE = 1000
+SEARCH_CONFIG = os.environ.get('SEARCH_CONFIG', 'english')  # PostgreSQL text search configuration
+SEARCH_MAX_RESULTS = 50
 
 # Transcription service configuration
 DEEPGRAM_API_KEY = os.getenv('DEEPGRAM_API_KEY')
+# How recordings are handed to Deepgram: 'url' (presigned Spaces URL), 'stream' (file object) or 'buffer'
+DEEPGRAM_INPUT_MODE = os.environ.get('DEEPGRAM_INPUT_MODE', 'url' if USE_SPACES else 'stream')
+DEEPGRAM_PRESIGNED_URL_EXPIRY = 900  # seconds
+# Live transcription over the meeting WebSocket; DEEPGRAM_LIVE_URL can point at a local fake server
+LIVE_TRANSCRIPTION_ENABLED = os.environ.get('LIVE_TRANSCRIPTION_ENABLED', 'False').lower() == 'true'
+DEEPGRAM_LIVE_URL = os.environ.get('DEEPGRAM_LIVE_URL', '')
 # Note: OpenAI API key can be added later if needed for AI summaries (GPT-4)
 
+# AI processing - long transcripts are split into chunks and processed in parallel
+AI_CHUNK_MAX_CHARS = 12000  # ~3k tokens per cleanup request
+AI_CHUNK_WINDOW_SECONDS = 600  # Chunks never span these windows of meeting time, so edits stay local
+AI_MAX_CONCURRENCY = int(os.environ.get('AI_MAX_CONCURRENCY', 4))  # In-flight OpenAI requests per job
+AI_PROCESSOR_ASYNC = os.environ.get('AI_PROCESSOR_ASYNC', 'False').lower() == 'true'  # AsyncOpenAI fan-out variant
+AI_REQUEST_TIMEOUT = 120  # seconds per OpenAI call (async processor)
+# Progressive minutes: per-agenda-item summaries updated as segments arrive, merged when the meeting ends
+ROLLING_SUMMARY_ENABLED = os.environ.get('ROLLING_SUMMARY_ENABLED', 'False').lower() == 'true'
+ROLLING_SUMMARY_DEBOUNCE = 30  # seconds to batch new segments before updating a partial
+
+# Semantic retrieval: speaker-turn chunks embedded after transcription, top-k per organization
+RETRIEVAL_INDEX_ENABLED = os.environ.get('RETRIEVAL_INDEX_ENABLED', 'False').lower() == 'true'
+RETRIEVAL_BACKEND = os.environ.get('RETRIEVAL_BACKEND', 'auto')  # 'pgvector', 'numpy' or 'auto' (pgvector if installed)
+RETRIEVAL_CHUNK_MAX_CHARS = 1500
+RETRIEVAL_TOP_K = 8
+EMBEDDING_MODEL = 'text-embedding-3-small'
+EMBEDDING_DIMENSIONS = 1536
+EMBEDDING_BATCH_SIZE = 100  # Inputs per embeddings request
+# "Ask my meetings" question answering over retrieved chunks
+QA_MODEL = 'gpt-4o-mini'
+QA_TOP_K = 12
+QA_MIN_SCORE = 0.15  # Cosine similarity below which excerpts are left out of the context
+QA_CONTEXT_MAX_CHARS = 8000  # Excerpt text sent with each question
+QA_MAX_QUESTION_CHARS = 500
+QA_MAX_ANSWER_TOKENS = 500
+QA_CACHE_TIMEOUT = 3600  # seconds; cached contexts are also keyed by the organization's index version
+QA_P95_TARGET_MS = 300  # Retrieval + prompt assembly, excluding the model call (benchmark_meeting_qa)
+
+# Content-addressed cache of LLM responses (Redis, with database fallback)
+AI_CACHE_ENABLED = os.environ.get('AI_CACHE_ENABLED', 'True').lower() == 'true'
+AI_CACHE_TTL = 30 * 24 * 3600  # seconds
+AI_CACHE_MAX_ENTRIES = 10000  # Database tier, least recently used evicted first
+AI_CACHE_MAX_ENTRY_BYTES = 256 * 1024
+
+# Cache-Control for token-gated public pages (patch_cache_control kwargs).
+# Every page revalidates, so revoked or expired tokens stop working at once and each view is recorded;
+# unchanged pages still come back as a 304 from the ETag.
+PUBLIC_VIEW_CACHE_CONTROL = {'private': True, 'no_cache': True}
+
+# Rendered public-page fragments, keyed by summary version (stale versions just expire)
+PUBLIC_FRAGMENT_CACHE_TIMEOUT = 24 * 3600  # seconds
+
 # Meeting settings
 MEETING_ID_LENGTH = 8
 DEFAULT_MEETING_DURATION = 2  # hours
@@ -258,6 +348,11 @@ else:
 # SendGrid API settings
 SENDGRID_API_KEY = os.getenv('SENDGRID_API_KEY')
 SENDGRID_FROM_EMAIL = 'noreply@huddle.spot'
+SENDGRID_API_HOST = os.environ.get('SENDGRID_API_HOST', 'https://api.sendgrid.com')  # point at run_fake_sendgrid_server locally
+SENDGRID_MAX_PERSONALIZATIONS = int(os.environ.get('SENDGRID_MAX_PERSONALIZATIONS', '1000'))  # recipients per API call (SendGrid's limit)
+SENDGRID_BATCH_ENABLED = os.environ.get('SENDGRID_BATCH_ENABLED', 'False').lower() == 'true'  # group same-content messages into one request
+SENDGRID_BATCH_CONCURRENCY = int(os.environ.get('SENDGRID_BATCH_CONCURRENCY', '4'))  # parallel API requests per send_messages call
+SENDGRID_TIMEOUT = 30  # seconds per API request
 
 SITE_URL = os.environ.get('SITE_URL', 'https://huddle.spot')
 
@@ -302,3 +397,7 @@ CACHES = {
         'LOCATION': os.environ.get('CELERY_RESULT_BACKEND', 'redis://localhost:6379/1'),
     }
 }
+
+# Public-link access counters are buffered here and flushed by the flush-token-access-counts beat task
+ACCESS_TRACKING_REDIS_URL = CACHES['default']['LOCATION']
+ACCESS_TRACKING_REDIS_TIMEOUT = 0.5  # seconds; page views fall back to a direct write rather than wait on Redis
@@ -129,10 +129,12 @@ urlpatterns = [
     path('api/meeting/<str:meeting_id>/add-attendees/', management_views.add_attendees_view, name='add_attendees'),
     path('api/meeting/<str:meeting_id>/remove-attendee/', management_views.remove_attendee_view, name='remove_attendee'),
     path('api/meeting/<str:meeting_id>/send-invitations/', management_views.send_invitations_view, name='send_invitations'),
+    path('api/meeting/<str:meeting_id>/invitations/<int:batch_id>/', management_views.invitation_batch_status_view, name='invitation_batch_status'),
     
     # Transcript Views
     path('dashboard/meeting/<str:meeting_id>/transcript/', transcript_views.meeting_transcript_view, name='meeting_transcript'),
     path('api/meeting/<str:meeting_id>/transcript/', transcript_views.meeting_transcript_api, name='meeting_transcript_api'),
+    path('api/meeting/<str:meeting_id>/transcript/segments/', transcript_views.meeting_transcript_segments_api, name='meeting_transcript_segments_api'),
 
     # Agenda Management API
     path('api/meetings/<str:meeting_id>/agenda/', agenda_views.agenda_api, name='agenda_api'),
@@ -6,6 +6,7 @@ class AudioCapture {
         this.mediaRecorder = null;
         this.audioStream = null;
         this.audioChunks = [];
+        this.upload = null;
         this.isRecording = false;
         this.qualityAnalyzer = null;
     }
@@ -30,9 +31,16 @@ class AudioCapture {
             this.mediaRecorder = new MediaRecorder(this.audioStream, options);
             this.audioChunks = [];
             
+            // Stream chunks as they arrive; fall back to a single upload at stop
+            await this.startChunkedUpload();
+            
             this.mediaRecorder.ondataavailable = (event) => {
                 if (event.data.size > 0) {
+                    // Keep the whole recording until it is safely stored on the server
                     this.audioChunks.push(event.data);
+                    if (this.upload) {
+                        this.queueChunk(this.upload);
+                    }
                 }
             };
             
@@ -88,6 +96,11 @@ class AudioCapture {
     }
     
     async processRecording() {
+        if (this.upload) {
+            await this.finalizeChunkedUpload();
+            return;
+        }
+        
         if (this.audioChunks.length === 0) return;
         
         try {
@@ -103,6 +116,163 @@ class AudioCapture {
         }
     }
     
+    async startChunkedUpload() {
+        this.upload = null;
+        
+        const formData = new FormData();
+        formData.append('meeting_id', this.meetingId);
+        formData.append('session_id', this.sessionId);
+        formData.append('format', 'webm');
+        
+        try {
+            const response = await fetch('/api/uploads/', {
+                method: 'POST',
+                body: formData,
+                headers: {
+                    'X-CSRFToken': this.getCsrfToken()
+                }
+            });
+            
+            if (response.ok) {
+                const result = await response.json();
+                this.upload = {
+                    id: result.upload_id,
+                    chunks: this.audioChunks,  // every chunk of this recording, in sequence order
+                    acked: 0,                  // chunks the server has stored
+                    failed: false,
+                    queue: Promise.resolve()
+                };
+            }
+        } catch (error) {
+            console.warn('Chunked upload unavailable:', error);
+        }
+    }
+    
+    // Chunks go up strictly in order. On a 409 or a network failure, resync next_sequence
+    // from the upload status endpoint and resend from there; if the upload cannot be
+    // resumed, the full recording is uploaded at stop instead.
+    queueChunk(upload) {
+        upload.queue = upload.queue.then(() => this.drainUpload(upload));
+    }
+    
+    async drainUpload(upload) {
+        let failures = 0;
+        while (!upload.failed && upload.acked < upload.chunks.length) {
+            const sequence = upload.acked;
+            const result = await this.sendChunk(upload, sequence, upload.chunks[sequence]);
+            if (result.ok) {
+                upload.acked = Math.min(result.nextSequence, upload.chunks.length);
+                failures = 0;
+                continue;
+            }
+            
+            failures++;
+            if (failures > 5) {
+                upload.failed = true;
+                break;
+            }
+            if (!result.conflict) {
+                await this.wait(1000 * 2 ** (failures - 1));
+            }
+            const nextSequence = await this.fetchUploadSequence(upload);
+            if (nextSequence === null) {
+                upload.failed = true;
+                break;
+            }
+            upload.acked = Math.min(nextSequence, upload.chunks.length);
+        }
+        if (upload.failed) {
+            console.warn('Chunked upload could not be resumed, will upload the full recording at stop');
+        }
+    }
+    
+    async sendChunk(upload, sequence, chunk) {
+        const formData = new FormData();
+        formData.append('sequence', sequence);
+        formData.append('chunk', chunk, `${sequence}.part`);
+        
+        try {
+            const response = await fetch(`/api/uploads/${upload.id}/chunks/`, {
+                method: 'POST',
+                body: formData,
+                headers: {
+                    'X-CSRFToken': this.getCsrfToken()
+                }
+            });
+            
+            if (response.ok) {
+                const result = await response.json();
+                return { ok: true, nextSequence: result.next_sequence };
+            }
+            console.warn(`Chunk ${sequence} rejected: ${response.status}`);
+            return { ok: false, conflict: response.status === 409 };
+            
+        } catch (error) {
+            console.warn(`Chunk ${sequence} failed:`, error);
+            return { ok: false, conflict: false };
+        }
+    }
+    
+    // The chunk the server expects next, or null if the upload can no longer be resumed
+    async fetchUploadSequence(upload) {
+        for (let attempt = 0; attempt < 3; attempt++) {
+            try {
+                const response = await fetch(`/api/uploads/${upload.id}/`);
+                if (response.ok) {
+                    const result = await response.json();
+                    return result.status === 'receiving' ? result.next_sequence : null;
+                }
+                if (response.status < 500) {
+                    return null;
+                }
+            } catch (error) {
+                console.warn('Upload status unavailable:', error);
+            }
+            await this.wait(1000 * 2 ** attempt);
+        }
+        return null;
+    }
+    
+    async finalizeChunkedUpload() {
+        const upload = this.upload;
+        this.upload = null;
+        await upload.queue;
+        
+        if (!upload.failed && upload.acked === upload.chunks.length) {
+            for (let attempt = 0; attempt < 3; attempt++) {
+                try {
+                    const response = await fetch(`/api/uploads/${upload.id}/finalize/`, {
+                        method: 'POST',
+                        headers: {
+                            'X-CSRFToken': this.getCsrfToken()
+                        }
+                    });
+                    
+                    if (response.ok) {
+                        const result = await response.json();
+                        console.log('Audio uploaded successfully:', result.recording_id);
+                        return;
+                    }
+                    console.error('Failed to finalize upload:', response.statusText);
+                    if (response.status < 500) {
+                        break;
+                    }
+                    
+                } catch (error) {
+                    console.error('Finalize error:', error);
+                }
+                await this.wait(1000 * 2 ** attempt);
+            }
+        }
+        
+        // Never lose the recording: send everything captured as one file
+        await this.uploadAudio(new Blob(upload.chunks, { type: this.getSupportedMimeType() }));
+    }
+    
+    wait(ms) {
+        return new Promise(resolve => setTimeout(resolve, ms));
+    }
+    
     async uploadAudio(audioBlob) {
         const formData = new FormData();
         formData.append('meeting_id', this.meetingId);